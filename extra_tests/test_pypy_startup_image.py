@@ -0,0 +1,72 @@
+import sys
+import pytest
+
+import _pypy_startup_image
+
+
+MODULES = ['imgpkg', 'imgpkg.mod', 'imgtop']
+
+@pytest.fixture
+def image(request, tmpdir, monkeypatch):
+    pkg = tmpdir.mkdir('imgpkg')
+    pkg.join('__init__.py').write('x = 1\n')
+    pkg.join('mod.py').write('from imgpkg import x\ny = x + 1\n')
+    tmpdir.join('imgtop.py').write('z = 3\n')
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.setattr(sys, 'meta_path', [])
+    forget()
+    request.addfinalizer(forget)
+    return str(tmpdir.join('image'))
+
+def forget():
+    for name in MODULES:
+        sys.modules.pop(name, None)
+
+def test_save_and_load(image, tmpdir):
+    img = _pypy_startup_image.install(image)
+    assert img.entries == {}
+    import imgpkg.mod, imgtop
+    img.save()
+    assert set(MODULES) <= set(img.entries)
+    forget()
+    sys.meta_path[:] = []
+    img = _pypy_startup_image.install(image)
+    assert not img.dirty
+    assert img.find_module('imgtop') is img
+    assert img.find_module('imgpkg.mod', ['/nonexistent']) is None
+    import imgpkg.mod, imgtop
+    assert imgpkg.mod.y == 2
+    assert imgtop.z == 3
+    assert imgpkg.__path__ == [str(tmpdir.join('imgpkg'))]
+    img.save()
+    assert not img.dirty
+
+def test_stale_entry(image, tmpdir):
+    img = _pypy_startup_image.install(image)
+    import imgtop
+    img.save()
+    forget()
+    tmpdir.join('imgtop.py').write('z = 42  # changed\n')
+    sys.meta_path[:] = []
+    img = _pypy_startup_image.install(image)
+    assert img.find_module('imgtop') is None
+    assert img.dirty
+    import imgtop
+    assert imgtop.z == 42
+    img.save()
+    assert 'imgtop' in img.entries
+
+def test_not_in_path(image, monkeypatch):
+    img = _pypy_startup_image.install(image)
+    import imgtop
+    img.save()
+    monkeypatch.setattr(sys, 'path', [])
+    img = _pypy_startup_image.StartupImage(image)
+    assert img.find_module('imgtop') is None
+
+def test_bad_file(image):
+    with open(image, 'wb') as f:
+        f.write('garbage')
+    img = _pypy_startup_image.install(image)
+    assert img.entries == {}
+    assert img.dirty
@@ -0,0 +1,150 @@
+"""Imported by app_main.py when the PYPYSTARTUPIMAGE environment variable
+is set.
+
+The startup image is a single file that contains the compiled code of the
+pure Python modules that were imported by a previous run of the same
+program.  These modules are then imported from the image, without looking
+for them along sys.path and without reading a .pyc file per module.  An
+entry is only used if its source file still has the same size and mtime.
+At the end of the run, the image is written again if a module was imported
+that is not in the image, or if an entry was stale.
+
+The image is ignored if the -O level or the bytecode magic number are
+not the same as the ones with which it was written, and an entry is only
+used if the directory from where the module was imported is still in
+sys.path (or in the __path__ of its package).  A new module that shadows
+a module of the image, because it is found earlier along sys.path, is
+not noticed: remove the image after installing or removing packages.
+"""
+import sys
+import imp
+import marshal
+
+try:
+    from posix import stat
+except ImportError:
+    from nt import stat
+
+
+def _source_of(filename):
+    if filename.endswith('.pyc') or filename.endswith('.pyo'):
+        filename = filename[:-1]
+    if filename.endswith('.py'):
+        return filename
+    return None
+
+def _dirname(filename):
+    i = max(filename.rfind('/'), filename.rfind('\\'))
+    if i < 0:
+        return ''
+    return filename[:i]
+
+def _fingerprint(filename):
+    try:
+        st = stat(filename)
+    except OSError:
+        return None
+    return (int(st.st_mtime), st.st_size)
+
+def _header():
+    return (imp.get_magic(), sys.flags.optimize)
+
+
+class StartupImage(object):
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.entries = {}   # {modname: (filename, fingerprint, ispkg, code)}
+        self.dirty = True
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.filename, 'rb') as f:
+                data = f.read()
+            header, entries = marshal.loads(data)
+        except (IOError, EOFError, ValueError, TypeError):
+            return
+        if header != _header():
+            return
+        self.entries = entries
+        self.dirty = False
+
+    # PEP 302 importer interface, installed in sys.meta_path
+
+    def find_module(self, fullname, path=None):
+        entry = self.entries.get(fullname)
+        if entry is None:
+            return None
+        filename, fingerprint, ispkg, code = entry
+        if path is None:
+            path = sys.path
+        if _dirname(_dirname(filename) if ispkg else filename) not in path:
+            return None
+        if _fingerprint(_source_of(filename)) != fingerprint:
+            del self.entries[fullname]
+            self.dirty = True
+            return None
+        return self
+
+    def load_module(self, fullname):
+        filename, fingerprint, ispkg, code = self.entries[fullname]
+        module = sys.modules.get(fullname)
+        is_reload = module is not None
+        if not is_reload:
+            module = imp.new_module(fullname)
+            sys.modules[fullname] = module
+        module.__file__ = filename
+        if ispkg:
+            module.__path__ = [_dirname(filename)]
+        try:
+            exec code in module.__dict__
+        except:
+            if not is_reload:
+                del sys.modules[fullname]
+            raise
+        return sys.modules[fullname]
+
+    def collect(self):
+        """Add to the image the modules imported from source files."""
+        from os.path import isabs
+        for name, module in sys.modules.items():
+            if name == '__main__' or name in self.entries:
+                continue
+            filename = getattr(module, '__file__', None)
+            if not isinstance(filename, str):
+                continue
+            source = _source_of(filename)
+            if source is None or not isabs(source):
+                continue
+            fingerprint = _fingerprint(source)
+            if fingerprint is None:
+                continue
+            try:
+                with open(source, 'rU') as f:
+                    code = compile(f.read(), source, 'exec', 0, True)
+            except (IOError, SyntaxError):
+                continue
+            ispkg = hasattr(module, '__path__')
+            self.entries[name] = (filename, fingerprint, ispkg, code)
+            self.dirty = True
+
+    def save(self):
+        self.collect()
+        if not self.dirty:
+            return
+        import os
+        data = marshal.dumps((_header(), self.entries))
+        tmpname = '%s.%d.tmp' % (self.filename, os.getpid())
+        with open(tmpname, 'wb') as f:
+            f.write(data)
+        os.rename(tmpname, self.filename)
+        self.dirty = False
+
+
+def install(filename):
+    """Load the startup image from 'filename' and use it for imports.
+    Call save() on the result at the end of the run."""
+    image = StartupImage(filename)
+    sys.meta_path.insert(0, image)
+    return image
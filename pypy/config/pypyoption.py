@@ -199,6 +199,18 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
                    "use specialised tuples",
                    default=False),
 
+        BoolOption("withstrbuf", "use strings optimized for addition",
+                   default=False),
+
+        BoolOption("withsharedkeydicts",
+                   "let dicts with the same string keys share them "
+                   "(up to 32 keys, and 10000 sets of keys per process)",
+                   default=False),
+
+        BoolOption("withfixedslots",
+                   "store the slots of classes with only __slots__ in fields",
+                   default=False),
+
         BoolOption("withliststrategies",
                    "enable optimized ways to store lists of primitives ",
                    default=True),
@@ -214,6 +226,12 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
                    "special case addition and subtraction of two integers in BINARY_ADD/"
                    "/BINARY_SUBTRACT and their inplace counterparts",
                    default=False),
+        BoolOption("quickening",
+                   "specialise some opcodes in the interpreter: cache the "
+                   "results of LOAD_GLOBAL, special case ints and floats in "
+                   "COMPARE_OP, BINARY_ADD and BINARY_SUBTRACT, and run "
+                   "pairs of LOAD_FAST together",
+                   default=False),
         BoolOption("optimized_list_getitem",
                    "special case the 'list[integer]' expressions",
                    default=False),
@@ -241,9 +259,11 @@ def set_pypy_opt_level(config, level):
     # all the good optimizations for PyPy should be listed here
     if level in ['2', '3', 'jit']:
         config.objspace.std.suggest(intshortcut=True)
+        config.objspace.std.suggest(quickening=True)
         config.objspace.std.suggest(optimized_list_getitem=True)
         #config.objspace.std.suggest(newshortcut=True)
         config.objspace.std.suggest(withspecialisedtuple=True)
+        config.objspace.std.suggest(withfixedslots=True)
         #if not IS_64_BITS:
         #    config.objspace.std.suggest(withsmalllong=True)
 
@@ -257,6 +277,7 @@ def set_pypy_opt_level(config, level):
     if level == 'mem':
         config.objspace.std.suggest(withprebuiltint=True)
         config.objspace.std.suggest(withliststrategies=True)
+        config.objspace.std.suggest(withfixedslots=True)
         if not IS_64_BITS:
             config.objspace.std.suggest(withsmalllong=True)
 
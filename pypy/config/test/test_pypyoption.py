@@ -41,9 +41,11 @@ def test_set_pypy_opt_level():
     conf = get_pypy_config()
     set_pypy_opt_level(conf, '2')
     assert conf.objspace.std.intshortcut
+    assert conf.objspace.std.quickening
     conf = get_pypy_config()
     set_pypy_opt_level(conf, '0')
     assert not conf.objspace.std.intshortcut
+    assert not conf.objspace.std.quickening
 
 def test_check_documentation():
     def check_file_exists(fn):
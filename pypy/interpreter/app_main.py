@@ -35,6 +35,8 @@ PyPy options and arguments:
                      a warning if they are not closed explicitly
 -X faulthandler    : attempt to display tracebacks when PyPy crashes
 -X jit-off         : turn the JIT off, equivalent to --jit off
+-X lazy-imports    : only run the body of imported modules when they are
+                     used, see __pypy__.set_lazy_imports()
 """
 # Missing vs CPython: PYTHONHOME, PYTHONCASEOK
 USAGE2 = """
@@ -45,6 +47,8 @@ PYTHONPATH   : %r-separated list of directories prefixed to the
 PYTHONIOENCODING: Encoding[:errors] used for stdin/stdout/stderr.
 PYPY_IRC_TOPIC: if set to a non-empty value, print a random #pypy IRC
                topic at startup of interactive mode.
+PYPYSTARTUPIMAGE: file keeping the compiled code of the modules imported by
+               the previous runs, to import them faster.
 PYPYLOG: If set to a non-empty value, enable logging.
 """
 
@@ -281,9 +285,13 @@ def set_runtime_options(options, Xparam, *args):
         run_faulthandler()
     elif Xparam == 'jit-off':
         set_jit_option(options, 'off')
+    elif Xparam == 'lazy-imports':
+        import __pypy__
+        __pypy__.set_lazy_imports(True)
     else:
         print >> sys.stderr, 'usage: %s -X [options]' % (get_sys_executable(),)
-        print >> sys.stderr, '[options] can be: track-resources, faulthandler, jit-off'
+        print >> sys.stderr, ('[options] can be: track-resources, faulthandler, '
+                              'jit-off, lazy-imports')
         raise SystemExit
 
 class CommandLineError(Exception):
@@ -620,6 +628,17 @@ def run_command_line(interactive,
     mainmodule = type(sys)('__main__')
     sys.modules['__main__'] = mainmodule
 
+    readenv = not ignore_environment
+    startup_image = None
+    startup_image_file = readenv and getenv('PYPYSTARTUPIMAGE')
+    if startup_image_file:
+        try:
+            from _pypy_startup_image import install
+        except ImportError:
+            pass
+        else:
+            startup_image = install(startup_image_file)
+
     if not no_site:
         try:
             import site
@@ -628,7 +647,6 @@ def run_command_line(interactive,
 
     set_stdio_encodings(ignore_environment)
 
-    readenv = not ignore_environment
     pythonwarnings = readenv and getenv('PYTHONWARNINGS')
     if pythonwarnings:
         warnoptions.extend(pythonwarnings.split(','))
@@ -826,6 +844,13 @@ def run_command_line(interactive,
         else:
             status = not success
 
+    if startup_image is not None:
+        try:
+            startup_image.save()
+        except (IOError, OSError) as e:
+            print >> sys.stderr, "Could not write PYPYSTARTUPIMAGE"
+            print >> sys.stderr, "%s:" % (e.__class__.__name__,), e
+
     return status
 
 def print_banner(copyright):
@@ -27,6 +27,10 @@ name_ops_default = misc.dict_to_switch({
     ast.Del: ops.DELETE_NAME
 })
 
+def inlined_name(name):
+    """The hidden name of a local variable of an inlined comprehension."""
+    return "." + name
+
 name_ops_fast = misc.dict_to_switch({
     ast.Load: ops.LOAD_FAST,
     ast.Store: ops.STORE_FAST,
@@ -173,6 +177,7 @@ class PythonCodeGenerator(assemble.PythonCodeMaker):
         self.frame_blocks = []
         self.interactive = False
         self.temporary_name_counter = 1
+        self.inlined_scope = None
         self._compile(tree)
 
     def _compile(self, tree):
@@ -210,6 +215,20 @@ class PythonCodeGenerator(assemble.PythonCodeMaker):
 
     def name_op(self, identifier, ctx):
         """Generate an operation appropiate for the scope of the identifier."""
+        if self.inlined_scope is not None:
+            scope = self.inlined_scope.lookup(identifier)
+            if scope == symtable.SCOPE_LOCAL:
+                # the symbols of the comprehension are mangled already
+                name = inlined_name(self.inlined_scope.mangle(identifier))
+                self.emit_op_arg(name_ops_fast(ctx),
+                                 self.add_name(self.var_names, name))
+                return
+            elif (scope == symtable.SCOPE_GLOBAL_IMPLICIT or
+                  scope == symtable.SCOPE_GLOBAL_EXPLICIT):
+                self.emit_op_arg(name_ops_global(ctx),
+                                 self.add_name(self.names, identifier))
+                return
+            # else it is a name of the enclosing scope
         scope = self.scope.lookup(identifier)
         op = ops.NOP
         container = self.names
@@ -437,10 +456,26 @@ class PythonCodeGenerator(assemble.PythonCodeMaker):
         self.update_position(if_.lineno, True)
         end = self.new_block()
         test_constant = if_.test.as_constant_truth(self.space)
+        debug_test = if_.test.as_debug_test()
         if test_constant == optimize.CONST_FALSE:
             self.visit_sequence(if_.orelse)
         elif test_constant == optimize.CONST_TRUE:
             self.visit_sequence(if_.body)
+        elif debug_test != optimize.CONST_NOT_CONST:
+            # 'if __debug__:' or 'if not __debug__:' don't need to look up
+            # __debug__, which depends on the -O flag given at runtime
+            if debug_test == optimize.CONST_TRUE:
+                debug_body = if_.body
+                nodebug_body = if_.orelse
+            else:
+                debug_body = if_.orelse
+                nodebug_body = if_.body
+            nodebug = self.new_block()
+            self.emit_jump(ops.JUMP_IF_NOT_DEBUG, nodebug)
+            self.visit_sequence(debug_body)
+            self.emit_jump(ops.JUMP_FORWARD, end)
+            self.use_next_block(nodebug)
+            self.visit_sequence(nodebug_body)
         else:
             if if_.orelse:
                 otherwise = self.new_block()
@@ -903,6 +938,13 @@ class PythonCodeGenerator(assemble.PythonCodeMaker):
 
     def visit_IfExp(self, ifexp):
         self.update_position(ifexp.lineno)
+        test_constant = ifexp.test.as_constant_truth(self.space)
+        if test_constant == optimize.CONST_TRUE:
+            ifexp.body.walkabout(self)
+            return
+        elif test_constant == optimize.CONST_FALSE:
+            ifexp.orelse.walkabout(self)
+            return
         end = self.new_block()
         otherwise = self.new_block()
         ifexp.test.accept_jump_if(self, False, otherwise)
@@ -1076,15 +1118,18 @@ class PythonCodeGenerator(assemble.PythonCodeMaker):
             self.emit_op_arg(ops.BUILD_LIST, 0)
         self._listcomp_generator(lc.generators, 0, lc.elt, single=single)
 
-    def _comp_generator(self, node, generators, gen_index):
+    def _comp_generator(self, node, generators, gen_index, inlined=False):
         start = self.new_block()
         if_cleanup = self.new_block()
         anchor = self.new_block()
         gen = generators[gen_index]
         assert isinstance(gen, ast.comprehension)
         if gen_index == 0:
-            self.argcount = 1
-            self.emit_op_arg(ops.LOAD_FAST, 0)
+            # the first iterator is either the argument of the function,
+            # or already on the stack if the comprehension is inlined
+            if not inlined:
+                self.argcount = 1
+                self.emit_op_arg(ops.LOAD_FAST, 0)
         else:
             gen.iter.walkabout(self)
             self.emit_op(ops.GET_ITER)
@@ -1105,7 +1150,49 @@ class PythonCodeGenerator(assemble.PythonCodeMaker):
         self.emit_jump(ops.JUMP_ABSOLUTE, start, True)
         self.use_next_block(anchor)
 
+    def _inline_comprehension(self, node, comp_scope):
+        """Compile a set or dict comprehension in the current code object.
+        Its local variables become hidden fast locals, which are deleted
+        again at the end, in a 'finally' block so that it is also done if
+        the comprehension raises."""
+        self.update_position(node.lineno)
+        node.build_container(self)
+        # the container stays below the block, so that it is the only
+        # value left on the stack after END_FINALLY
+        end = self.new_block()
+        self.emit_jump(ops.SETUP_FINALLY, end)
+        body = self.use_next_block()
+        self.push_frame_block(F_BLOCK_FINALLY, body)
+        first_comp = node.get_generators()[0]
+        assert isinstance(first_comp, ast.comprehension)
+        first_comp.iter.walkabout(self)
+        self.emit_op(ops.GET_ITER)
+        assert self.inlined_scope is None
+        self.inlined_scope = comp_scope
+        self._comp_generator(node, node.get_generators(), 0, inlined=True)
+        self.inlined_scope = None
+        self.emit_op(ops.POP_BLOCK)
+        self.pop_frame_block(F_BLOCK_FINALLY, body)
+        self.load_const(self.space.w_None)
+        self.use_next_block(end)
+        self.push_frame_block(F_BLOCK_FINALLY_END, end)
+        # the variables may still be unbound, e.g. if nothing was iterated
+        names = [name for name, scope in comp_scope.symbols.iteritems()
+                 if scope == symtable.SCOPE_LOCAL and not name.startswith(".")]
+        names.sort()
+        for name in names:
+            index = self.add_name(self.var_names, inlined_name(name))
+            self.load_const(self.space.w_None)
+            self.emit_op_arg(ops.STORE_FAST, index)
+            self.emit_op_arg(ops.DELETE_FAST, index)
+        self.emit_op(ops.END_FINALLY)
+        self.pop_frame_block(F_BLOCK_FINALLY_END, end)
+
     def _compile_comprehension(self, node, name, sub_scope):
+        comp_scope = self.symbols.find_scope(node)
+        if comp_scope.inlined:
+            self._inline_comprehension(node, comp_scope)
+            return
         code = self.sub_scope(sub_scope, name, node, node.lineno)
         self.update_position(node.lineno)
         self._make_function(code)
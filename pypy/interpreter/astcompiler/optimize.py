@@ -10,7 +10,10 @@ from rpython.rlib.objectmodel import specialize
 
 
 def optimize_ast(space, tree, compile_info):
-    return tree.mutate_over(OptimizingVisitor(space, compile_info))
+    tree = tree.mutate_over(OptimizingVisitor(space, compile_info))
+    if isinstance(tree, ast.Module):
+        propagate_final_constants(space, tree, compile_info)
+    return tree
 
 
 CONST_NOT_CONST = -1
@@ -31,6 +34,10 @@ class __extend__(ast.AST):
         """Return the value of this node as a wrapped constant if possible."""
         return None
 
+    def as_debug_test(self):
+        """Return the truth of this node if it only depends on __debug__."""
+        return CONST_NOT_CONST
+
     def accept_jump_if(self, gen, condition, target):
         raise AssertionError("only for expressions")
 
@@ -72,8 +79,23 @@ class __extend__(ast.Slice):
         # constants, but we don't have a space here.
         return None
 
+class __extend__(ast.Name):
+
+    def as_debug_test(self):
+        if self.id == "__debug__" and self.ctx == ast.Load:
+            return CONST_TRUE
+        return CONST_NOT_CONST
+
+
 class __extend__(ast.UnaryOp):
 
+    def as_debug_test(self):
+        if self.op == ast.Not:
+            truth = self.operand.as_debug_test()
+            if truth != CONST_NOT_CONST:
+                return int(not truth)
+        return CONST_NOT_CONST
+
     def accept_jump_if(self, gen, condition, target):
         if self.op == ast.Not:
             self.operand.accept_jump_if(gen, not condition, target)
@@ -165,6 +187,8 @@ class OptimizingVisitor(ast.ASTVisitor):
     def __init__(self, space, compile_info):
         self.space = space
         self.compile_info = compile_info
+        # {name: w_const} of the final module constants defined so far
+        self.final_constants = {}
 
     @specialize.argtype(1)
     def default_visitor(self, node):
@@ -272,6 +296,10 @@ class OptimizingVisitor(ast.ASTVisitor):
             if name.ctx == ast.Load:
                 return ast.Const(self.space.w_None, name.lineno,
                                  name.col_offset)
+        elif name.ctx == ast.Load and self.final_constants:
+            w_const = self.final_constants.get(name.id, None)
+            if w_const is not None:
+                return ast.Const(w_const, name.lineno, name.col_offset)
         return name
 
     def visit_Tuple(self, tup):
@@ -332,3 +360,123 @@ class OptimizingVisitor(ast.ASTVisitor):
                     return ast.Const(w_const, subs.lineno, subs.col_offset)
 
         return subs
+
+
+class FinalBindingsFinder(ast.GenericASTVisitor):
+    """Counts how many times each name is bound anywhere in a module."""
+
+    def __init__(self):
+        self.bindings = {}
+        self.unknown_bindings = False
+
+    def note_binding(self, name):
+        self.bindings[name] = self.bindings.get(name, 0) + 1
+
+    def visit_Name(self, name):
+        if name.ctx != ast.Load:
+            self.note_binding(name.id)
+
+    def visit_FunctionDef(self, func):
+        self.note_binding(func.name)
+        args = func.args
+        if args.vararg:
+            self.note_binding(args.vararg)
+        if args.kwarg:
+            self.note_binding(args.kwarg)
+        ast.GenericASTVisitor.visit_FunctionDef(self, func)
+
+    def visit_Lambda(self, lamb):
+        args = lamb.args
+        if args.vararg:
+            self.note_binding(args.vararg)
+        if args.kwarg:
+            self.note_binding(args.kwarg)
+        ast.GenericASTVisitor.visit_Lambda(self, lamb)
+
+    def visit_ClassDef(self, clsdef):
+        self.note_binding(clsdef.name)
+        ast.GenericASTVisitor.visit_ClassDef(self, clsdef)
+
+    def visit_alias(self, alias):
+        if alias.name == "*":
+            self.unknown_bindings = True
+        elif alias.asname:
+            self.note_binding(alias.asname)
+        else:
+            dot = alias.name.find(".")
+            if dot >= 0:
+                self.note_binding(alias.name[:dot])
+            else:
+                self.note_binding(alias.name)
+
+    def visit_Exec(self, exc):
+        self.unknown_bindings = True
+        ast.GenericASTVisitor.visit_Exec(self, exc)
+
+
+def _final_declaration(space, stmt):
+    """Return the names listed by "__final__ = ('NAME', ...)", or None."""
+    if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1:
+        return None
+    target = stmt.targets[0]
+    if not isinstance(target, ast.Name) or target.id != "__final__":
+        return None
+    w_names = stmt.value.as_constant()
+    if w_names is None or not space.isinstance_w(w_names, space.w_tuple):
+        return None
+    names = []
+    for w_name in space.fixedview(w_names):
+        if not space.isinstance_w(w_name, space.w_bytes):
+            return None
+        names.append(space.text_w(w_name))
+    return names
+
+def _final_definition(stmt, finals):
+    """Return the name if 'stmt' is "NAME = <constant>" for a final NAME."""
+    if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1:
+        return None
+    target = stmt.targets[0]
+    if not isinstance(target, ast.Name) or target.id not in finals:
+        return None
+    if stmt.value.as_constant() is None:
+        return None
+    return target.id
+
+def propagate_final_constants(space, module, compile_info):
+    """Replace the loads of the module constants listed in __final__ with
+    their value.  A final name must be assigned exactly once, at the top
+    level of the module, to a constant; and never bound in any other way,
+    anywhere in the module."""
+    if not module.body:
+        return
+    finals = {}
+    for stmt in module.body:
+        names = _final_declaration(space, stmt)
+        if names is not None:
+            for name in names:
+                finals[name] = None
+    if not finals:
+        return
+    finder = FinalBindingsFinder()
+    module.walkabout(finder)
+    if finder.unknown_bindings:
+        return
+    definitions = 0
+    for stmt in module.body:
+        name = _final_definition(stmt, finals)
+        if name is not None and finder.bindings.get(name, 0) == 1:
+            definitions += 1
+    if not definitions:
+        return
+    # only the statements after the definition of a final name see it as
+    # a constant: before, loading it still raises NameError
+    visitor = OptimizingVisitor(space, compile_info)
+    for i in range(len(module.body)):
+        stmt = module.body[i]
+        if visitor.final_constants:
+            stmt = stmt.mutate_over(visitor)
+            module.body[i] = stmt
+        name = _final_definition(stmt, finals)
+        if name is not None and finder.bindings.get(name, 0) == 1:
+            assert isinstance(stmt, ast.Assign)
+            visitor.final_constants[name] = stmt.value.as_constant()
@@ -43,6 +43,8 @@ class Scope(object):
         self.child_has_free = False
         self.nested = False
         self.doc_removable = False
+        self.may_be_inlined = False
+        self.inlined = False
         self._in_try_body_depth = 0
 
     def lookup(self, name):
@@ -158,6 +160,10 @@ class Scope(object):
     def _check_optimization(self):
         pass
 
+    def _mark_inlined_children(self):
+        """Hook for FunctionScope."""
+        pass
+
     _hide_bound_from_nested_scopes = False
 
     def finalize(self, bound, free, globs):
@@ -173,15 +179,24 @@ class Scope(object):
             self._finalize_name(name, flags, local, bound, free, globs)
         if not self._hide_bound_from_nested_scopes:
             self._pass_on_bindings(local, bound, globs, new_bound, new_globs)
+        self._mark_inlined_children()
         child_frees = {}
         for child in self.children:
             # Symbol dictionaries are copied to avoid having child scopes
             # pollute each other's.
             child_free = new_free.copy()
             child.finalize(new_bound.copy(), child_free, new_globs.copy())
-            child_frees.update(child_free)
-            if child.has_free or child.child_has_free:
+            if child.inlined:
+                # the code of an inlined comprehension runs in our frame,
+                # so our own locals don't need cells for it
+                for name in local:
+                    if name in child_free:
+                        del child_free[name]
+                if child_free:
+                    self.child_has_free = True
+            elif child.has_free or child.child_has_free:
                 self.child_has_free = True
+            child_frees.update(child_free)
         new_free.update(child_frees)
         self._finalize_cells(new_free)
         for name in new_free:
@@ -272,6 +287,27 @@ class FunctionScope(Scope):
                 self.symbols[name] = SCOPE_CELL
                 del free[name]
 
+    def _mark_inlined_children(self):
+        # Set and dict comprehensions are inlined in the code of this
+        # function, instead of being functions of their own, if their
+        # locals can be stored in hidden local variables of this function.
+        # This needs the locals of both to be fast locals, and nothing
+        # that could see the difference: nested scopes, 'yield', or
+        # calls to locals(), vars(), dir() or eval().
+        if not self.optimized or self.has_exec or self._may_see_locals():
+            return
+        for child in self.children:
+            if (child.may_be_inlined and not child.children and
+                    isinstance(child, FunctionScope) and
+                    not child.is_generator and not child._may_see_locals()):
+                child.inlined = True
+
+    def _may_see_locals(self):
+        for name in _NAMES_SEEING_LOCALS:
+            if name in self.roles:
+                return True
+        return False
+
     def _check_optimization(self):
         if (self.has_free or self.child_has_free) and not self.optimized:
             err = None
@@ -298,6 +334,9 @@ class FunctionScope(Scope):
         self.locals_fully_known = self.optimized and not self.has_exec
 
 
+_NAMES_SEEING_LOCALS = ["locals", "vars", "dir", "eval"]
+
+
 class ClassScope(Scope):
 
     _hide_bound_from_nested_scopes = True
@@ -466,10 +505,12 @@ class SymtableBuilder(ast.GenericASTVisitor):
 
     def visit_SetComp(self, setcomp):
         self._visit_comprehension(setcomp, setcomp.generators, setcomp.elt)
+        self.find_scope(setcomp).may_be_inlined = True
 
     def visit_DictComp(self, dictcomp):
         self._visit_comprehension(dictcomp, dictcomp.generators,
                                   dictcomp.value, dictcomp.key)
+        self.find_scope(dictcomp).may_be_inlined = True
 
     def visit_With(self, wih):
         self.scope.new_temporary_name()
@@ -77,6 +77,76 @@ class BaseTestCompiler:
 
 class TestCompiler(BaseTestCompiler):
 
+    def test_inlined_comprehensions(self):
+        decl = """def f(l):
+            i = 'outer'
+            s = {i * 2 for i in l if i != 3}
+            d = {i: j for i in l for j in range(i)}
+            return i, sorted(s), sorted(d.items()), sorted(locals())
+        """
+        yield (self.st, decl, "f([1, 2, 3])",
+               ('outer', [2, 4], [(1, 0), (2, 1), (3, 2)],
+                ['d', 'i', 'l', 's']))
+        yield self.st, decl, "f([])", ('outer', [], [], ['d', 'i', 'l', 's'])
+        decl = """def f(l, n):
+            def g():
+                return n
+            return {k: n + g() for k in l}
+        """
+        yield self.st, decl, "f('ab', 3)", {'a': 6, 'b': 6}
+        decl = """x = 5
+def f(l):
+    global y
+    y = 1
+    return {i + x + y for i in l}
+        """
+        yield self.st, decl, "f([1])", set([7])
+        decl = """def f():
+            i = 5
+            try:
+                {i: 1 / i for i in (1, 0)}
+            except ZeroDivisionError:
+                pass
+            try:
+                {j for i in (1,)}
+            except NameError:
+                return i
+        """
+        yield self.st, decl, "f()", 5
+        decl = """def f(l):
+            import sys
+            try:
+                [0, {k: v for k in l for v in (1 / k,)}]
+            except ZeroDivisionError:
+                pass
+            return sorted(sys._getframe().f_locals), {k for k in l}
+        """
+        yield (self.st, decl, "f([2, 0])",
+               (['l', 'sys'], set([0, 2])))
+        decl = """def f(l):
+            return {i for i in l}, {i for i in l}
+        """
+        yield self.st, decl, "f([1, 1])", (set([1]), set([1]))
+        decl = """class A:
+            l = [1, 2]
+            s = {i for i in l}
+            def f(self):
+                return {__i: __i for __i in self.l}
+        """
+        yield self.st, decl, "A.s, A().f()", (set([1, 2]), {1: 1, 2: 2})
+
+    def test_if_debug(self):
+        decl = """def f(x):
+            if __debug__:
+                x += 1
+            else:
+                x -= 1
+            if not __debug__:
+                x += 10
+            return x
+        """
+        yield self.st, decl, "f(0)", 1
+
     def test_issue_713(self):
         func = "def f(_=2): return (_ if _ else _) if False else _"
         yield self.st, func, "f()", 2
@@ -1230,6 +1300,38 @@ class TestOptimizations:
         counts = self.count_instructions(source)
         assert ops.BUILD_TUPLE not in counts
 
+    def test_inlined_set_and_dict_comprehensions(self):
+        for source in ("def f(l): return {i for i in l}",
+                       "def f(l): return {i: j for i in l for j in l if i}"):
+            counts = self.count_instructions(source)
+            assert ops.MAKE_FUNCTION not in counts
+            assert ops.MAKE_CLOSURE not in counts
+            assert ops.CALL_FUNCTION not in counts
+        # not inlined: a nested scope, or a call to locals()
+        for source in ("def f(l): return {i: lambda: i for i in l}",
+                       "def f(l): return {i for i in locals()}",
+                       "def f(l): return {i for i in l if eval('i')}",
+                       "def f(l): return {(yield i) for i in l}",
+                       "def f(l): exec ''; return {i for i in l}"):
+            counts = self.count_instructions(source)
+            assert ops.MAKE_FUNCTION in counts or ops.MAKE_CLOSURE in counts
+
+    def test_if_debug(self):
+        for source in ("def f():\n    if __debug__: return 1\n    return 2",
+                       "def f():\n    if not __debug__: return 2\n"
+                       "    else: return 1"):
+            counts = self.count_instructions(source)
+            assert counts[ops.JUMP_IF_NOT_DEBUG] == 1
+            assert ops.LOAD_GLOBAL not in counts
+            assert ops.POP_JUMP_IF_FALSE not in counts
+
+    def test_constant_ifexp(self):
+        for source in ("def f(): return a if 1 else b",
+                       "def f(): return b if None else a"):
+            counts = self.count_instructions(source)
+            assert counts[ops.LOAD_GLOBAL] == 1
+            assert ops.POP_JUMP_IF_FALSE not in counts
+
 
 class TestHugeStackDepths:
     def run_and_check_stacksize(self, source):
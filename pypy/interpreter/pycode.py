@@ -53,6 +53,8 @@ def cpython_code_signature(code):
 class CodeHookCache(object):
     def __init__(self, space):
         self._code_hook = None
+        # set by the pypyjit module when a warm-start profile is installed
+        self._warm_profile = None
 
 class PyCode(eval.Code):
     "CPython-style code objects."
@@ -108,7 +110,10 @@ class PyCode(eval.Code):
         return True
 
     def new_code_hook(self):
-        code_hook = self.space.fromcache(CodeHookCache)._code_hook
+        cache = self.space.fromcache(CodeHookCache)
+        if cache._warm_profile is not None:
+            cache._warm_profile.new_code(self)
+        code_hook = cache._code_hook
         if code_hook is not None:
             try:
                 self.space.call_function(code_hook, self)
@@ -117,6 +122,7 @@ class PyCode(eval.Code):
 
     def _initialize(self):
         from pypy.objspace.std.mapdict import init_mapdict_cache
+        from pypy.objspace.std.celldict import init_globals_cache
         from pypy.interpreter.nestedscope import CellFamily
         if self.co_cellvars:
             argcount = self.co_argcount
@@ -137,6 +143,7 @@ class PyCode(eval.Code):
         self._compute_flatcall()
 
         init_mapdict_cache(self)
+        init_globals_cache(self)
 
     def _init_ready(self):
         "This is a hook for the vmprof module, which overrides this method."
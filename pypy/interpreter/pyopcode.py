@@ -346,6 +346,8 @@ class __extend__(pyframe.PyFrame):
                 self.LOAD_DEREF(oparg, next_instr)
             elif opcode == opcodedesc.LOAD_FAST.index:
                 self.LOAD_FAST(oparg, next_instr)
+                if self.space.config.objspace.std.quickening:
+                    next_instr = self.LOAD_FAST_pair(co_code, next_instr)
             elif opcode == opcodedesc.LOAD_GLOBAL.index:
                 self.LOAD_GLOBAL(oparg, next_instr)
             elif opcode == opcodedesc.LOAD_LOCALS.index:
@@ -499,6 +501,25 @@ class __extend__(pyframe.PyFrame):
             self._load_fast_failed(varindex)
         self.pushvalue(w_value)
 
+    @always_inline
+    def LOAD_FAST_pair(self, co_code, next_instr):
+        """Superinstruction LOAD_FAST LOAD_FAST, with the quickening
+        option: if the next opcode is also a LOAD_FAST, run it directly
+        instead of going through dispatch_bytecode() and its
+        bytecode_trace() again.  Not done when the frame is traced,
+        because the second LOAD_FAST might start a new line."""
+        if (jit.we_are_jitted() or self.space.reverse_debugging or
+                self.get_w_f_trace() is not None):
+            return next_instr
+        pos = intmask(next_instr)
+        if (pos + 2 >= len(co_code) or
+                ord(co_code[pos]) != opcodedesc.LOAD_FAST.index):
+            return next_instr
+        self.last_instr = pos
+        varindex = (ord(co_code[pos + 2]) << 8) | ord(co_code[pos + 1])
+        self.LOAD_FAST(varindex, pos + 3)
+        return r_uint(pos + 3)
+
     @dont_inline
     def _load_fast_failed(self, varindex):
         varname = self.getlocalvarname(varindex)
@@ -877,10 +898,14 @@ class __extend__(pyframe.PyFrame):
 
     def STORE_ATTR(self, nameindex, next_instr):
         "obj.attributename = newvalue"
-        w_attributename = self.getname_w(nameindex)
         w_obj = self.popvalue()
         w_newvalue = self.popvalue()
-        self.space.setattr(w_obj, w_attributename, w_newvalue)
+        if not jit.we_are_jitted():
+            from pypy.objspace.std.mapdict import STORE_ATTR_caching
+            STORE_ATTR_caching(self.getcode(), w_obj, nameindex, w_newvalue)
+        else:
+            w_attributename = self.getname_w(nameindex)
+            self.space.setattr(w_obj, w_attributename, w_newvalue)
 
     def DELETE_ATTR(self, nameindex, next_instr):
         "del obj.attributename"
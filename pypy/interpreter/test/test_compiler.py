@@ -1026,6 +1026,47 @@ class AppTestOptimizer:
         output = s.getvalue()
         assert "LOAD_GLOBAL" not in output
 
+    def test_final_constants(self):
+        source = "\n".join([
+            "__final__ = ('X', 'Y', 'Z', 'W')",
+            "X = 3",
+            "Y = X * 2",
+            "Z = 1",
+            "W = 5",
+            "def f():",
+            "    return X + Y",
+            "def g(Z):",
+            "    return Z",
+            "def h():",
+            "    global W",
+            "    W = 6"])
+        co = compile(source, '', 'exec')
+        ns = {}
+        exec co in ns
+        f_code = ns['f'].func_code
+        assert 9 in f_code.co_consts
+        assert 'X' not in f_code.co_names
+        assert 'Z' not in ns['g'].func_code.co_consts
+        assert 'W' in ns['h'].func_code.co_names
+        assert ns['f']() == 9
+        assert ns['g'](42) == 42
+        # a final name that is loaded before its definition still fails
+        source = "__final__ = ('X',)\nX\nX = 3\n"
+        co = compile(source, '', 'exec')
+        def run():
+            exec co in {}
+        raises(NameError, run)
+
+    def test_final_constants_disabled(self):
+        for extra in ["from os import *", "exec 'pass'", "X = 4",
+                      "for X in []: pass", "import X", "class X: pass",
+                      "del X", "def g(*X): pass"]:
+            source = "__final__ = ('X',)\nX = 3\n%s\ndef f(): return X\n"
+            co = compile(source % (extra,), '', 'exec')
+            f_code = [c for c in co.co_consts
+                      if hasattr(c, 'co_name') and c.co_name == 'f'][0]
+            assert 'X' in f_code.co_names, extra
+
     def test_folding_of_list_constants(self):
         source = 'a in [1, 2, 3]'
         co = compile(source, '', 'exec')
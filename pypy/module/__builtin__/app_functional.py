@@ -4,7 +4,7 @@ functional programming.
 """
 import operator
 from __pypy__ import resizelist_hint, newlist_hint
-from __pypy__ import specialized_zip_2_lists
+from __pypy__ import specialized_zip_2_lists, specialized_sum
 
 # ____________________________________________________________
 
@@ -54,6 +54,11 @@ empty, returns start."""
     if type(start) is tuple:
         return _tuple_sum(sequence, start)
 
+    # A very fast path if the sequence is a list of ints or floats
+    result = specialized_sum(sequence, start)
+    if result is not None:
+        return result
+
     return _regular_sum(sequence, start)
 
 
@@ -147,8 +147,31 @@ max_jitdriver = jit.JitDriver(name='max',
         greens=['has_key', 'has_item', 'greenkey'], reds='auto',
         get_printable_location=get_printable_location)
 
+@specialize.call_location()
+def _min_max_unboxed(items, implementation_of):
+    # 'items' is a non-empty list of ints or of floats.  The comparisons
+    # are done like space.gt() or space.lt() would do them.
+    result = items[0]
+    for i in range(1, len(items)):
+        item = items[i]
+        if implementation_of == "max":
+            if item > result:
+                result = item
+        else:
+            if item < result:
+                result = item
+    return result
+
 @specialize.arg(3)
 def min_max_sequence(space, w_sequence, w_key, implementation_of):
+    if w_key is None:
+        intlist = space.listview_int(w_sequence)
+        if intlist:
+            return space.newint(_min_max_unboxed(intlist, implementation_of))
+        floatlist = space.listview_float(w_sequence)
+        if floatlist:
+            return space.newfloat(
+                _min_max_unboxed(floatlist, implementation_of))
     if implementation_of == "max":
         compare = space.gt
         jitdriver = max_jitdriver
@@ -231,6 +254,45 @@ def min_max(space, args, implementation_of):
                     "%s() expects at least one argument",
                     implementation_of)
 
+def _sum_ints(intlist, start):
+    total = start
+    for i in range(len(intlist)):
+        total = rarithmetic.ovfcheck(total + intlist[i])
+    return total
+
+@specialize.argtype(0)
+def _sum_floats(items, start):
+    total = start
+    for i in range(len(items)):
+        total += float(items[i])
+    return total
+
+def specialized_sum(space, w_sequence, w_start):
+    """Fast path of sum() for a list of ints or floats with an int or a
+    float start, without wrapping the items.  Return None if it does not
+    apply, including when a sum of ints overflows."""
+    w_type = space.type(w_start)
+    if w_type is space.w_int:
+        intlist = space.listview_int(w_sequence)
+        if intlist is not None:
+            try:
+                return space.newint(_sum_ints(intlist, space.int_w(w_start)))
+            except OverflowError:
+                return None
+        floatlist = space.listview_float(w_sequence)
+        if floatlist:     # an empty sequence gives the int start unchanged
+            start = float(space.int_w(w_start))
+            return space.newfloat(_sum_floats(floatlist, start))
+    elif w_type is space.w_float:
+        start = space.float_w(w_start)
+        floatlist = space.listview_float(w_sequence)
+        if floatlist is not None:
+            return space.newfloat(_sum_floats(floatlist, start))
+        intlist = space.listview_int(w_sequence)
+        if intlist is not None:
+            return space.newfloat(_sum_floats(intlist, start))
+    return None
+
 def max(space, __args__):
     """max(iterable[, key=func]) -> value
     max(a, b, c, ...[, key=func]) -> value
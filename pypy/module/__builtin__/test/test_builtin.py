@@ -240,6 +240,40 @@ class AppTestBuiltinApp:
         assert sum([(3,)], (1, 2)) == (1, 2, 3)
         assert sum(([x + 1] for x in range(3)), []) == [1, 2, 3]
 
+    def test_sum_ints_floats(self):
+        import sys
+        assert sum([1, 2, 3], 4) == 10
+        assert sum([1.5, 2.5]) == 4.0
+        assert sum([1.5, 2.5], 1) == 5.0
+        assert sum([1, 2], 0.5) == 3.5
+        assert sum([0.25, 0.5], 0.25) == 1.0
+        res = sum([-0.0])
+        assert res == 0.0 and str(res) == '0.0'
+        res = sum([-0.0], -0.0)
+        assert res == 0.0 and str(res) == '-0.0'
+        assert sum([sys.maxint, 1]) == sys.maxint + 1
+        assert sum([sys.maxint, 1], 0.0) == float(sys.maxint) + 1.0
+        assert sum(range(10)) == 45
+        assert sum({1: 2, 3: 4}) == 4
+        assert sum([1, 2], True) == 4
+        class Int(int):
+            def __add__(self, other):
+                return Int(42)
+        assert sum([1, 2], Int(0)) == 42
+
+    def test_sum_empty_float_strategies(self):
+        l = [1.5]
+        l.pop()
+        res = sum(l)
+        assert res == 0 and type(res) is int
+        s = set([1.5])
+        s.pop()
+        assert type(sum(s)) is int
+        d = {1.5: None}
+        del d[1.5]
+        assert type(sum(d, 2)) is int
+        assert type(sum(l, 0.0)) is float
+
     def test_sum_empty_edge_cases(self):
         assert sum([], []) == []
         assert sum(iter([]), []) == []
@@ -83,3 +83,27 @@ class AppTestMinList:
 
     def test_min_mixed(self):
         assert min(['1', 2, 3, 'aa']) == 2
+
+class AppTestMinMaxUnboxed:
+
+    def test_ints(self):
+        import sys
+        l = [5, -3, sys.maxint, -sys.maxint - 1, 7]
+        assert min(l) == -sys.maxint - 1
+        assert max(l) == sys.maxint
+        assert min([4]) == max([4]) == 4
+        assert max(range(10)) == 9
+        assert min(set([3, 1, 2])) == 1
+
+    def test_floats(self):
+        nan = float('nan')
+        assert max([1.0, nan, 2.0]) == 2.0
+        assert min([1.0, nan, 0.5]) == 0.5
+        assert str(max([nan, 1.0, 2.0])) == 'nan'
+        assert str(max([0.0, -0.0])) == '0.0'
+        assert str(max([-0.0, 0.0])) == '-0.0'
+        assert str(min([0.0, -0.0])) == '0.0'
+
+    def test_empty(self):
+        raises(ValueError, min, [])
+        raises(ValueError, max, [])
@@ -7,6 +7,7 @@ from rpython.rlib.objectmodel import we_are_translated
 from pypy.objspace.std.dictmultiobject import W_DictMultiObject
 from pypy.objspace.std.listobject import W_ListObject
 from pypy.objspace.std.setobject import W_BaseSetObject
+from pypy.objspace.std.slotsobject import W_ObjectObjectUserSlots
 from pypy.objspace.std.typeobject import MethodCache
 from pypy.objspace.std.mapdict import MapAttrCache
 from rpython.rlib import rposix, rgc, rstack
@@ -104,6 +105,8 @@ def strategy(space, w_obj):
         name = w_obj.strategy.__class__.__name__
     elif isinstance(w_obj, W_BaseSetObject):
         name = w_obj.strategy.__class__.__name__
+    elif isinstance(w_obj, W_ObjectObjectUserSlots):
+        name = w_obj.__class__.__name__
     else:
         m = w_obj._get_mapdict_map()
         if m is not None:
@@ -181,6 +184,30 @@ def specialized_zip_2_lists(space, w_list1, w_list2):
     from pypy.objspace.std.specialisedtupleobject import specialized_zip_2_lists
     return specialized_zip_2_lists(space, w_list1, w_list2)
 
+def specialized_sum(space, w_sequence, w_start):
+    from pypy.module.__builtin__.functional import specialized_sum
+    return specialized_sum(space, w_sequence, w_start)
+
+@unwrap_spec(enabled=bool)
+def set_lazy_imports(space, enabled, w_allow=None, w_deny=None):
+    """Enable or disable the lazy imports.  The body of a module imported
+    lazily from a .py file only runs when one of its attributes is first
+    needed.  Packages are never lazy.  'allow' is a list of module names:
+    if given, only these modules and their submodules are lazy.  'deny' is
+    a list of modules that are never lazy, in addition to a few modules
+    with side effects at import time like site."""
+    from pypy.module.imp.importing import LazyImportState, DEFAULT_LAZY_DENY
+    state = space.fromcache(LazyImportState)
+    state.enabled = enabled
+    state.allow = []
+    if not space.is_none(w_allow):
+        state.allow = [space.text_w(w_name)
+                       for w_name in space.unpackiterable(w_allow)]
+    state.deny = DEFAULT_LAZY_DENY[:]
+    if not space.is_none(w_deny):
+        state.deny += [space.text_w(w_name)
+                       for w_name in space.unpackiterable(w_deny)]
+
 def set_code_callback(space, w_callable):
     cache = space.fromcache(CodeHookCache)
     if space.is_none(w_callable):
@@ -122,6 +122,8 @@ class AppTest(object):
         assert strategy(d) == "EmptyDictStrategy"
         d = {1: None, 5: None}
         assert strategy(d) == "IntDictStrategy"
+        d = {1.5: None, 5.0: None}
+        assert strategy(d) == "FloatDictStrategy"
 
     def test_set_strategy(self):
         from __pypy__ import strategy
@@ -130,6 +132,8 @@ class AppTest(object):
         assert strategy(s) == "EmptySetStrategy"
         s = set([2, 3, 4])
         assert strategy(s) == "IntegerSetStrategy"
+        s = set([2.5, 3.0])
+        assert strategy(s) == "FloatSetStrategy"
 
     def test_instance_strategy(self):
         import sys
@@ -143,6 +147,26 @@ class AppTest(object):
         a.y = 2
         assert strategy(a).startswith("<UnboxedPlainAttribute y DICT 0 1 <UnboxedPlainAttribute x DICT 0 0 <DictTerminator w_cls=<W_TypeObject 'A'")
 
+    def test_instance_strategy_type_change(self):
+        from __pypy__ import strategy
+        class A(object):
+            pass
+        a = A()
+        a.x = 1.5
+        a.y = True
+        a.z = 2.5
+        assert strategy(a).startswith("<UnboxedPlainAttribute z DICT 0 2 <UnboxedPlainAttribute y DICT 0 1 <UnboxedPlainAttribute x DICT 0 0 <DictTerminator")
+        a.y = "abc"
+        # only 'y' is not unboxed any more
+        assert strategy(a).startswith("<UnboxedPlainAttribute z DICT 0 1 <PlainAttribute y DICT 1 <UnboxedPlainAttribute x DICT 0 0 <DictTerminator")
+        assert (a.x, a.y, a.z) == (1.5, "abc", 2.5)
+        b = A()
+        b.x = 3.5
+        b.y = False
+        b.z = 4.5
+        assert strategy(b).startswith("<UnboxedPlainAttribute z DICT 0 1 <PlainAttribute y DICT 1 <UnboxedPlainAttribute x DICT 0 0 <DictTerminator")
+        assert (b.x, b.y, b.z) == (3.5, False, 4.5)
+
 
 class AppTestJitFeatures(object):
     spaceconfig = {"translation.jit": True}
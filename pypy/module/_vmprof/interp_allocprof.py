@@ -0,0 +1,166 @@
+"""
+Allocation sampling: every time the GC has allocated about 'interval'
+more bytes, record the Python stack that did the allocation.  Stacks are
+the same (tag, value) pairs as in the vmprof profiles, innermost first,
+including the entries of the JIT-compiled code.
+"""
+
+from pypy.interpreter.error import oefmt
+from pypy.interpreter.executioncontext import AsyncAction
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.interpreter.pycode import PyCode
+from pypy.module._vmprof.interp_vmprof import _get_full_name
+from pypy.module.gc.hook import LowLevelGcHooks
+from rpython.rlib import rgc
+from rpython.rlib.rvmprof import traceback
+from rpython.rlib.rvmprof.rvmprof import VMPROF_CODE_TAG, VMPROF_JITTED_TAG
+from rpython.rtyper.lltypesystem import lltype, rffi
+
+DEFAULT_INTERVAL = 512 * 1024
+MAX_DEPTH = 64
+BUFFER_SIZE = 16384     # in words
+
+
+class AllocSampler(object):
+    """Singleton, created by space.fromcache.  While sampling is enabled,
+    it is installed as the 'alloc_sampler' of the LowLevelGcHooks.
+
+    The GC hook cannot allocate GC memory, so it only copies the stack
+    into a raw buffer, as entries [nbytes, length, tag, value, ...].  The
+    AllocSampleAction then moves the entries into 'w_samples', a dict
+    {stack tuple: (count, bytes)}.
+    """
+
+    def __init__(self, space):
+        self.space = space
+        self.interval = 0
+        self.buffer = lltype.nullptr(rffi.SIGNEDP.TO)
+        self.buffer_used = 0
+        self.dropped = 0
+        self.w_samples = space.newdict()
+        self.action = AllocSampleAction(space, self)
+
+    def enable(self, interval):
+        if not self.buffer:
+            self.buffer = lltype.malloc(rffi.SIGNEDP.TO, BUFFER_SIZE,
+                                        flavor='raw')
+        self.buffer_used = 0
+        self.dropped = 0
+        self.w_samples = self.space.newdict()
+        self.interval = interval
+        self.space.fromcache(LowLevelGcHooks).alloc_sampler = self
+        rgc.set_alloc_sample_interval(interval)
+
+    def disable(self):
+        rgc.set_alloc_sample_interval(0)
+        self.space.fromcache(LowLevelGcHooks).alloc_sampler = None
+        self.interval = 0
+        self.flush()
+        if self.buffer:
+            lltype.free(self.buffer, flavor='raw')
+            self.buffer = lltype.nullptr(rffi.SIGNEDP.TO)
+
+    def on_sample(self, nbytes):
+        # called from the GC: must not allocate GC memory
+        array_p, array_length = traceback.traceback(MAX_DEPTH)
+        if array_p is None:
+            return
+        pos = self.buffer_used
+        # keep all the entries, like the time sampler of vmprof: the
+        # interpreted frames, and the machine code address and the code
+        # ids of the frames running in JIT-compiled code
+        length = array_length & ~1
+        if not self.buffer or pos + 2 + length > BUFFER_SIZE:
+            self.dropped += 1
+        else:
+            i = 0
+            while i < length:
+                self.buffer[pos + 2 + i] = array_p[i]
+                i += 1
+            self.buffer[pos] = nbytes
+            self.buffer[pos + 1] = length
+            self.buffer_used = pos + 2 + length
+        lltype.free(array_p, flavor='raw')
+        self.action.fire()
+
+    def flush(self):
+        space = self.space
+        pos = 0
+        while pos < self.buffer_used:
+            nbytes = self.buffer[pos]
+            length = self.buffer[pos + 1]
+            pos += 2
+            items_w = [space.newint(self.buffer[pos + j])
+                       for j in range(length)]
+            pos += length
+            w_stack = space.newtuple(items_w)
+            w_old = space.finditem(self.w_samples, w_stack)
+            if w_old is None:
+                count = 1
+            else:
+                w_count, w_bytes = space.fixedview(w_old, 2)
+                count = space.int_w(w_count) + 1
+                nbytes += space.int_w(w_bytes)
+            space.setitem(self.w_samples, w_stack,
+                          space.newtuple([space.newint(count),
+                                          space.newint(nbytes)]))
+        self.buffer_used = 0
+
+    def get_names(self):
+        """Return a dict {code id: vmprof name} for the code objects that
+        appear in the samples and are still alive.  Code objects created
+        while vmprof itself is enabled are only named in its profile."""
+        space = self.space
+        wanted = {}
+        for w_stack in space.listview(self.w_samples):
+            items_w = space.fixedview(w_stack)
+            for i in range(0, len(items_w) - 1, 2):
+                tag = space.int_w(items_w[i])
+                if tag == VMPROF_CODE_TAG or tag == VMPROF_JITTED_TAG:
+                    wanted[space.int_w(items_w[i + 1])] = None
+        w_names = space.newdict()
+        if not wanted:
+            return w_names
+        for wref in PyCode._vmprof_weak_list.get_all_handles():
+            code = wref()
+            if code is not None and code._vmprof_unique_id in wanted:
+                space.setitem(w_names, space.newint(code._vmprof_unique_id),
+                              space.newtext(_get_full_name(code)))
+        return w_names
+
+
+class AllocSampleAction(AsyncAction):
+    def __init__(self, space, sampler):
+        AsyncAction.__init__(self, space)
+        self.sampler = sampler
+
+    def perform(self, executioncontext, frame):
+        self.sampler.flush()
+
+
+@unwrap_spec(interval=int)
+def enable_allocation_sampling(space, interval=DEFAULT_INTERVAL):
+    """Record the Python stack every time about 'interval' more bytes
+    have been allocated.  Clears the samples recorded so far."""
+    if interval <= 0:
+        raise oefmt(space.w_ValueError, "interval must be positive")
+    space.fromcache(AllocSampler).enable(interval)
+
+def disable_allocation_sampling(space):
+    """Stop recording allocation samples.  The samples recorded so far
+    remain available from get_allocation_samples()."""
+    space.fromcache(AllocSampler).disable()
+
+def get_allocation_samples(space):
+    """Return a tuple (samples, names, dropped).  'samples' is a dict
+    {stack: (count, bytes)}, where 'stack' is a flat tuple of vmprof
+    (tag, value) pairs, innermost first, and 'bytes' is the number of bytes
+    allocated that the samples stand for.  'names' maps the code ids to the
+    vmprof names "py:name:line:filename".  'dropped' counts the samples
+    that were lost because too many were taken before they could be
+    recorded."""
+    sampler = space.fromcache(AllocSampler)
+    sampler.flush()
+    return space.newtuple([space.call_method(sampler.w_samples, 'copy'),
+                           sampler.get_names(),
+                           space.newint(sampler.dropped)])
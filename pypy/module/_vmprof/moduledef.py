@@ -17,6 +17,11 @@ class Module(MixedModule):
         'get_profile_path': 'interp_vmprof.get_profile_path',
         'stop_sampling': 'interp_vmprof.stop_sampling',
         'start_sampling': 'interp_vmprof.start_sampling',
+        'enable_allocation_sampling':
+            'interp_allocprof.enable_allocation_sampling',
+        'disable_allocation_sampling':
+            'interp_allocprof.disable_allocation_sampling',
+        'get_allocation_samples': 'interp_allocprof.get_allocation_samples',
 
         'VMProfError': 'space.fromcache(interp_vmprof.Cache).w_VMProfError',
     }
@@ -0,0 +1,109 @@
+import py
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.interpreter.pycode import PyCode
+from pypy.module._vmprof import interp_allocprof
+from pypy.module.gc.hook import LowLevelGcHooks
+from rpython.rlib.rvmprof.rvmprof import (
+    VMPROF_CODE_TAG, VMPROF_JITTED_TAG, VMPROF_ASSEMBLER_TAG)
+from rpython.rtyper.lltypesystem import lltype, rffi
+
+
+class FakeTraceback(object):
+    def __init__(self):
+        self.entries = []
+
+    def traceback(self, estimate_number_of_entries):
+        array_p = lltype.malloc(rffi.SIGNEDP.TO, len(self.entries) or 1,
+                                flavor='raw')
+        for i, value in enumerate(self.entries):
+            array_p[i] = value
+        return (array_p, len(self.entries))
+
+
+class AppTestAllocProf(object):
+    spaceconfig = {'usemodules': ['_vmprof']}
+
+    def setup_class(cls):
+        if cls.runappdirect:
+            py.test.skip("Can't run this test with -A")
+        space = cls.space
+        fake = FakeTraceback()
+        cls._orig_traceback = interp_allocprof.traceback
+        interp_allocprof.traceback = fake
+        gchooks = space.fromcache(LowLevelGcHooks)
+
+        def interp_set_stack(space, w_entries):
+            # a flat list of (tag, value) pairs, innermost first
+            fake.entries = [space.int_w(w_x)
+                            for w_x in space.listview(w_entries)]
+
+        @unwrap_spec(nbytes=int)
+        def interp_sample(space, nbytes):
+            gchooks.fire_gc_alloc_sample(nbytes)
+
+        def interp_code_id(space, w_code):
+            pycode = space.interp_w(PyCode, w_code)
+            return space.newint(pycode._vmprof_unique_id)
+
+        cls.w_set_stack = space.wrap(interp2app(interp_set_stack))
+        cls.w_sample = space.wrap(interp2app(interp_sample))
+        cls.w_code_id = space.wrap(interp2app(interp_code_id))
+        cls.w_tags = space.wrap((VMPROF_CODE_TAG, VMPROF_JITTED_TAG,
+                                 VMPROF_ASSEMBLER_TAG))
+
+    def teardown_class(cls):
+        interp_allocprof.traceback = cls._orig_traceback
+
+    def test_samples(self):
+        import _vmprof
+        CODE, JITTED, ASM = self.tags
+        def f(): pass
+        def g(): pass
+        f_id = self.code_id(f.func_code)
+        g_id = self.code_id(g.func_code)
+        self.sample(1000)     # not enabled, ignored
+        _vmprof.enable_allocation_sampling(4096)
+        self.set_stack([CODE, f_id, CODE, g_id])
+        self.sample(5000)
+        self.sample(4200)
+        self.set_stack([CODE, g_id])
+        self.sample(8000)
+        _vmprof.disable_allocation_sampling()
+        self.sample(1000)     # disabled again
+        #
+        samples, names, dropped = _vmprof.get_allocation_samples()
+        assert samples == {(CODE, f_id, CODE, g_id): (2, 9200),
+                           (CODE, g_id): (1, 8000)}
+        assert dropped == 0
+        assert names[f_id].startswith('py:f:%d:' % f.func_code.co_firstlineno)
+        assert names[g_id].startswith('py:g:')
+        #
+        # enabling again starts from scratch
+        _vmprof.enable_allocation_sampling()
+        _vmprof.disable_allocation_sampling()
+        assert _vmprof.get_allocation_samples() == ({}, {}, 0)
+
+    def test_jit_frames(self):
+        import _vmprof
+        CODE, JITTED, ASM = self.tags
+        def f(): pass
+        def g(): pass
+        def h(): pass
+        f_id = self.code_id(f.func_code)
+        g_id = self.code_id(g.func_code)
+        h_id = self.code_id(h.func_code)
+        # f runs in the interpreter, called by g inlined in the machine code
+        # of h's loop, like in the stack traces of the time sampler
+        stack = (CODE, f_id, ASM, 0x10000, JITTED, g_id, JITTED, h_id)
+        _vmprof.enable_allocation_sampling(4096)
+        self.set_stack(list(stack) + [CODE])   # incomplete last entry
+        self.sample(5000)
+        _vmprof.disable_allocation_sampling()
+        samples, names, dropped = _vmprof.get_allocation_samples()
+        assert samples == {stack: (1, 5000)}
+        assert sorted(names) == sorted([f_id, g_id, h_id])
+        assert names[g_id].startswith('py:g:')
+
+    def test_bad_interval(self):
+        import _vmprof
+        raises(ValueError, _vmprof.enable_allocation_sampling, 0)
@@ -0,0 +1,37 @@
+# NOT_RPYTHON
+
+import gc
+
+class _State(object):
+    token = None
+
+_state = _State()
+
+def start_background_marking(interval=0.005):
+    """Start a helper thread that advances major collections in the
+    background.
+
+    Every 'interval' seconds, if a major collection is in progress, the
+    helper runs its steps one after the other, releasing the GIL between
+    them.  Each step done by the helper is one step that the other threads
+    skip after their next minor collection, so most of the marking and
+    sweeping work is moved to moments where they are idle (e.g. waiting
+    for I/O).  The helper never starts a major collection by itself, and
+    does nothing while the GC is disabled.
+    """
+    import thread, time
+    token = object()
+    _state.token = token
+
+    def run():
+        while _state.token is token:
+            if gc._assist_collect_step():
+                time.sleep(0)    # release the GIL between two steps
+            else:
+                time.sleep(interval)
+
+    thread.start_new_thread(run, ())
+
+def stop_background_marking():
+    """Stop the helper thread started by start_background_marking()."""
+    _state.token = None
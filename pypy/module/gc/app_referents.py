@@ -65,6 +65,7 @@ class GcStats(object):
         self.memory_allocated_sum = self._format(self._s.total_allocated_memory + self._s.total_memory_pressure +
                                             self._s.jit_backend_allocated)
         self.total_gc_time = self._s.total_gc_time
+        self.nursery_resizes = self._s.nursery_resizes
 
     def _format(self, v):
         if v < 1000000:
@@ -116,3 +117,58 @@ class GcStats(object):
 
 def get_stats(memory_pressure=False):
     return GcStats(gc._get_stats(memory_pressure=memory_pressure))
+
+
+class HeapSnapshot(object):
+    """Number of live objects and bytes per class, as returned by
+    gc.heap_snapshot().  The bytes of internal objects, like the storage
+    of a list or the characters of a string, are counted in the class of
+    the object that owns them.  Note that a snapshot keeps alive the
+    classes it contains.
+    """
+
+    def __init__(self, entries, unattributed):
+        self.counts = {}
+        self.sizes = {}
+        for cls, count, size in entries:
+            self.counts[cls] = count
+            self.sizes[cls] = size
+        self.unattributed = unattributed
+        self.total_count = sum(self.counts.values())
+        self.total_bytes = sum(self.sizes.values()) + unattributed
+
+    def top(self, n=20):
+        """Return the 'n' classes using the most memory, as a list of
+        (class, count, bytes)."""
+        result = [(cls, self.counts[cls], self.sizes[cls])
+                  for cls in self.counts]
+        result.sort(key=lambda entry: entry[2], reverse=True)
+        return result[:n]
+
+    def diff(self, older):
+        """Return the classes whose number of objects or bytes changed
+        since the 'older' snapshot, as a list of (class, count delta,
+        bytes delta), with the largest growth in bytes first."""
+        result = []
+        for cls in set(self.counts) | set(older.counts):
+            dcount = self.counts.get(cls, 0) - older.counts.get(cls, 0)
+            dsize = self.sizes.get(cls, 0) - older.sizes.get(cls, 0)
+            if dcount or dsize:
+                result.append((cls, dcount, dsize))
+        result.sort(key=lambda entry: entry[2], reverse=True)
+        return result
+
+    def __repr__(self):
+        return '<HeapSnapshot: %d objects, %d bytes, %d classes>' % (
+            self.total_count, self.total_bytes, len(self.counts))
+
+
+def heap_snapshot():
+    """Return a HeapSnapshot with the number of objects and bytes used by
+    every class, without writing anything to disk.  Much cheaper than
+    dump_rpy_heap(): the heap is walked once and only one entry per class
+    is kept.  Compare two snapshots with 'new.diff(old)' to find what is
+    growing in a long-running process.
+    """
+    entries, unattributed = gc._heap_summary()
+    return HeapSnapshot(entries, unattributed)
@@ -135,6 +135,15 @@ def collect_step(space):
     w_stats = sc.do()
     return w_stats
 
+def assist_collect_step(space):
+    """
+    If a major collection is in progress, run one of its steps now, on
+    behalf of the other threads: the next time they do a minor collection
+    they skip one major collection step.  Never starts a new major
+    collection.  Return True if a step was done.
+    """
+    return space.newbool(rgc.assist_collect_step())
+
 # ____________________________________________________________
 
 @unwrap_spec(filename='fsencode')
@@ -20,9 +20,15 @@ class Module(MixedModule):
             self.appleveldefs.update({
                 'dump_rpy_heap': 'app_referents.dump_rpy_heap',
                 'get_stats': 'app_referents.get_stats',
+                'heap_snapshot': 'app_referents.heap_snapshot',
+                'start_background_marking':
+                    'app_background.start_background_marking',
+                'stop_background_marking':
+                    'app_background.stop_background_marking',
                 })
             self.interpleveldefs.update({
                 'collect_step': 'interp_gc.collect_step',
+                '_assist_collect_step': 'interp_gc.assist_collect_step',
                 'get_rpy_roots': 'referents.get_rpy_roots',
                 'get_rpy_referents': 'referents.get_rpy_referents',
                 'get_rpy_memory_usage': 'referents.get_rpy_memory_usage',
@@ -30,6 +36,7 @@ class Module(MixedModule):
                 'get_objects': 'referents.get_objects',
                 'get_referents': 'referents.get_referents',
                 'get_referrers': 'referents.get_referrers',
+                '_heap_summary': 'referents.heap_summary',
                 '_get_stats': 'referents.get_stats',
                 '_dump_rpy_heap': 'referents._dump_rpy_heap',
                 'get_typeids_z': 'referents.get_typeids_z',
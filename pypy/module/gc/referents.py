@@ -154,6 +154,85 @@ def get_referrers(space, args_w):
     rgc.assert_no_more_gcflags()
     return space.newlist(result_w)
 
+# ____________________________________________________________
+
+class HeapSummary(object):
+    """Number of objects and bytes of every app-level type, as computed
+    by heap_summary().  Each RPython object that is not an app-level
+    object is accounted to the first app-level object from which the
+    walk reached it, e.g. the storage of a list is accounted to the list.
+    Objects reachable only from RPython roots go to 'unattributed'."""
+
+    def __init__(self):
+        self.index = {}        # w_type -> position in the lists below
+        self.types_w = []
+        self.counts = []
+        self.sizes = []
+        self.unattributed = 0
+
+    def get_index(self, space, w_obj):
+        w_type = space.type(w_obj)
+        try:
+            return self.index[w_type]
+        except KeyError:
+            i = len(self.types_w)
+            self.index[w_type] = i
+            self.types_w.append(w_type)
+            self.counts.append(0)
+            self.sizes.append(0)
+            return i
+
+    def walk(self, space, roots):
+        # Like rgc.do_get_objects(), but instead of building the list of
+        # all objects, only update the totals.  'owners' is parallel to
+        # 'pending': the index of the type that the object is accounted to.
+        pending = []
+        owners = []
+        for gcref in roots:
+            if gcref:
+                pending.append(gcref)
+                owners.append(-1)
+        while pending:
+            gcref = pending.pop()
+            owner = owners.pop()
+            if rgc.get_gcflag_extra(gcref):
+                continue
+            rgc.toggle_gcflag_extra(gcref)
+            w_obj = try_cast_gcref_to_w_root(gcref)
+            if w_obj is not None:
+                owner = self.get_index(space, w_obj)
+                self.counts[owner] += 1
+            size = rgc.get_rpy_memory_usage(gcref)
+            if owner >= 0:
+                self.sizes[owner] += size
+            else:
+                self.unattributed += size
+            for gcref1 in rgc.get_rpy_referents(gcref):
+                pending.append(gcref1)
+                owners.append(owner)
+
+def heap_summary(space):
+    """Return a tuple (entries, unattributed_bytes), where 'entries' is a
+    list of (type, count, bytes) for every app-level type with instances
+    alive.  Walks the whole heap but only keeps one entry per type."""
+    if not rgc.has_gcflag_extra():
+        raise missing_operation(space)
+    roots = rgc.get_rpy_roots()
+    if roots is None:
+        raise missing_operation(space)
+    roots = [gcref for gcref in roots if gcref]
+    summary = HeapSummary()
+    summary.walk(space, roots)
+    rgc.clear_gcflag_extra(roots)
+    rgc.assert_no_more_gcflags()
+    entries_w = []
+    for i in range(len(summary.types_w)):
+        entries_w.append(space.newtuple([summary.types_w[i],
+                                         space.newint(summary.counts[i]),
+                                         space.newint(summary.sizes[i])]))
+    return space.newtuple([space.newlist(entries_w),
+                           space.newint(summary.unattributed)])
+
 @unwrap_spec(fd=int)
 def _dump_rpy_heap(space, fd):
     try:
@@ -192,6 +271,7 @@ class W_GcStats(W_Root):
         self.peak_rawmalloced_memory = rgc.get_stats(rgc.PEAK_RAWMALLOCED_MEMORY)
         self.nursery_size = rgc.get_stats(rgc.NURSERY_SIZE)
         self.total_gc_time = rgc.get_stats(rgc.TOTAL_GC_TIME)
+        self.nursery_resizes = rgc.get_stats(rgc.NURSERY_RESIZES)
 
 W_GcStats.typedef = TypeDef("GcStats",
     total_memory_pressure=interp_attrproperty("total_memory_pressure",
@@ -220,6 +300,8 @@ W_GcStats.typedef = TypeDef("GcStats",
         cls=W_GcStats, wrapfn="newint"),
     total_gc_time=interp_attrproperty("total_gc_time",
         cls=W_GcStats, wrapfn="newint"),
+    nursery_resizes=interp_attrproperty("nursery_resizes",
+        cls=W_GcStats, wrapfn="newint"),
 )
 
 @unwrap_spec(memory_pressure=bool)
@@ -119,6 +119,28 @@ class AppTestGC(object):
         assert n >= 2 # at least one step + 1 finalizing
         assert X.deleted == 3
 
+class AppTestBackgroundMarking(object):
+    spaceconfig = {"usemodules": ["thread", "time"]}
+
+    def setup_class(cls):
+        if cls.runappdirect:
+            pytest.skip("these tests cannot work with -A")
+
+    def test_assist_collect_step(self):
+        import gc
+        # no major collection is ever in progress when untranslated
+        assert gc._assist_collect_step() is False
+
+    def test_start_stop(self):
+        import gc, time
+        gc.start_background_marking(0.001)
+        time.sleep(0.01)
+        gc.stop_background_marking()
+        gc.stop_background_marking()    # no-op
+        gc.start_background_marking()
+        gc.start_background_marking()   # replaces the previous helper
+        gc.stop_background_marking()
+
 class AppTestGcDumpHeap(object):
     pytestmark = py.test.mark.xfail(run=False)
 
@@ -117,6 +117,29 @@ class AppTestReferents(object):
         else:
             assert 0, "the tuple (7,) is not found as gc.get_referrers(7)"
 
+    def test_heap_snapshot(self):
+        import gc
+        snap1 = gc.heap_snapshot()
+        assert snap1.counts[list] >= 4
+        assert snap1.counts[tuple] >= 1
+        assert snap1.sizes[list] > 0
+        assert snap1.total_count >= 5
+        assert snap1.total_bytes >= sum(snap1.sizes.values())
+        assert snap1.top(1)[0][2] == max(snap1.sizes.values())
+        #
+        l4 = self.ALL_ROOTS[0]
+        l4.append([[5], [6]])
+        try:
+            snap2 = gc.heap_snapshot()
+        finally:
+            del l4[-1]
+        assert snap2.counts[list] == snap1.counts[list] + 3
+        changes = dict([(cls, (dcount, dsize))
+                        for cls, dcount, dsize in snap2.diff(snap1)])
+        assert changes[list][0] == 3
+        assert changes[list][1] > 0
+        assert tuple not in changes or changes[tuple][0] == 0
+
 
 class AppTestReferentsMore(object):
 
@@ -12,7 +12,7 @@ from pypy.interpreter.baseobjspace import W_Root, CannotHaveLock
 from pypy.interpreter.eval import Code
 from pypy.interpreter.pycode import PyCode
 from pypy.interpreter.streamutil import wrap_streamerror
-from rpython.rlib import streamio, jit
+from rpython.rlib import streamio, jit, rtime
 from rpython.rlib.streamio import StreamErrors
 from rpython.rlib.objectmodel import we_are_translated, specialize
 from pypy.module.sys.version import PYPY_VERSION
@@ -137,6 +137,61 @@ else:
         except OSError:
             return False
 
+class DirectoryListing(object):
+    def __init__(self, mtime, names):
+        self.mtime = mtime
+        self.names = names      # {name: None}
+
+
+class DirectoryListingCache(object):
+    """Cache of the names of the files in the directories of sys.path,
+    to avoid one failing stat() per candidate file name and directory.
+    An entry is invalidated when the mtime of its directory changes.
+    Directories whose mtime is less than one second old are not cached,
+    because a file could still be added in the same tick of the clock.
+    """
+    def __init__(self, space):
+        self.listings = {}      # {absolute path: DirectoryListing}
+
+    def getnames(self, path):
+        """Return the names in the directory 'path' as a dict, or None
+        if they are unknown."""
+        if not os.path.isabs(path):
+            return None     # depends on the current directory
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        listing = self.listings.get(path, None)
+        if listing is not None and listing.mtime == mtime:
+            return listing.names
+        if listing is not None:
+            del self.listings[path]
+        if mtime >= rtime.time() - 1.0:
+            return None
+        try:
+            names = os.listdir(path)
+        except OSError:
+            return None
+        d = {}
+        for name in names:
+            d[name] = None
+        self.listings[path] = DirectoryListing(mtime, d)
+        return d
+
+def may_contain_module(space, names, partname):
+    """Check if the directory with the given names can contain the module
+    or package 'partname'."""
+    if (partname in names or
+            partname + ".py" in names or
+            (_WIN32 and partname + ".pyw" in names)):
+        return True
+    if space.config.objspace.lonepycfiles and partname + ".pyc" in names:
+        return True
+    if has_so_extension(space) and partname + get_so_extension(space) in names:
+        return True
+    return False
+
 def try_getattr(space, w_obj, w_name):
     try:
         return space.getattr(w_obj, w_name)
@@ -145,6 +200,11 @@ def try_getattr(space, w_obj, w_name):
         # hasattr, which eats all exceptions.
         return None
 
+def try_getpath(space, w_mod):
+    if isinstance(w_mod, W_LazyModule) and w_mod.lazy_filename is not None:
+        return None     # not a package, and don't load it just for that
+    return try_getattr(space, w_mod, space.newtext('__path__'))
+
 def check_sys_modules(space, w_modulename):
     return space.finditem(space.sys.get('modules'), w_modulename)
 
@@ -337,7 +397,7 @@ def absolute_import_try(space, modulename, baselevel, w_fromlist):
         w_mod = check_sys_modules_w(space, modulename)
         first = w_mod
         if w_fromlist is not None and w_mod is not None:
-            w_path = try_getattr(space, w_mod, space.newtext('__path__'))
+            w_path = try_getpath(space, w_mod)
     else:
         level = 0
         first = None
@@ -352,7 +412,7 @@ def absolute_import_try(space, modulename, baselevel, w_fromlist):
             if level == baselevel:
                 first = w_mod
             if w_fromlist is not None:
-                w_path = try_getattr(space, w_mod, space.newtext('__path__'))
+                w_path = try_getpath(space, w_mod)
             level += 1
     if w_fromlist is not None:
         # bit artificial code but important to not just unwrap w_fromlist
@@ -409,7 +469,7 @@ def _absolute_import(space, modulename, baselevel, w_fromlist, tentative):
             first = w_mod
             tentative = 0
         prefix.append(part)
-        w_path = try_getattr(space, w_mod, space.newtext('__path__'))
+        w_path = try_getpath(space, w_mod)
         level += 1
 
     if w_fromlist is not None:
@@ -565,6 +625,7 @@ def find_module(space, modulename, w_modulename, partname, w_path,
     #     when w_path is null
 
     if w_path is not None:
+        dircache = space.fromcache(DirectoryListingCache)
         for w_pathitem in space.unpackiterable(w_path):
             # sys.path_hooks import hook
             if (w_lib_extensions is not None and
@@ -578,6 +639,10 @@ def find_module(space, modulename, w_modulename, partname, w_path,
             path = space.fsencode_w(w_pathitem)
             filepart = os.path.join(path, partname)
             log_pyverbose(space, 2, "# trying %s\n" % (filepart,))
+            names = dircache.getnames(path)
+            if names is not None and not may_contain_module(space, names,
+                                                            partname):
+                continue
             if os.path.isdir(filepart) and case_ok(filepart):
                 if has_init_module(space, filepart):
                     return FindInfo(PKG_DIRECTORY, filepart, None)
@@ -603,6 +668,74 @@ def find_module(space, modulename, w_modulename, partname, w_path,
     # not found
     return delayed_builtin
 
+# modules with side effects at import time, that are never imported lazily
+DEFAULT_LAZY_DENY = ['site', 'sitecustomize', 'usercustomize', 'rlcompleter']
+
+def _module_in(modulename, names):
+    "Check if 'modulename' is one of 'names' or a submodule of one of them."
+    for name in names:
+        if (modulename == name or
+                (modulename.startswith(name) and
+                 modulename[len(name)] == '.')):
+            return True
+    return False
+
+class LazyImportState(object):
+    """Settings of the lazy imports, changed with
+    __pypy__.set_lazy_imports()."""
+
+    def __init__(self, space):
+        self.enabled = False
+        self.allow = []
+        self.deny = DEFAULT_LAZY_DENY[:]
+
+    def is_lazy(self, modulename):
+        if not self.enabled or _module_in(modulename, self.deny):
+            return False
+        return not self.allow or _module_in(modulename, self.allow)
+
+
+class W_LazyModule(Module):
+    """A module imported from a source file whose body is only executed
+    when one of its attributes is first needed.  Until then, it only
+    contains __name__, __package__, __file__ and __doc__."""
+
+    def __init__(self, space, w_name, filename):
+        Module.__init__(self, space, w_name)
+        self.lazy_filename = filename
+
+    def getdict(self, space):
+        if self.lazy_filename is not None:
+            self._load_lazily(space)
+        return self.w_dict
+
+    def _load_lazily(self, space):
+        lock = getimportlock(space)
+        lock.acquire_lock()
+        try:
+            filename = self.lazy_filename
+            if filename is None:
+                return      # done by another thread in the meantime
+            self.lazy_filename = None
+            try:
+                stream = streamio.open_file_as_stream(filename, "U")
+            except StreamErrors as e:
+                raise wrap_streamerror(space, e, filename)
+            try:
+                load_source_module(space, self.w_name, self, filename,
+                                   _wrap_readall(space, stream),
+                                   stream.try_to_find_file_descriptor(),
+                                   check_afterwards=False)
+            except OperationError:
+                w_mods = space.sys.get('modules')
+                if space.is_w(space.finditem(w_mods, self.w_name), self):
+                    space.delitem(w_mods, self.w_name)
+                raise
+            finally:
+                _close_ignore(stream)
+        finally:
+            lock.release_lock(silent_after_fork=True)
+
 def _prepare_module(space, w_mod, filename, pkgdir):
     space.sys.setmodule(w_mod)
     space.setattr(w_mod, space.newtext('__file__'), space.newtext(filename))
@@ -641,6 +774,16 @@ def load_module(space, w_modulename, find_info, reuse=False):
         return space.getbuiltinmodule(find_info.filename, force_init=True,
                                       reuse=reuse)
 
+    if (find_info.modtype == PY_SOURCE and not reuse and
+            space.fromcache(LazyImportState).is_lazy(
+                space.text_w(w_modulename))):
+        w_mod = W_LazyModule(space, w_modulename, find_info.filename)
+        space.setitem(w_mod.w_dict, space.newtext('__file__'),
+                      space.newtext(find_info.filename))
+        space.setitem(w_mod.w_dict, space.newtext('__doc__'), space.w_None)
+        space.setitem(space.sys.get('modules'), w_modulename, w_mod)
+        return w_mod
+
     if find_info.modtype in (PY_SOURCE, PY_COMPILED, C_EXTENSION, PKG_DIRECTORY):
         w_mod = None
         if reuse:
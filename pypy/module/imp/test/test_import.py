@@ -864,6 +864,56 @@ class TestAbi:
             assert importing.get_so_extension(space1) == '.TESTi.so'
             assert importing.get_so_extension(space2) == '.so'
 
+class TestDirectoryListingCache:
+    def make_old(self, path, delta=10):
+        mtime = os.stat(str(path)).st_mtime - delta
+        os.utime(str(path), (mtime, mtime))
+
+    def test_getnames(self):
+        cache = importing.DirectoryListingCache(self.space)
+        d = udir.ensure("dirlistingcache", dir=1)
+        d.join("a.py").write("")
+        d.ensure("pkg", dir=1)
+        assert cache.getnames(str(d)) is None     # too recent
+        self.make_old(d)
+        names = cache.getnames(str(d))
+        assert sorted(names) == ["a.py", "pkg"]
+        assert cache.getnames(str(d)) is names
+        d.join("b.py").write("")
+        self.make_old(d, delta=5)
+        assert sorted(cache.getnames(str(d))) == ["a.py", "b.py", "pkg"]
+        assert cache.getnames("dirlistingcache") is None
+        assert cache.getnames(str(d.join("nonexistent"))) is None
+
+    def test_may_contain_module(self):
+        names = {"a.py": None, "pkg": None, "c.pyc": None}
+        assert importing.may_contain_module(self.space, names, "a")
+        assert importing.may_contain_module(self.space, names, "pkg")
+        assert not importing.may_contain_module(self.space, names, "b")
+        assert not importing.may_contain_module(self.space, names, "c")
+
+    def test_find_module(self):
+        space = self.space
+        d1 = udir.ensure("dirlistingcache1", dir=1)
+        d2 = udir.ensure("dirlistingcache2", dir=1)
+        d2.join("dlc_mod.py").write("x = 42\n")
+        self.make_old(d1)
+        self.make_old(d2)
+        w_path = space.newlist([space.newtext(str(d1)),
+                                space.newtext(str(d2))])
+        find_info = importing.find_module(space, "dlc_mod", None, "dlc_mod",
+                                          w_path, use_loader=False)
+        assert find_info.filename == str(d2.join("dlc_mod.py"))
+        find_info.stream.close()
+        # a module added to a listed directory is found
+        d1.join("dlc_mod.py").write("x = 43\n")
+        self.make_old(d1, delta=5)
+        find_info = importing.find_module(space, "dlc_mod", None, "dlc_mod",
+                                          w_path, use_loader=False)
+        assert find_info.filename == str(d1.join("dlc_mod.py"))
+        find_info.stream.close()
+
+
 def _getlong(data):
     x = marshal.dumps(data)
     return x[-4:]
@@ -1479,6 +1529,102 @@ class AppTestPyPyExtension(object):
         assert isinstance(importer, zipimport.zipimporter)
 
 
+class AppTestLazyImports(object):
+    def setup_class(cls):
+        p = udir.join('lazyimports').ensure(dir=1)
+        p.join('lazy_a.py').write(
+            "import sys\nsys.lazy_a_executed = True\nx = 42\n")
+        p.join('lazy_b.py').write("import sys\nsys.lazy_b_executed = True\n")
+        p.join('lazy_error.py').write("x = 1\n1 / 0\n")
+        p.join('lazy_from.py').write("from lazy_a import x\ny = x + 1\n")
+        pkg = p.join('lazy_pkg').ensure(dir=1)
+        pkg.join('__init__.py').write("import sys\nsys.lazy_pkg_executed = True\n")
+        pkg.join('sub.py').write("z = 3\n")
+        cls.w_saved = cls.space.appexec([cls.space.wrap(str(p))], """
+            (dn):
+                import sys
+                path = list(sys.path)
+                sys.path.insert(0, dn)
+                return path, sys.modules.copy()
+        """)
+
+    def teardown_class(cls):
+        cls.space.appexec([cls.w_saved], """
+            ((saved_path, saved_modules)):
+                import sys, __pypy__
+                __pypy__.set_lazy_imports(False)
+                sys.path[:] = saved_path
+                sys.modules.clear()
+                sys.modules.update(saved_modules)
+        """)
+
+    def setup_method(self, meth):
+        self.space.appexec([], """
+            ():
+                import sys
+                for name in list(sys.modules):
+                    if name.startswith('lazy_'):
+                        del sys.modules[name]
+                for name in dir(sys):
+                    if name.startswith('lazy_'):
+                        delattr(sys, name)
+        """)
+
+    def test_lazy(self):
+        import sys, __pypy__
+        __pypy__.set_lazy_imports(True)
+        import lazy_a
+        assert not hasattr(sys, 'lazy_a_executed')
+        assert sys.modules['lazy_a'] is lazy_a
+        assert lazy_a.__name__ == 'lazy_a'
+        assert lazy_a.__file__.endswith('lazy_a.py')
+        assert lazy_a.x == 42
+        assert sys.lazy_a_executed
+        assert lazy_a.sys is sys
+
+    def test_disabled(self):
+        import sys, __pypy__
+        __pypy__.set_lazy_imports(False)
+        import lazy_a
+        assert sys.lazy_a_executed
+
+    def test_from_import(self):
+        import sys, __pypy__
+        __pypy__.set_lazy_imports(True)
+        from lazy_from import y
+        assert y == 43
+        assert sys.lazy_a_executed
+
+    def test_packages_not_lazy(self):
+        import sys, __pypy__
+        __pypy__.set_lazy_imports(True)
+        import lazy_pkg.sub
+        assert sys.lazy_pkg_executed
+        assert lazy_pkg.sub.z == 3
+
+    def test_allow_deny(self):
+        import sys, __pypy__
+        __pypy__.set_lazy_imports(True, allow=['lazy_a'])
+        import lazy_a, lazy_b
+        assert not hasattr(sys, 'lazy_a_executed')
+        assert sys.lazy_b_executed
+        del sys.modules['lazy_a'], sys.modules['lazy_b']
+        del sys.lazy_b_executed
+        __pypy__.set_lazy_imports(True, deny=['lazy_a'])
+        import lazy_a, lazy_b
+        assert sys.lazy_a_executed
+        assert not hasattr(sys, 'lazy_b_executed')
+
+    def test_error_on_first_access(self):
+        import sys, __pypy__
+        __pypy__.set_lazy_imports(True)
+        import lazy_error
+        raises(ZeroDivisionError, getattr, lazy_error, 'x')
+        assert 'lazy_error' not in sys.modules
+        import lazy_error
+        raises(ZeroDivisionError, "lazy_error.x")
+
+
 class AppTestWriteBytecode(object):
     spaceconfig = {
         "translation.sandbox": False
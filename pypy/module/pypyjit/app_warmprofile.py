@@ -0,0 +1,85 @@
+# NOT_RPYTHON
+
+import pypyjit
+
+_WARM_CACHE_MAGIC = 'pypyjit-warm-profile-1'
+
+def _build_key():
+    import sys, os
+    executable = getattr(sys, 'executable', '')
+    try:
+        st = os.stat(executable)
+        exe = '%s:%d:%d' % (executable, st.st_size, int(st.st_mtime))
+    except (OSError, TypeError):
+        exe = ''
+    return '%s\n%s' % (sys.version, exe)
+
+def _cache_filename(directory, key):
+    import os
+    h = 2166136261
+    for c in key:
+        h = ((h ^ ord(c)) * 16777619) & 0xffffffff
+    return os.path.join(directory, 'warmprofile-%08x.marshal' % h)
+
+def load_warm_cache(filename, key=None):
+    """Return the list of entries stored in the given warm profile file,
+    or [] if it is missing, corrupted or was written by another build."""
+    import marshal
+    if key is None:
+        key = _build_key()
+    try:
+        f = open(filename, 'rb')
+        try:
+            data = marshal.load(f)
+        finally:
+            f.close()
+    except (IOError, EOFError, ValueError, TypeError):
+        return []
+    if (not isinstance(data, tuple) or len(data) != 3 or
+            data[0] != _WARM_CACHE_MAGIC or data[1] != key):
+        return []
+    return list(data[2])
+
+def save_warm_cache(filename, entries, key=None):
+    """Atomically write 'entries' (as returned by get_warm_profile()) to
+    the given file."""
+    import marshal, os
+    if key is None:
+        key = _build_key()
+    tmpname = '%s.%d.tmp' % (filename, os.getpid())
+    f = open(tmpname, 'wb')
+    try:
+        marshal.dump((_WARM_CACHE_MAGIC, key, list(entries)), f)
+    finally:
+        f.close()
+    os.rename(tmpname, filename)
+
+def enable_warm_cache(directory):
+    """Opt-in warm restarts of the JIT.
+
+    Load the warm profile saved in 'directory' by a previous process
+    running the same PyPy build, so that the loops it compiled are traced
+    as soon as their code objects are created again, and arrange for the
+    loops compiled by this process to be saved there at exit.  Entries
+    whose bytecode changed are ignored.  The saved profile replaces the
+    loaded one, so entries whose loops are not compiled again by this
+    process are dropped.  Returns the number of entries loaded.
+    """
+    import atexit, os
+    key = _build_key()
+    filename = _cache_filename(directory, key)
+    loaded = load_warm_cache(filename, key)
+    pypyjit.set_warm_profile(loaded, record=True)
+
+    def save():
+        # the loaded loops are traced early, so the ones that are still
+        # in use are recorded again
+        entries = pypyjit.get_warm_profile()
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            save_warm_cache(filename, sorted(entries), key)
+        except (IOError, OSError):
+            pass
+    atexit.register(save)
+    return len(loaded)
@@ -218,6 +218,26 @@ def get_jitcell_at_key(space, next_instr, is_being_profiled, w_pycode):
     return space.newbool(bool(jit_hooks.get_jitcell_at_key(
         'pypyjit', r_uint(next_instr), int(is_being_profiled), ll_pycode)))
 
+@unwrap_spec(next_instr=int, is_being_profiled=bool, w_pycode=PyCode)
+@dont_look_inside
+def get_trace_decisions(space, next_instr, is_being_profiled, w_pycode):
+    """ Return what the JIT decided about the given position after
+    traces got too long, as a tuple (dont_inline, trace_limit_factor), or
+    None if the JIT has no record about it.  'dont_inline' is true if
+    calls to the function starting there are no longer inlined, and
+    'trace_limit_factor' is how much longer than trace_limit the traces
+    from there may be.
+    """
+    ll_pycode = cast_instance_to_gcref(w_pycode)
+    llcell = jit_hooks.get_jitcell_at_key(
+        'pypyjit', r_uint(next_instr), int(is_being_profiled), ll_pycode)
+    if not llcell:
+        return space.w_None
+    dont_inline = jit_hooks.jitcell_dont_trace_here(llcell)
+    shift = jit_hooks.jitcell_trace_limit_shift(llcell)
+    return space.newtuple([space.newbool(dont_inline),
+                           space.newint(1 << shift)])
+
 @unwrap_spec(next_instr=int, is_being_profiled=bool, w_pycode=PyCode)
 @dont_look_inside
 def dont_trace_here(space, next_instr, is_being_profiled, w_pycode):
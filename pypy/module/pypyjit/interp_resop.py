@@ -348,10 +348,12 @@ W_JitLoopInfo.typedef.acceptable_as_base_class = False
 
 
 class W_JitInfoSnapshot(W_Root):
-    def __init__(self, space, w_times, w_counters, w_counter_times):
+    def __init__(self, space, w_times, w_counters, w_counter_times,
+                 w_loop_stats):
         self.w_loop_run_times = w_times
         self.w_counters = w_counters
         self.w_counter_times = w_counter_times
+        self.w_loop_stats = w_loop_stats
 
 W_JitInfoSnapshot.typedef = TypeDef(
     "JitInfoSnapshot",
@@ -362,7 +364,11 @@ W_JitInfoSnapshot.typedef = TypeDef(
                                        doc="various JIT counters"),
     counter_times = interp_attrproperty_w("w_counter_times",
                                             cls=W_JitInfoSnapshot,
-                                            doc="various JIT timers")
+                                            doc="various JIT timers"),
+    loop_stats = interp_attrproperty_w("w_loop_stats",
+                                         cls=W_JitInfoSnapshot,
+                                         doc="{loop number: (entries, "
+                                             "code size, bridges)}")
 )
 W_JitInfoSnapshot.typedef.acceptable_as_base_class = False
 
@@ -388,7 +394,17 @@ def get_stats_snapshot(space):
     space.setitem_str(w_counter_times, 'TRACING', space.newfloat(tr_time))
     b_time = jit_hooks.stats_get_times_value(None, Counters.BACKEND)
     space.setitem_str(w_counter_times, 'BACKEND', space.newfloat(b_time))
-    return W_JitInfoSnapshot(space, w_times, w_counters, w_counter_times)
+    ll_loop_stats = jit_hooks.stats_get_loop_stats(None)
+    w_loop_stats = space.newdict()
+    if ll_loop_stats:
+        for i in range(len(ll_loop_stats)):
+            item = ll_loop_stats[i]
+            space.setitem(w_loop_stats, space.newint(item.number),
+                          space.newtuple([space.newint(item.entries),
+                                          space.newint(item.code_size),
+                                          space.newint(item.bridges)]))
+    return W_JitInfoSnapshot(space, w_times, w_counters, w_counter_times,
+                             w_loop_stats)
 
 def get_stats_asmmemmgr(space):
     """Returns the raw memory currently used by the JIT backend,
@@ -397,6 +413,17 @@ def get_stats_asmmemmgr(space):
     m2 = jit_hooks.stats_asmmemmgr_used(None)
     return space.newtuple([space.newint(m1), space.newint(m2)])
 
+def get_stats_asmmemmgr_free(space):
+    """Returns how the free raw memory of the JIT backend is split, as a
+    tuple (number_of_free_blocks, largest_free_block, total_released).
+    The free memory outside the largest block is fragmented; the last
+    item is the memory given back to the OS so far."""
+    n = jit_hooks.stats_asmmemmgr_free_blocks(None)
+    largest = jit_hooks.stats_asmmemmgr_largest_free(None)
+    released = jit_hooks.stats_asmmemmgr_released(None)
+    return space.newtuple([space.newint(n), space.newint(largest),
+                           space.newint(released)])
+
 def enable_debug(space):
     """ Set the jit debugging - completely necessary for some stats to work,
     most notably assembler counters.
@@ -0,0 +1,147 @@
+""" Warm-start profiles: a persistent record of which loops the JIT
+compiled in a previous process.
+
+Machine code and optimized traces cannot be reused across processes (they
+contain raw addresses of GC objects, descrs and other assembler), so what
+is saved is the *identity* of every compiled greenkey: the code object's
+filename, name, first line number, a hash of its bytecode, and the
+bytecode offset of the loop header.  When a matching code object is
+created in a new process, we ask the JIT to trace its loops on the very
+next iteration instead of waiting for the counters to reach 'threshold'.
+"""
+
+from rpython.rlib import jit, jit_hooks
+from rpython.rlib.rarithmetic import r_uint, intmask
+from rpython.rtyper.annlowlevel import cast_instance_to_gcref
+from rpython.rtyper.lltypesystem import lltype
+from rpython.rtyper.annlowlevel import cast_base_ptr_to_instance
+from rpython.rtyper.rclass import OBJECT
+
+from pypy.interpreter.error import oefmt
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.interpreter.pycode import PyCode, CodeHookCache
+
+
+def code_key(filename, name, firstlineno):
+    return '%s\x00%s\x00%d' % (filename, name, firstlineno)
+
+def code_hash(pycode):
+    """A hash of the bytecode that is stable across processes (unlike
+    compute_hash(), which may be randomized)."""
+    x = r_uint(2166136261)
+    for c in pycode.co_code:
+        x = (x ^ r_uint(ord(c))) * r_uint(16777619)
+    return intmask(x & r_uint(0x7fffffff))
+
+
+class WarmProfile(object):
+    recording = False
+
+    def __init__(self, space):
+        self.space = space
+        # key -> list of (code_hash, next_instr) waiting for a code object
+        self.pending = {}
+        self.recorded = []     # list of (filename, name, lineno, hash, instr)
+        self.recorded_keys = {}
+        self.applied = 0
+
+    def clear_pending(self):
+        self.pending = {}
+        self.space.fromcache(CodeHookCache)._warm_profile = None
+
+    def add_pending(self, filename, name, firstlineno, hash, next_instr):
+        key = code_key(filename, name, firstlineno)
+        lst = self.pending.get(key, None)
+        if lst is None:
+            lst = []
+            self.pending[key] = lst
+        lst.append((hash, next_instr))
+        self.space.fromcache(CodeHookCache)._warm_profile = self
+
+    @jit.dont_look_inside
+    def new_code(self, pycode):
+        key = code_key(pycode.co_filename, pycode.co_name,
+                       pycode.co_firstlineno)
+        lst = self.pending.get(key, None)
+        if lst is None:
+            return
+        hash = code_hash(pycode)
+        ll_pycode = cast_instance_to_gcref(pycode)
+        for expected_hash, next_instr in lst:
+            if expected_hash != hash:
+                continue   # the source changed since the profile was saved
+            if not 0 <= next_instr < len(pycode.co_code):
+                continue
+            jit_hooks.trace_next_iteration('pypyjit', r_uint(next_instr), 0,
+                                           ll_pycode)
+            self.applied += 1
+
+    def record(self, pycode, next_instr):
+        key = '%s\x00%d' % (code_key(pycode.co_filename, pycode.co_name,
+                                     pycode.co_firstlineno), next_instr)
+        if key in self.recorded_keys:
+            return
+        self.recorded_keys[key] = None
+        self.recorded.append((pycode.co_filename, pycode.co_name,
+                              pycode.co_firstlineno, code_hash(pycode),
+                              next_instr))
+
+    def record_greenkey(self, greenkey):
+        """Called from the JIT hooks after a loop has been compiled."""
+        next_instr = greenkey[0].getint()
+        if greenkey[1].getint():
+            return     # is_being_profiled: not worth replaying
+        ll_code = lltype.cast_opaque_ptr(lltype.Ptr(OBJECT),
+                                         greenkey[2].getref_base())
+        pycode = cast_base_ptr_to_instance(PyCode, ll_code)
+        self.record(pycode, next_instr)
+
+
+def get_warm_profile(space):
+    """ get_warm_profile()
+
+    Return the list of loops compiled since warm-profile recording was
+    enabled, as tuples (filename, name, firstlineno, code_hash, offset).
+    The result can be saved and later passed to set_warm_profile() in
+    another process running the same build.
+    """
+    profile = space.fromcache(WarmProfile)
+    result_w = []
+    for filename, name, firstlineno, hash, next_instr in profile.recorded:
+        result_w.append(space.newtuple([
+            space.newtext(filename), space.newtext(name),
+            space.newint(firstlineno), space.newint(hash),
+            space.newint(next_instr)]))
+    return space.newlist(result_w)
+
+@unwrap_spec(record=bool)
+def set_warm_profile(space, w_entries, record=True):
+    """ set_warm_profile(entries, record=True)
+
+    Install a profile previously returned by get_warm_profile().  From now
+    on, whenever a code object matching one of the entries (same filename,
+    name, first line and bytecode hash) is created, the JIT traces the
+    corresponding loop on its next iteration.  Passing None removes the
+    installed profile.  If 'record' is true, also start recording the
+    loops compiled by this process.
+    """
+    profile = space.fromcache(WarmProfile)
+    profile.clear_pending()
+    profile.recording = record
+    if space.is_none(w_entries):
+        return
+    for w_entry in space.listview(w_entries):
+        items_w = space.fixedview(w_entry)
+        if len(items_w) != 5:
+            raise oefmt(space.w_ValueError,
+                        "warm profile entries must be 5-tuples")
+        profile.add_pending(space.text_w(items_w[0]),
+                            space.text_w(items_w[1]),
+                            space.int_w(items_w[2]),
+                            space.int_w(items_w[3]),
+                            space.int_w(items_w[4]))
+
+def get_warm_profile_applied(space):
+    """Return how many loops were scheduled for early tracing because
+    they matched the installed warm profile."""
+    return space.newint(space.fromcache(WarmProfile).applied)
@@ -2,6 +2,9 @@ from pypy.interpreter.mixedmodule import MixedModule
 
 class Module(MixedModule):
     appleveldefs = {
+        'enable_warm_cache': 'app_warmprofile.enable_warm_cache',
+        'load_warm_cache': 'app_warmprofile.load_warm_cache',
+        'save_warm_cache': 'app_warmprofile.save_warm_cache',
     }
 
     interpleveldefs = {
@@ -10,6 +13,7 @@ class Module(MixedModule):
         'not_from_assembler': 'interp_jit.W_NotFromAssembler',
         'get_jitcell_at_key': 'interp_jit.get_jitcell_at_key',
         'dont_trace_here': 'interp_jit.dont_trace_here',
+        'get_trace_decisions': 'interp_jit.get_trace_decisions',
         'trace_next_iteration': 'interp_jit.trace_next_iteration',
         'trace_next_iteration_hash': 'interp_jit.trace_next_iteration_hash',
         'releaseall': 'interp_jit.releaseall',
@@ -18,6 +22,11 @@ class Module(MixedModule):
         'set_trace_too_long_hook': 'interp_resop.set_trace_too_long_hook',
         'get_stats_snapshot': 'interp_resop.get_stats_snapshot',
         'get_stats_asmmemmgr': 'interp_resop.get_stats_asmmemmgr',
+        'get_stats_asmmemmgr_free': 'interp_resop.get_stats_asmmemmgr_free',
+        'get_warm_profile': 'interp_warmprofile.get_warm_profile',
+        'set_warm_profile': 'interp_warmprofile.set_warm_profile',
+        'get_warm_profile_applied':
+            'interp_warmprofile.get_warm_profile_applied',
         # those things are disabled because they have bugs, but if
         # they're found to be useful, fix test_ztranslation_jit_stats
         # in the backend first. get_stats_snapshot still produces
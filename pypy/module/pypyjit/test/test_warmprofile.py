@@ -0,0 +1,152 @@
+import py
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.module.pypyjit import interp_warmprofile
+from pypy.module.pypyjit.hooks import pypy_hooks
+from pypy.module.pypyjit.test.test_jit_hook import MockJitDriverSD, MockSD
+from rpython.jit.metainterp.history import JitCellToken, ConstInt, ConstPtr
+from rpython.jit.metainterp.logger import Logger
+from rpython.rtyper.annlowlevel import cast_instance_to_base_ptr
+from rpython.rtyper.lltypesystem import lltype, llmemory
+from rpython.rlib.jit import JitDebugInfo
+
+
+class FakeJitHooks(object):
+    def __init__(self):
+        self.seen = []
+
+    def trace_next_iteration(self, name, next_instr, is_being_profiled,
+                             ll_pycode):
+        assert name == 'pypyjit'
+        self.seen.append(int(next_instr))
+
+
+class AppTestWarmProfile(object):
+    spaceconfig = dict(usemodules=('pypyjit',))
+
+    def setup_class(cls):
+        if cls.runappdirect:
+            py.test.skip("Can't run this test with -A")
+        space = cls.space
+        fake = FakeJitHooks()
+        cls._orig_jit_hooks = interp_warmprofile.jit_hooks
+        interp_warmprofile.jit_hooks = fake
+
+        @unwrap_spec(next_instr=int)
+        def interp_on_compile(space, w_code, next_instr):
+            pycode = space.interp_w(interp_warmprofile.PyCode, w_code)
+            ll_code = cast_instance_to_base_ptr(pycode)
+            code_gcref = lltype.cast_opaque_ptr(llmemory.GCREF, ll_code)
+            greenkey = [ConstInt(next_instr), ConstInt(0),
+                        ConstPtr(code_gcref)]
+            token = JitCellToken()
+            token.number = 0
+            di_loop = JitDebugInfo(MockJitDriverSD, Logger(MockSD()), token,
+                                   [], 'loop', greenkey)
+            if pypy_hooks.are_hooks_enabled():
+                pypy_hooks.after_compile(di_loop)
+
+        def interp_seen():
+            result = space.newlist([space.newint(i) for i in fake.seen])
+            del fake.seen[:]
+            return result
+
+        cls.w_on_compile = space.wrap(interp2app(interp_on_compile))
+        cls.w_seen = space.wrap(interp2app(interp_seen))
+        cls.w_tmpdir = space.wrap(str(py.test.ensuretemp('warmprofile')))
+
+    def teardown_class(cls):
+        interp_warmprofile.jit_hooks = cls._orig_jit_hooks
+
+    def teardown_method(self, meth):
+        self.space.appexec([], """():
+            import pypyjit
+            pypyjit.set_warm_profile(None, record=False)
+        """)
+
+    def test_record(self):
+        import pypyjit
+        def f():
+            pass
+        self.on_compile(f.func_code, 3)
+        assert pypyjit.get_warm_profile() == []
+        pypyjit.set_warm_profile([])
+        self.on_compile(f.func_code, 3)
+        self.on_compile(f.func_code, 3)
+        self.on_compile(f.func_code, 6)
+        profile = pypyjit.get_warm_profile()
+        assert len(profile) == 2
+        filename, name, firstlineno, hash, offset = profile[0]
+        assert filename == f.func_code.co_filename
+        assert name == 'f'
+        assert firstlineno == f.func_code.co_firstlineno
+        assert offset == 3
+        assert profile[1][4] == 6
+
+    def test_replay(self):
+        import pypyjit
+        src = "def g():\n    for i in range(10):\n        pass\n"
+        pypyjit.set_warm_profile([])
+        d = {}
+        exec compile(src, 'warmprofile.py', 'exec') in d
+        self.on_compile(d['g'].func_code, 13)
+        profile = pypyjit.get_warm_profile()
+        assert self.seen() == []
+        #
+        pypyjit.set_warm_profile(profile, record=False)
+        applied = pypyjit.get_warm_profile_applied()
+        d = {}
+        exec compile(src, 'warmprofile.py', 'exec') in d
+        assert self.seen() == [13]
+        assert pypyjit.get_warm_profile_applied() == applied + 1
+        # a different bytecode at the same place is ignored
+        src = src.replace('pass', 'i + 1')
+        exec compile(src, 'warmprofile.py', 'exec') in d
+        assert self.seen() == []
+
+    def test_bad_entries(self):
+        import pypyjit
+        raises(ValueError, pypyjit.set_warm_profile, [('a', 'b', 1)])
+        raises(TypeError, pypyjit.set_warm_profile, [('a', 'b', 'c', 1, 2)])
+
+    def test_save_load(self):
+        import pypyjit, os
+        fn = os.path.join(self.tmpdir, 'profile.marshal')
+        entries = [('x.py', 'f', 1, 42, 10)]
+        pypyjit.save_warm_cache(fn, entries, key='build1')
+        assert pypyjit.load_warm_cache(fn, key='build1') == entries
+        assert pypyjit.load_warm_cache(fn, key='build2') == []
+        assert pypyjit.load_warm_cache(fn + 'missing', key='build1') == []
+        with open(fn, 'wb') as f:
+            f.write('garbage')
+        assert pypyjit.load_warm_cache(fn, key='build1') == []
+
+    def test_enable_drops_stale_entries(self):
+        import pypyjit, os, atexit
+        directory = os.path.join(self.tmpdir, 'stale')
+        def enable():
+            registered = []
+            orig_register = atexit.register
+            atexit.register = lambda *args: registered.append(args)
+            try:
+                n = pypyjit.enable_warm_cache(directory)
+            finally:
+                atexit.register = orig_register
+            [args] = registered
+            return n, args[0]
+        n, save = enable()
+        save()
+        [fn] = os.listdir(directory)
+        fn = os.path.join(directory, fn)
+        stale = ('gone.py', 'h', 1, 42, 10)
+        pypyjit.save_warm_cache(fn, pypyjit.load_warm_cache(fn) + [stale])
+        #
+        src = "def g():\n    for i in range(10):\n        pass\n"
+        d = {}
+        exec compile(src, 'warmprofile_stale.py', 'exec') in d
+        n, save = enable()
+        assert stale in pypyjit.load_warm_cache(fn)
+        self.on_compile(d['g'].func_code, 13)
+        save()
+        entries = pypyjit.load_warm_cache(fn)
+        assert stale not in entries
+        assert ('warmprofile_stale.py', 'g') in [e[:2] for e in entries]
@@ -45,7 +45,41 @@ def bench_simple_dict(SIZE = 10000):
     count_operation("Existing key access", lambda : rand_keys(lookup_keys))
     return test_d
 
+def bench_churn(SIZE = 10000, ROUNDS = 100):
+    # an LRU-like cache: keep SIZE live keys, always deleting the oldest
+    keys = [get_random_string(20) + str(i) for i in xrange(SIZE * ROUNDS)]
+    test_d = {}
+
+    def churn():
+        for i in xrange(len(keys)):
+            test_d[keys[i]] = i
+            if i >= SIZE:
+                del test_d[keys[i - SIZE]]
+
+    count_operation("Churn", churn)
+    return test_d
+
+def bench_mass_deletion(SIZE = 1000000, KEEP = 1000):
+    # a big dict that is mostly emptied, then used again
+    test_d = count_operation("Creation of big dict",
+                             lambda : dict.fromkeys(xrange(SIZE)))
+
+    def delete():
+        for i in xrange(KEEP, SIZE):
+            del test_d[i]
+
+    def use():
+        for j in xrange(1000):
+            for i in xrange(KEEP):
+                test_d[i]
+
+    count_operation("Mass deletion", delete)
+    count_operation("Key access after mass deletion", use)
+    return test_d
+
 if __name__ == '__main__':
+    bench_churn()
+    bench_mass_deletion()
     test_d = bench_simple_dict()
     import __pypy__
     print __pypy__.internal_repr(test_d)
@@ -0,0 +1,69 @@
+
+""" benchmarks for the opcodes specialised by the objspace.std.quickening
+option.  Run them with 'pypy --jit off bench_interp.py', possibly comparing
+with a pypy translated without the option.
+"""
+
+import time
+
+N = 1000000
+LIMIT = 1000
+
+def count_operation(name, function):
+    t0 = time.time()
+    function()
+    tk = time.time()
+    print name, " takes: %f" % (tk - t0)
+
+def int_loop():
+    i = 0
+    total = 0
+    while i < N:
+        total += i - LIMIT
+        if total > LIMIT:
+            total -= LIMIT
+        i += 1
+    return total
+
+def float_loop():
+    x = 0.0
+    step = 0.5
+    i = 0
+    while i < N:
+        x = x + step
+        if x >= 100.0:
+            x -= 100.0
+        i += 1
+    return x
+
+def global_lookups():
+    result = 0
+    for i in xrange(N):
+        result = len(LIMIT_LIST) + LIMIT
+    return result
+
+LIMIT_LIST = [LIMIT]
+
+def local_pairs():
+    a = 1
+    b = 2
+    t = None
+    for i in xrange(N):
+        t = (a, b, i)
+    return t
+
+def mixed_types():
+    # the specialised opcodes fall back to the generic path
+    values = [1, 1.5, 'a', 2 ** 70, True]
+    result = None
+    for i in xrange(N // 10):
+        for x in values:
+            result = (x == x, x + x)
+    return result
+
+if __name__ == '__main__':
+    count_operation("Int arithmetic and comparisons", int_loop)
+    count_operation("Float arithmetic and comparisons", float_loop)
+    count_operation("Global and builtin lookups", global_lookups)
+    count_operation("Pairs of local loads", local_pairs)
+    count_operation("Mixed types", mixed_types)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+""" random indexing into big non-ascii unicode strings, like a tokenizer
+does
+"""
+
+import random, time
+
+def count_operation(name, function):
+    print name
+    t0 = time.time()
+    retval = function()
+    tk = time.time()
+    print name, " takes: %f" % (tk - t0)
+    return retval
+
+def get_random_text(SIZE):
+    # roughly SIZE bytes once encoded in utf-8
+    words = [u"hello", u"w\xf6rld", u"привет",
+             u"你好", u"caf\xe9", u"\U0001f600", u"text"]
+    result = []
+    length = 0
+    while length < SIZE:
+        word = random.choice(words)
+        result.append(word)
+        length += len(word.encode('utf-8')) + 1
+    return u" ".join(result)
+
+def bench_random_index(SIZE = 10 * 1024 * 1024, NUM = 1000000):
+    text = count_operation("Creation of text", lambda : get_random_text(SIZE))
+    indexes = [random.randrange(len(text)) for i in xrange(NUM)]
+
+    def first_index():
+        # the first indexing operation on a fresh string, near its start
+        fresh = text + u"!"
+        for i in xrange(100):
+            fresh[i]
+
+    def index():
+        for i in indexes:
+            text[i]
+
+    def index_slices():
+        # big slices of the text, found with find(), indexed randomly
+        for i in xrange(100):
+            start = text.find(u" ", random.randrange(len(text) // 2)) + 1
+            end = text.find(u" ", start + len(text) // 4)
+            if end < 0:
+                continue
+            part = text[start:end]
+            for j in xrange(NUM // 100):
+                part[random.randrange(len(part))]
+
+    count_operation("First index near the start", first_index)
+    count_operation("Random index", index)
+    count_operation("Index into big slices", index_slices)
+
+if __name__ == '__main__':
+    bench_random_index()
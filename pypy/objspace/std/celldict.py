@@ -7,8 +7,8 @@ from rpython.rlib import jit, rerased, objectmodel
 
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.objspace.std.dictmultiobject import (
-    DictStrategy, ObjectDictStrategy, _never_equal_to_string,
-    create_iterator_classes)
+    DictStrategy, ObjectDictStrategy, W_ModuleDictObject,
+    _never_equal_to_string, create_iterator_classes)
 from pypy.objspace.std.typeobject import (
     MutableCell, IntMutableCell, ObjectMutableCell, write_cell, unwrap_cell)
 
@@ -171,3 +171,82 @@ class ModuleDictStrategy(DictStrategy):
 
 
 create_iterator_classes(ModuleDictStrategy)
+
+
+# ____________________________________________________________
+# the LOAD_GLOBAL cache of the objspace.std.quickening option
+
+class GlobalCacheEntry(object):
+    """What LOAD_GLOBAL found for one name of a code object.  It can be
+    used as long as the version of the globals did not change, and, if the
+    name was found in the builtins, the version of the builtins too."""
+
+    def __init__(self, globals_version, builtins_version, cell):
+        self.globals_version = globals_version
+        self.builtins_version = builtins_version    # None: in the globals
+        self.cell = cell
+
+def init_globals_cache(pycode):
+    if pycode.space.config.objspace.std.quickening:
+        pycode._globals_caches = [None] * len(pycode.co_names_w)
+    else:
+        pycode._globals_caches = None
+
+def _get_module_dict_strategy(w_dict):
+    if type(w_dict) is not W_ModuleDictObject:
+        return None
+    strategy = w_dict.get_strategy()
+    if isinstance(strategy, ModuleDictStrategy):
+        return strategy
+    return None
+
+def _get_version(w_dict):
+    strategy = _get_module_dict_strategy(w_dict)
+    if strategy is None:
+        return None
+    return strategy.version
+
+def LOAD_GLOBAL_cached(frame, nameindex):
+    # not used if we_are_jitted(): the JIT already constant-folds the
+    # lookups in module dicts thanks to the quasi-immutable version
+    pycode = frame.getcode()
+    entry = pycode._globals_caches[nameindex]
+    if (entry is not None and
+            _get_version(frame.get_w_globals()) is entry.globals_version and
+            (entry.builtins_version is None or
+             _get_version(frame.get_builtin().w_dict) is
+                 entry.builtins_version)):
+        w_value = unwrap_cell(frame.space, entry.cell)
+        if w_value is not None:
+            return w_value
+    return LOAD_GLOBAL_slowpath(frame, pycode, nameindex)
+LOAD_GLOBAL_cached._always_inline_ = True
+
+@jit.dont_look_inside
+def LOAD_GLOBAL_slowpath(frame, pycode, nameindex):
+    varname = frame.getname_u(nameindex)
+    w_value = frame._load_global(varname)
+    if not frame.space._side_effects_ok():
+        return w_value
+    # now find where 'varname' is stored, to fill the cache.  This is
+    # done after the lookup, which may have added 'varname' to the
+    # builtins if it was not loaded yet.
+    w_globals = frame.get_w_globals()
+    strategy = _get_module_dict_strategy(w_globals)
+    if strategy is None:
+        return w_value
+    cell = strategy.getdictvalue_no_unwrapping(w_globals, varname)
+    builtins_version = None
+    if cell is None:
+        w_builtins = frame.get_builtin().w_dict
+        builtins_strategy = _get_module_dict_strategy(w_builtins)
+        if builtins_strategy is None:
+            return w_value
+        cell = builtins_strategy.getdictvalue_no_unwrapping(w_builtins,
+                                                            varname)
+        if cell is None:
+            return w_value
+        builtins_version = builtins_strategy.version
+    pycode._globals_caches[nameindex] = GlobalCacheEntry(
+        strategy.version, builtins_version, cell)
+    return w_value
@@ -2,11 +2,14 @@
 
 import operator
 
+from rpython.rlib import jit
+from rpython.rlib.objectmodel import specialize
 from rpython.rlib.rarithmetic import ovfcheck
 from rpython.tool.sourcetools import func_renamer
 
 from pypy.interpreter.pyframe import PyFrame
 from pypy.interpreter.error import oefmt
+from pypy.objspace.std.floatobject import W_FloatObject
 from pypy.objspace.std.intobject import W_IntObject
 from pypy.objspace.std.listobject import W_ListObject
 
@@ -23,13 +26,14 @@ class BaseFrame(PyFrame):
             raise AssertionError
 
 
-def _intshortcut(spaceopname):
+def _intshortcut(spaceopname, floats=False):
+    prefix = 'quick_' if floats else 'int_'
     if spaceopname.startswith('inplace_'):
         opname = spaceopname[len('inplace_'):]
-        funcprefix = 'int_'
+        funcprefix = prefix
     else:
         opname = spaceopname
-        funcprefix = 'int_BINARY_'
+        funcprefix = prefix + 'BINARY_'
     op = getattr(operator, opname)
     int_op = getattr(W_IntObject, 'descr_' + opname)
 
@@ -47,6 +51,9 @@ def _intshortcut(spaceopname):
                 w_result = int_op(w_1, space, w_2)
             else:
                 w_result = space.newint(z)
+        elif (floats and type(w_1) is W_FloatObject and
+                type(w_2) is W_FloatObject):
+            w_result = space.newfloat(op(w_1.floatval, w_2.floatval))
         else:
             w_result = space_op(w_1, w_2)
         self.pushvalue(w_result)
@@ -59,6 +66,53 @@ int_INPLACE_ADD = _intshortcut('inplace_add')
 int_BINARY_SUBTRACT = _intshortcut('sub')
 int_INPLACE_SUBTRACT = _intshortcut('inplace_sub')
 
+quick_BINARY_ADD = _intshortcut('add', floats=True)
+quick_INPLACE_ADD = _intshortcut('inplace_add', floats=True)
+quick_BINARY_SUBTRACT = _intshortcut('sub', floats=True)
+quick_INPLACE_SUBTRACT = _intshortcut('inplace_sub', floats=True)
+
+
+@specialize.argtype(1)
+def _compare(testnum, x, y):
+    if testnum == 0:
+        return x < y
+    elif testnum == 1:
+        return x <= y
+    elif testnum == 2:
+        return x == y
+    elif testnum == 3:
+        return x != y
+    elif testnum == 4:
+        return x > y
+    else:
+        return x >= y
+
+def quick_COMPARE_OP(self, testnum, next_instr):
+    # the first six comparisons, from '<' to '>=', between two ints or
+    # two floats; everything else goes through the generic version
+    if testnum <= 5:
+        w_2 = self.peekvalue(0)
+        w_1 = self.peekvalue(1)
+        if type(w_1) is W_IntObject and type(w_2) is W_IntObject:
+            result = _compare(testnum, w_1.intval, w_2.intval)
+        elif type(w_1) is W_FloatObject and type(w_2) is W_FloatObject:
+            result = _compare(testnum, w_1.floatval, w_2.floatval)
+        else:
+            PyFrame.COMPARE_OP(self, testnum, next_instr)
+            return
+        self.popvalue()
+        self.popvalue()
+        self.pushvalue(self.space.newbool(result))
+    else:
+        PyFrame.COMPARE_OP(self, testnum, next_instr)
+
+def quick_LOAD_GLOBAL(self, nameindex, next_instr):
+    if not jit.we_are_jitted():
+        from pypy.objspace.std.celldict import LOAD_GLOBAL_cached
+        self.pushvalue(LOAD_GLOBAL_cached(self, nameindex))
+    else:
+        PyFrame.LOAD_GLOBAL(self, nameindex, next_instr)
+
 
 def list_BINARY_SUBSCR(self, oparg, next_instr):
     space = self.space
@@ -83,6 +137,13 @@ def build_frame(space):
         StdObjSpaceFrame.INPLACE_ADD = int_INPLACE_ADD
         StdObjSpaceFrame.BINARY_SUBTRACT = int_BINARY_SUBTRACT
         StdObjSpaceFrame.INPLACE_SUBTRACT = int_INPLACE_SUBTRACT
+    if space.config.objspace.std.quickening:
+        StdObjSpaceFrame.BINARY_ADD = quick_BINARY_ADD
+        StdObjSpaceFrame.INPLACE_ADD = quick_INPLACE_ADD
+        StdObjSpaceFrame.BINARY_SUBTRACT = quick_BINARY_SUBTRACT
+        StdObjSpaceFrame.INPLACE_SUBTRACT = quick_INPLACE_SUBTRACT
+        StdObjSpaceFrame.COMPARE_OP = quick_COMPARE_OP
+        StdObjSpaceFrame.LOAD_GLOBAL = quick_LOAD_GLOBAL
     if space.config.objspace.std.optimized_list_getitem:
         StdObjSpaceFrame.BINARY_SUBSCR = list_BINARY_SUBSCR
     from pypy.objspace.std.callmethod import LOOKUP_METHOD, CALL_METHOD
@@ -0,0 +1,283 @@
+"""Sets of ints stored as bitmaps, used by IntegerBitmapSetStrategy.
+
+Like in roaring bitmaps, the ints are grouped in blocks of BLOCK_SIZE
+consecutive ints.  Only the blocks that contain at least one int are
+stored, as a list of BLOCK_WORDS machine words.  The operations between
+two bitmaps work on whole words.
+"""
+
+from rpython.rlib.objectmodel import specialize
+from rpython.rlib.rarithmetic import LONG_BIT, intmask, r_uint
+
+
+if LONG_BIT == 64:
+    WORD_SHIFT = 6
+else:
+    assert LONG_BIT == 32
+    WORD_SHIFT = 5
+WORD_MASK = LONG_BIT - 1
+
+BLOCK_SHIFT = 12
+BLOCK_SIZE = 1 << BLOCK_SHIFT
+BLOCK_MASK = BLOCK_SIZE - 1
+BLOCK_WORDS = BLOCK_SIZE // LONG_BIT
+
+# a bitmap is only used if there is on average at least one int every
+# MIN_DENSITY ints in its blocks, and if it has at least MIN_LENGTH ints;
+# a bitmap that gets twice less dense than that goes back to a dict.
+MIN_DENSITY = 64
+MIN_LENGTH = 1024
+
+_M1 = r_uint(-1) // 3
+_M2 = r_uint(-1) // 5
+_M4 = r_uint(-1) // 17
+_H01 = r_uint(-1) // 255
+
+def popcount(x):
+    x = x - ((x >> 1) & _M1)
+    x = (x & _M2) + ((x >> 2) & _M2)
+    x = (x + (x >> 4)) & _M4
+    return intmask((x * _H01) >> (LONG_BIT - 8))
+
+def trailing_zeros(x):
+    # x must not be zero
+    return popcount((x & (~x + 1)) - 1)
+
+def is_dense(length, numblocks):
+    return (length >= MIN_LENGTH and
+            length * MIN_DENSITY >= numblocks * BLOCK_SIZE)
+
+def is_too_sparse(length, numblocks):
+    return (length * 2 < MIN_LENGTH or
+            length * MIN_DENSITY * 2 < numblocks * BLOCK_SIZE)
+
+@specialize.argtype(0)
+def ints_are_dense(ints, length):
+    """Check if a bitmap of the 'length' ints in the list or dict 'ints'
+    is dense enough, without building it."""
+    if length < MIN_LENGTH:
+        return False
+    maxblocks = length * MIN_DENSITY // BLOCK_SIZE
+    keys = {}
+    for x in ints:
+        keys[x >> BLOCK_SHIFT] = None
+        if len(keys) > maxblocks:
+            return False
+    return True
+
+
+class IntBitmap(object):
+    def __init__(self, blocks, length):
+        self.blocks = blocks    # {block number: list of BLOCK_WORDS r_uints}
+        self.length = length
+
+    def is_too_sparse(self):
+        return is_too_sparse(self.length, len(self.blocks))
+
+    def contains(self, x):
+        block = self.blocks.get(x >> BLOCK_SHIFT, None)
+        if block is None:
+            return False
+        bit = r_uint(1) << (x & WORD_MASK)
+        return bool(block[(x & BLOCK_MASK) >> WORD_SHIFT] & bit)
+
+    def add(self, x):
+        key = x >> BLOCK_SHIFT
+        block = self.blocks.get(key, None)
+        if block is None:
+            block = [r_uint(0)] * BLOCK_WORDS
+            self.blocks[key] = block
+        i = (x & BLOCK_MASK) >> WORD_SHIFT
+        bit = r_uint(1) << (x & WORD_MASK)
+        if not block[i] & bit:
+            block[i] |= bit
+            self.length += 1
+
+    def remove(self, x):
+        """Remove 'x' and return True, or return False if it is absent."""
+        key = x >> BLOCK_SHIFT
+        block = self.blocks.get(key, None)
+        if block is None:
+            return False
+        i = (x & BLOCK_MASK) >> WORD_SHIFT
+        bit = r_uint(1) << (x & WORD_MASK)
+        if not block[i] & bit:
+            return False
+        block[i] &= ~bit
+        self.length -= 1
+        if not block[i] and _block_is_empty(block):
+            del self.blocks[key]
+        return True
+
+    def pop(self):
+        """Remove and return any int.  The bitmap must not be empty."""
+        for key, block in self.blocks.iteritems():
+            for i in range(BLOCK_WORDS):
+                if block[i]:
+                    x = ((key << BLOCK_SHIFT) + (i << WORD_SHIFT) +
+                         trailing_zeros(block[i]))
+                    self.remove(x)
+                    return x
+        raise KeyError
+
+    def copy(self):
+        blocks = {}
+        for key, block in self.blocks.iteritems():
+            blocks[key] = block[:]
+        return IntBitmap(blocks, self.length)
+
+    def sorted_keys(self):
+        keys = self.blocks.keys()
+        keys.sort()
+        return keys
+
+    def tolist(self):
+        result = []
+        for key in self.sorted_keys():
+            block = self.blocks[key]
+            base = key << BLOCK_SHIFT
+            for i in range(BLOCK_WORDS):
+                word = block[i]
+                while word:
+                    result.append(base + (i << WORD_SHIFT) +
+                                  trailing_zeros(word))
+                    word &= word - 1
+        return result
+
+    # ____________________________________________________________
+    # operations between two bitmaps, word by word
+
+    def and_(self, other):
+        small, big = self, other
+        if len(small.blocks) > len(big.blocks):
+            small, big = big, small
+        blocks = {}
+        length = 0
+        for key, block in small.blocks.iteritems():
+            otherblock = big.blocks.get(key, None)
+            if otherblock is None:
+                continue
+            newblock = [r_uint(0)] * BLOCK_WORDS
+            count = 0
+            for i in range(BLOCK_WORDS):
+                word = block[i] & otherblock[i]
+                newblock[i] = word
+                count += popcount(word)
+            if count:
+                blocks[key] = newblock
+                length += count
+        return IntBitmap(blocks, length)
+
+    def or_(self, other):
+        result = self.copy()
+        result.ior(other)
+        return result
+
+    def sub(self, other):
+        result = self.copy()
+        result.isub(other)
+        return result
+
+    def xor(self, other):
+        result = self.copy()
+        result.ixor(other)
+        return result
+
+    def ior(self, other):
+        for key, otherblock in other.blocks.iteritems():
+            block = self.blocks.get(key, None)
+            if block is None:
+                self.blocks[key] = otherblock[:]
+                self.length += _block_count(otherblock)
+                continue
+            count = 0
+            for i in range(BLOCK_WORDS):
+                word = block[i] | otherblock[i]
+                count += popcount(word & ~block[i])
+                block[i] = word
+            self.length += count
+
+    def isub(self, other):
+        if self is other:
+            self.blocks.clear()
+            self.length = 0
+            return
+        for key, otherblock in other.blocks.iteritems():
+            block = self.blocks.get(key, None)
+            if block is None:
+                continue
+            count = 0
+            left = r_uint(0)
+            for i in range(BLOCK_WORDS):
+                word = block[i] & ~otherblock[i]
+                count += popcount(block[i] & otherblock[i])
+                block[i] = word
+                left |= word
+            self.length -= count
+            if not left:
+                del self.blocks[key]
+
+    def ixor(self, other):
+        if self is other:
+            self.blocks.clear()
+            self.length = 0
+            return
+        for key, otherblock in other.blocks.iteritems():
+            block = self.blocks.get(key, None)
+            if block is None:
+                self.blocks[key] = otherblock[:]
+                self.length += _block_count(otherblock)
+                continue
+            count = 0
+            for i in range(BLOCK_WORDS):
+                count -= popcount(block[i])
+                block[i] ^= otherblock[i]
+                count += popcount(block[i])
+            self.length += count
+            if _block_is_empty(block):
+                del self.blocks[key]
+
+    def issubset(self, other):
+        if self.length > other.length:
+            return False
+        for key, block in self.blocks.iteritems():
+            otherblock = other.blocks.get(key, None)
+            if otherblock is None:
+                return False
+            for i in range(BLOCK_WORDS):
+                if block[i] & ~otherblock[i]:
+                    return False
+        return True
+
+    def isdisjoint(self, other):
+        small, big = self, other
+        if len(small.blocks) > len(big.blocks):
+            small, big = big, small
+        for key, block in small.blocks.iteritems():
+            otherblock = big.blocks.get(key, None)
+            if otherblock is None:
+                continue
+            for i in range(BLOCK_WORDS):
+                if block[i] & otherblock[i]:
+                    return False
+        return True
+
+
+@specialize.argtype(0)
+def bitmap_from_ints(ints):
+    bitmap = IntBitmap({}, 0)
+    for x in ints:
+        bitmap.add(x)
+    return bitmap
+
+def _block_is_empty(block):
+    for i in range(BLOCK_WORDS):
+        if block[i]:
+            return False
+    return True
+
+def _block_count(block):
+    count = 0
+    for i in range(BLOCK_WORDS):
+        count += popcount(block[i])
+    return count
@@ -33,6 +33,7 @@ from pypy.objspace.std.iterobject import (
     W_FastListIterObject, W_ReverseSeqIterObject)
 from pypy.objspace.std.sliceobject import (
     W_SliceObject, normalize_simple_slice, unwrap_start_stop)
+from pypy.objspace.std.specialisedtupleobject import Cls_ff, Cls_ii
 from pypy.objspace.std.tupleobject import W_AbstractTupleObject
 from pypy.objspace.std.unicodeobject import W_UnicodeObject
 from pypy.objspace.std.util import get_positive_index, negate
@@ -446,8 +447,9 @@ class W_ListObject(W_Root):
         if self.length() != w_other.length():
             return space.w_False
 
-        # XXX in theory, this can be implemented more efficiently as well.
-        # let's not care for now
+        i = self.strategy.find_mismatch(self, w_other)
+        if i >= 0:
+            return space.newbool(i == self.length())
         i = 0
         while i < self.length() and i < w_other.length():
             if not space.eq_w(self.getitem(i), w_other.getitem(i)):
@@ -470,9 +472,13 @@ class W_ListObject(W_Root):
             # needs to be safe against eq_w() mutating the w_lists behind our
             # back
             # Search for the first index where items are different
+            i = self.strategy.find_mismatch(self, w_list2)
+            if i >= 0:
+                if i < self.length() and i < w_list2.length():
+                    return getattr(space, name)(self.getitem(i),
+                                                w_list2.getitem(i))
+                return space.newbool(op(self.length(), w_list2.length()))
             i = 0
-            # XXX in theory, this can be implemented more efficiently as well.
-            # let's not care for now
             while i < self.length() and i < w_list2.length():
                 w_item1 = self.getitem(i)
                 w_item2 = w_list2.getitem(i)
@@ -642,14 +648,7 @@ class W_ListObject(W_Root):
     def descr_count(self, space, w_value):
         '''L.count(value) -> integer -- return number of
         occurrences of value'''
-        # needs to be safe against eq_w() mutating the w_list behind our back
-        count = 0
-        i = 0
-        while i < self.length():
-            if space.eq_w(self.getitem(i), w_value):
-                count += 1
-            i += 1
-        return space.newint(count)
+        return space.newint(self.strategy.count(self, w_value))
 
     @unwrap_spec(index=int)
     def descr_insert(self, space, index, w_value):
@@ -807,6 +806,23 @@ class ListStrategy(object):
             i += 1
         raise ValueError
 
+    def count(self, w_list, w_item):
+        space = self.space
+        count = 0
+        i = 0
+        # needs to be safe against eq_w mutating stuff
+        while i < w_list.length():
+            if space.eq_w(w_list.getitem(i), w_item):
+                count += 1
+            i += 1
+        return count
+
+    def find_mismatch(self, w_list, w_other):
+        """Return the first index where the items of the two lists are not
+        equal, or the length of the shortest list.  Return -1 if this
+        cannot be found without wrapping the items."""
+        return -1
+
     def length(self, w_list):
         raise NotImplementedError
 
@@ -1014,7 +1030,8 @@ class EmptyListStrategy(ListStrategy):
                             "attempt to assign sequence of size %d to extended "
                             "slice of size %d", len2, 0)
         storage = strategy.getstorage_copy(w_other)
-        w_list.strategy = strategy
+        # getstorage_copy() may have switched w_other to another strategy
+        w_list.strategy = w_other.strategy
         w_list.lstorage = storage
 
     def sort(self, w_list, reverse):
@@ -1411,6 +1428,33 @@ class AbstractUnwrappedStrategy(object):
                 return i
         raise ValueError
 
+    def _item_eq(self, a, b):
+        return a == b
+
+    def count(self, w_list, w_obj):
+        if self.is_correct_type(w_obj):
+            obj = self.unwrap(w_obj)
+            l = self.unerase(w_list.lstorage)
+            count = 0
+            for i in range(len(l)):
+                if self._item_eq(l[i], obj):
+                    count += 1
+            return count
+        return ListStrategy.count(self, w_list, w_obj)
+
+    def find_mismatch(self, w_list, w_other):
+        if w_other.strategy is not self:
+            return -1
+        l1 = self.unerase(w_list.lstorage)
+        l2 = self.unerase(w_other.lstorage)
+        length = min(len(l1), len(l2))
+        i = 0
+        while i < length:
+            if not self._item_eq(l1[i], l2[i]):
+                break
+            i += 1
+        return i
+
     def length(self, w_list):
         return len(self.unerase(w_list.lstorage))
 
@@ -1707,6 +1751,12 @@ class ObjectListStrategy(ListStrategy):
     def find(self, w_list, w_obj, start, stop):
         return ListStrategy.find(self, w_list, w_obj, start, stop)
 
+    def count(self, w_list, w_obj):
+        return ListStrategy.count(self, w_list, w_obj)
+
+    def find_mismatch(self, w_list, w_other):
+        return ListStrategy.find_mismatch(self, w_list, w_other)
+
     def getitems(self, w_list):
         return self.unerase(w_list.lstorage)
 
@@ -1889,6 +1939,9 @@ class FloatListStrategy(ListStrategy):
                     return i
         raise ValueError
 
+    def _item_eq(self, a, b):
+        return _float_item_eq(a, b)
+
     @staticmethod
     def float_2_float_or_int(w_list):
         l = FloatListStrategy.unerase(w_list.lstorage)
@@ -2035,6 +2088,11 @@ class IntOrFloatListStrategy(ListStrategy):
                 return i
         raise ValueError
 
+    def _item_eq(self, a, b):
+        return (a == b or
+                longlong2float.maybe_decode_longlong_as_float(a) ==
+                longlong2float.maybe_decode_longlong_as_float(b))
+
 
 class BytesListStrategy(ListStrategy):
     import_from_mixin(AbstractUnwrappedStrategy)
@@ -2106,6 +2164,380 @@ class AsciiListStrategy(ListStrategy):
     def getitems_ascii(self, w_list):
         return self.unerase(w_list.lstorage)
 
+# ____________________________________________________________
+# Lists of specialised 2-tuples
+#
+# The list of tuples built by zip() over two lists of ints or of floats
+# keeps the two items of every tuple in two parallel lists of unwrapped
+# values.  A tuple is only built when the program reads it, and is then
+# kept in 'cache_w' at the same index, so that reading the same item
+# again gives the same object.  Storing a tuple of the right type puts
+# it there too.  When all the tuples have been built, the list switches
+# to the ObjectListStrategy with 'cache_w' as its storage.  len(), 'in',
+# index(), count(), pop(), reverse() and sort() without key work on the
+# columns.  Slicing builds the tuples of the slice in the cache, and the
+# slice is a normal list of them.  Everything that would make two items
+# of the same list, or of two lists, share one tuple (like copying,
+# multiplying or extending the list) first switches to the
+# ObjectListStrategy.
+
+
+class IntPairColumns(object):
+    def __init__(self, col0, col1):
+        self.col0 = col0
+        self.col1 = col1
+        self.cache_w = None
+        self.ncached = 0
+
+
+class FloatPairColumns(object):
+    def __init__(self, col0, col1):
+        self.col0 = col0
+        self.col1 = col1
+        self.cache_w = None
+        self.ncached = 0
+
+
+class AbstractPairStrategy(object):
+
+    def make_columns(self, col0, col1):
+        raise NotImplementedError("abstract base class")
+
+    def wrap(self, item0, item1):
+        raise NotImplementedError("abstract base class")
+
+    def unwrap(self, w_item):
+        raise NotImplementedError("abstract base class")
+
+    def is_correct_type(self, w_obj):
+        raise NotImplementedError("abstract base class")
+
+    def _item_eq(self, a, b):
+        raise NotImplementedError("abstract base class")
+
+    def _sort_rows(self, rows):
+        raise NotImplementedError("abstract base class")
+
+    @staticmethod
+    def unerase(storage):
+        raise NotImplementedError("abstract base class")
+
+    @staticmethod
+    def erase(obj):
+        raise NotImplementedError("abstract base class")
+
+    def storage_from_columns(self, col0, col1):
+        assert len(col0) == len(col1)
+        return self.erase(self.make_columns(col0, col1))
+
+    @jit.look_inside_iff(lambda space, w_list, list_w:
+            jit.loop_unrolling_heuristic(list_w, len(list_w), UNROLL_CUTOFF))
+    def init_from_list_w(self, w_list, list_w):
+        col0 = [self._none_value] * len(list_w)
+        col1 = [self._none_value] * len(list_w)
+        for i in range(len(list_w)):
+            col0[i], col1[i] = self.unwrap(list_w[i])
+        w_list.lstorage = self.storage_from_columns(col0, col1)
+        c = self.unerase(w_list.lstorage)
+        c.cache_w = list_w[:]
+        c.ncached = len(list_w)
+
+    def get_empty_storage(self, sizehint):
+        if sizehint == -1:
+            return self.storage_from_columns([], [])
+        return self.storage_from_columns(newlist_hint(sizehint),
+                                         newlist_hint(sizehint))
+
+    def _get_cache(self, c):
+        if c.cache_w is None:
+            c.cache_w = [None] * len(c.col0)
+        return c.cache_w
+
+    def _get_tuple(self, c, index):
+        # 'index' must be non-negative and in range
+        cache_w = self._get_cache(c)
+        w_item = cache_w[index]
+        if w_item is None:
+            w_item = self.wrap(c.col0[index], c.col1[index])
+            cache_w[index] = w_item
+            c.ncached += 1
+        return w_item
+
+    def _switch_if_all_cached(self, w_list, c):
+        # all the tuples exist: the columns are not needed any more
+        if c.ncached == len(c.col0):
+            strategy = self.space.fromcache(ObjectListStrategy)
+            w_list.strategy = strategy
+            strategy.init_from_list_w(w_list, self._get_cache(c))
+
+    # a copy would build other tuples than the original list, so copying
+    # first switches to the ObjectListStrategy
+
+    def clone(self, w_list):
+        w_list.switch_to_object_strategy()
+        return w_list.clone()
+
+    def _resize_hint(self, w_list, hint):
+        c = self.unerase(w_list.lstorage)
+        resizelist_hint(c.col0, hint)
+        resizelist_hint(c.col1, hint)
+
+    def copy_into(self, w_list, w_other):
+        w_list.switch_to_object_strategy()
+        w_list.copy_into(w_other)
+
+    def find(self, w_list, w_obj, start, stop):
+        if self.is_correct_type(w_obj):
+            item0, item1 = self.unwrap(w_obj)
+            c = self.unerase(w_list.lstorage)
+            for i in range(start, min(stop, len(c.col0))):
+                if (self._item_eq(c.col0[i], item0) and
+                        self._item_eq(c.col1[i], item1)):
+                    return i
+            raise ValueError
+        return ListStrategy.find(self, w_list, w_obj, start, stop)
+
+    def count(self, w_list, w_obj):
+        if self.is_correct_type(w_obj):
+            item0, item1 = self.unwrap(w_obj)
+            c = self.unerase(w_list.lstorage)
+            count = 0
+            for i in range(len(c.col0)):
+                if (self._item_eq(c.col0[i], item0) and
+                        self._item_eq(c.col1[i], item1)):
+                    count += 1
+            return count
+        return ListStrategy.count(self, w_list, w_obj)
+
+    def length(self, w_list):
+        return len(self.unerase(w_list.lstorage).col0)
+
+    def getitem(self, w_list, index):
+        c = self.unerase(w_list.lstorage)
+        length = len(c.col0)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError
+        w_item = self._get_tuple(c, index)
+        self._switch_if_all_cached(w_list, c)
+        return w_item
+
+    def getitems(self, w_list):
+        # build the missing tuples, and keep them: the result is the
+        # storage of the list, which now uses the ObjectListStrategy
+        c = self.unerase(w_list.lstorage)
+        for i in range(len(c.col0)):
+            self._get_tuple(c, i)
+        list_w = self._get_cache(c)
+        self._switch_if_all_cached(w_list, c)
+        return list_w
+
+    def getitems_copy(self, w_list):
+        w_list.switch_to_object_strategy()
+        return w_list.getitems_copy()
+
+    def getitems_fixedsize(self, w_list):
+        w_list.switch_to_object_strategy()
+        return w_list.getitems_fixedsize()
+
+    def getitems_unroll(self, w_list):
+        w_list.switch_to_object_strategy()
+        return w_list.getitems_unroll()
+
+    def getstorage_copy(self, w_list):
+        w_list.switch_to_object_strategy()
+        return w_list.strategy.getstorage_copy(w_list)
+
+    def getslice(self, w_list, start, stop, step, length):
+        c = self.unerase(w_list.lstorage)
+        list_w = [None] * length
+        for i in range(length):
+            list_w[i] = self._get_tuple(c, start)
+            start += step
+        self._switch_if_all_cached(w_list, c)
+        return W_ListObject(self.space, list_w)
+
+    def append(self, w_list, w_item):
+        if self.is_correct_type(w_item):
+            item0, item1 = self.unwrap(w_item)
+            c = self.unerase(w_list.lstorage)
+            self._get_cache(c).append(w_item)
+            c.col0.append(item0)
+            c.col1.append(item1)
+            c.ncached += 1
+            self._switch_if_all_cached(w_list, c)
+            return
+        w_list.switch_to_object_strategy()
+        w_list.append(w_item)
+
+    def insert(self, w_list, index, w_item):
+        if self.is_correct_type(w_item):
+            item0, item1 = self.unwrap(w_item)
+            c = self.unerase(w_list.lstorage)
+            self._get_cache(c).insert(index, w_item)
+            c.col0.insert(index, item0)
+            c.col1.insert(index, item1)
+            c.ncached += 1
+            self._switch_if_all_cached(w_list, c)
+            return
+        w_list.switch_to_object_strategy()
+        w_list.insert(index, w_item)
+
+    def setitem(self, w_list, index, w_item):
+        if self.is_correct_type(w_item):
+            item0, item1 = self.unwrap(w_item)
+            c = self.unerase(w_list.lstorage)
+            length = len(c.col0)
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError
+            cache_w = self._get_cache(c)
+            if cache_w[index] is None:
+                c.ncached += 1
+            cache_w[index] = w_item
+            c.col0[index] = item0
+            c.col1[index] = item1
+            self._switch_if_all_cached(w_list, c)
+            return
+        w_list.switch_to_object_strategy()
+        w_list.setitem(index, w_item)
+
+    def _extend_from_list(self, w_list, w_other):
+        if w_other.strategy.is_empty_strategy():
+            return
+        w_other = w_other._temporarily_as_objects()
+        w_list.switch_to_object_strategy()
+        w_list.extend(w_other)
+
+    def setslice(self, w_list, start, step, slicelength, w_other):
+        w_list.switch_to_object_strategy()
+        w_list.setslice(start, step, slicelength, w_other)
+
+    def deleteslice(self, w_list, start, step, slicelength):
+        w_list.switch_to_object_strategy()
+        w_list.deleteslice(start, step, slicelength)
+
+    def pop_end(self, w_list):
+        c = self.unerase(w_list.lstorage)
+        return self.pop(w_list, len(c.col0) - 1)
+
+    def pop(self, w_list, index):
+        c = self.unerase(w_list.lstorage)
+        # will raise IndexError if out of bounds
+        try:
+            item0 = c.col0.pop(index)
+        except IndexError:
+            raise
+        item1 = c.col1.pop(index)
+        if c.cache_w is not None:
+            w_item = c.cache_w.pop(index)
+            if w_item is not None:
+                c.ncached -= 1
+                return w_item
+        return self.wrap(item0, item1)
+
+    def inplace_mul(self, w_list, times):
+        w_list.switch_to_object_strategy()
+        w_list.inplace_mul(times)
+
+    def reverse(self, w_list):
+        c = self.unerase(w_list.lstorage)
+        c.col0.reverse()
+        c.col1.reverse()
+        if c.cache_w is not None:
+            c.cache_w.reverse()
+
+    def sort(self, w_list, reverse):
+        # same order as comparing the tuples: by the first item, then by
+        # the second one, with NaNs only equal to themselves.  The sort is
+        # stable, like descr_sort(), and the tuples that already exist
+        # move with their values.
+        c = self.unerase(w_list.lstorage)
+        length = len(c.col0)
+        rows = [(c.col0[i], c.col1[i], i) for i in range(length)]
+        if reverse:
+            rows.reverse()
+        self._sort_rows(rows)
+        if reverse:
+            rows.reverse()
+        for i in range(length):
+            c.col0[i] = rows[i][0]
+            c.col1[i] = rows[i][1]
+        if c.cache_w is not None:
+            old_cache_w = c.cache_w
+            c.cache_w = [old_cache_w[rows[i][2]] for i in range(length)]
+
+    def physical_size(self, w_list):
+        from rpython.rlib.objectmodel import list_get_physical_size
+        c = self.unerase(w_list.lstorage)
+        return list_get_physical_size(c.col0)
+
+
+class IntIntTupleListStrategy(ListStrategy):
+    import_from_mixin(AbstractPairStrategy)
+
+    _none_value = 0
+
+    erase, unerase = rerased.new_erasing_pair("tuple_ii")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def make_columns(self, col0, col1):
+        return IntPairColumns(col0, col1)
+
+    def wrap(self, item0, item1):
+        return Cls_ii(self.space, item0, item1)
+
+    def unwrap(self, w_item):
+        assert isinstance(w_item, Cls_ii)
+        return (w_item.value0, w_item.value1)
+
+    def is_correct_type(self, w_obj):
+        return type(w_obj) is Cls_ii
+
+    def _item_eq(self, a, b):
+        return a == b
+
+    def _sort_rows(self, rows):
+        IntPairSort(rows, len(rows)).sort()
+
+
+class FloatFloatTupleListStrategy(ListStrategy):
+    import_from_mixin(AbstractPairStrategy)
+
+    _none_value = 0.0
+
+    erase, unerase = rerased.new_erasing_pair("tuple_ff")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def make_columns(self, col0, col1):
+        return FloatPairColumns(col0, col1)
+
+    def wrap(self, item0, item1):
+        return Cls_ff(self.space, item0, item1)
+
+    def unwrap(self, w_item):
+        assert isinstance(w_item, Cls_ff)
+        return (w_item.value0, w_item.value1)
+
+    def is_correct_type(self, w_obj):
+        return type(w_obj) is Cls_ff
+
+    def _item_eq(self, a, b):
+        return _float_item_eq(a, b)
+
+    def _sort_rows(self, rows):
+        FloatPairSort(rows, len(rows)).sort()
+
+
+def _float_item_eq(a, b):
+    # like the items of specialised tuples: NaNs are equal to themselves
+    return (a == b or
+            longlong2float.float2longlong(a) == longlong2float.float2longlong(b))
+
 # _______________________________________________________
 
 init_signature = Signature(['sequence'], None, None)
@@ -2138,6 +2570,8 @@ TimSort = make_timsort_class()
 IntBaseTimSort = make_timsort_class()
 FloatBaseTimSort = make_timsort_class()
 IntOrFloatBaseTimSort = make_timsort_class()
+IntPairBaseTimSort = make_timsort_class()
+FloatPairBaseTimSort = make_timsort_class()
 
 
 class KeyContainer(W_Root):
@@ -2173,6 +2607,20 @@ class IntOrFloatSort(IntOrFloatBaseTimSort):
         return fa < fb
 
 
+class IntPairSort(IntPairBaseTimSort):
+    def lt(self, a, b):
+        if a[0] != b[0]:
+            return a[0] < b[0]
+        return a[1] < b[1]
+
+
+class FloatPairSort(FloatPairBaseTimSort):
+    def lt(self, a, b):
+        if not _float_item_eq(a[0], b[0]):
+            return a[0] < b[0]
+        return a[1] < b[1]
+
+
 class CustomCompareSort(SimpleSort):
     def lt(self, a, b):
         space = self.space
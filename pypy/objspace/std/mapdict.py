@@ -10,6 +10,7 @@ from pypy.objspace.std.dictmultiobject import (
     BaseValueIterator, BaseItemIterator, _never_equal_to_string,
     W_DictObject, BytesDictStrategy, UnicodeDictStrategy
 )
+from pypy.objspace.std.slotsobject import W_ObjectObjectUserSlots
 from pypy.objspace.std.typeobject import MutableCell
 
 
@@ -33,6 +34,11 @@ NUM_DIGITS_POW2 = 1 << NUM_DIGITS
 # dict)
 LIMIT_MAP_ATTRIBUTES = 80
 
+# an unboxed attribute that gets a value of another type goes back to boxed
+# storage.  After that many such type changes, the class stops unboxing its
+# attributes altogether
+LIMIT_UNBOXING_TYPE_CHANGES = 8
+
 
 class AbstractAttribute(object):
     _immutable_fields_ = ['terminator']
@@ -208,6 +214,8 @@ class AbstractAttribute(object):
                     unbox_type = self.space.IntObjectCls
                 elif type(w_value) is self.space.FloatObjectCls:
                     unbox_type = self.space.FloatObjectCls
+                elif type(w_value) is self.space.BoolObjectCls:
+                    unbox_type = self.space.BoolObjectCls
             number_to_readd, holder = self._find_branch_to_move_into(name, attrkind, unbox_type)
             attr = holder.pick_attr(unbox_type)
             # we found the attributes further up, need to save the
@@ -259,6 +267,7 @@ class Terminator(AbstractAttribute):
         AbstractAttribute.__init__(self, space, self)
         self.w_cls = w_cls
         self.allow_unboxing = True
+        self.unboxing_type_changes = 0
 
     def _read_terminator(self, obj, name, attrkind):
         return None
@@ -463,7 +472,9 @@ class PlainAttribute(AbstractAttribute):
 
 
 class UnboxedPlainAttribute(PlainAttribute):
-    _immutable_fields_ = ["listindex", "firstunwrapped", "typ"]
+    """ An int, float or bool attribute.  All the unboxed attributes of an
+    object are stored together, as floats, in a single storage slot. """
+    _immutable_fields_ = ["listindex", "firstunwrapped", "typ", "boxed?"]
     def __init__(self, name, attrkind, back, order, typ):
         AbstractAttribute.__init__(self, back.space, back.terminator)
         # don't call PlainAttribute.__init__, that runs into weird problems
@@ -478,6 +489,10 @@ class UnboxedPlainAttribute(PlainAttribute):
         self._compute_storageindex_listindex()
         self._num_attributes = back.num_attributes() + 1
         self.typ = typ
+        # set to True when the attribute got a value of another type: the
+        # objects using this map switch to boxed storage for it when they
+        # read it next time
+        self.boxed = False
 
     def _compute_storageindex_listindex(self):
         attr = self.back
@@ -504,8 +519,10 @@ class UnboxedPlainAttribute(PlainAttribute):
     def _unbox(self, w_value):
         space = self.space
         assert type(w_value) is self.typ
-        if type(w_value) is space.IntObjectCls:
+        if self.typ is space.IntObjectCls:
             return longlong2float(space.int_w(w_value))
+        elif self.typ is space.BoolObjectCls:
+            return longlong2float(int(space.is_true(w_value)))
         else:
             return space.float_w(w_value)
 
@@ -513,9 +530,21 @@ class UnboxedPlainAttribute(PlainAttribute):
         space = self.space
         if self.typ is space.IntObjectCls:
             return space.newint(float2longlong(val))
+        elif self.typ is space.BoolObjectCls:
+            return space.newbool(float2longlong(val) != 0)
         else:
             return space.newfloat(val)
 
+    def _stop_unboxing(self):
+        if self.boxed:
+            return
+        self.boxed = True
+        terminator = self.terminator
+        terminator.unboxing_type_changes += 1
+        if terminator.unboxing_type_changes >= LIMIT_UNBOXING_TYPE_CHANGES:
+            # too many type changes, the class isn't type stable at all
+            terminator.allow_unboxing = False
+
     def _convert_to_boxed(self, obj):
         new_obj = obj._get_mapdict_map().copy(obj)
         map = new_obj.map
@@ -524,9 +553,10 @@ class UnboxedPlainAttribute(PlainAttribute):
 
     def _direct_read(self, obj):
         w_res = self._prim_direct_read(obj)
-        if self.terminator.allow_unboxing == False:
+        if self.boxed or self.terminator.allow_unboxing == False:
             # oops, some other object using the same class isn't type stable!
-            # stop using unboxing altogether to not get too many variants of maps
+            # stop unboxing this attribute, to not get too many variants of
+            # maps
             self._convert_to_boxed(obj)
         return w_res
 
@@ -551,12 +581,17 @@ class UnboxedPlainAttribute(PlainAttribute):
             unboxed[self.listindex] = val
             return
         # type change not supposed to happen. according to the principle
-        # of type freezing, we just give up, and will never unbox anything
-        # from that class again
-        self.terminator.allow_unboxing = False
+        # of type freezing, we just give up, and will never unbox this
+        # attribute again.  The other attributes stay unboxed
+        holder = None
+        if self.back.cache_attrs is not None:
+            holder = self.back.cache_attrs.get((self.name, self.attrkind), None)
+        if holder is not None and holder.attr is self:
+            holder.stop_unboxing()
+        else:
+            self._stop_unboxing()
         map = self._convert_to_boxed(obj)
-        # now obj won't have any UnboxedPlainAttribute in its chain any
-        # more, because allow_unboxing is False
+        # now the attribute is a PlainAttribute in the map of obj
         map.write(obj, self.name, self.attrkind, w_value)
 
     def _switch_map_and_write_storage(self, obj, w_value):
@@ -604,15 +639,19 @@ class CachedAttributeHolder(object):
     def pick_attr(self, unbox_type):
         if self.typ is None or self.typ is unbox_type:
             return self.attr
+        return self.stop_unboxing()
+
+    def stop_unboxing(self):
+        """ Replace our UnboxedPlainAttribute by a PlainAttribute. """
         self.typ = None
         # this will never be traced, because the previous assignment
         # invalidates a quasi-immutable field
-        self.attr.terminator.allow_unboxing = False
-        name = self.attr.name
-        attrkind = self.attr.attrkind
-        back = self.attr.back
-        attr = self.attr = PlainAttribute(name, attrkind, back, self.order)
-        return attr
+        attr = self.attr
+        assert isinstance(attr, UnboxedPlainAttribute)
+        attr._stop_unboxing()
+        self.attr = PlainAttribute(attr.name, attr.attrkind, attr.back,
+                                   self.order)
+        return self.attr
 
 
 class MapAttrCache(object):
@@ -1170,6 +1209,7 @@ class MapDictIteratorItems(BaseItemIterator):
 class CacheEntry(object):
     version_tag = None
     w_method = None # for callmethod
+    slotindex = -1  # for the instances that store their slots in fields
     success_counter = 0
     failure_counter = 0
 
@@ -1215,9 +1255,52 @@ def _fill_cache(pycode, nameindex, map, version_tag, attr, w_method=None):
         entry.attr_wref = None
     entry.version_tag = version_tag
     entry.w_method = w_method
+    entry.slotindex = -1
+    if pycode.space.config.objspace.std.withmethodcachecounter:
+        entry.failure_counter += 1
+
+@jit.dont_look_inside
+def _fill_slot_cache(pycode, nameindex, version_tag, slotindex):
+    if not pycode.space._side_effects_ok():
+        return
+    entry = pycode._mapdict_caches[nameindex]
+    if entry is INVALID_CACHE_ENTRY:
+        entry = CacheEntry()
+        pycode._mapdict_caches[nameindex] = entry
+    entry.map_wref = INVALID_CACHE_ENTRY.map_wref
+    entry.attr_wref = None
+    entry.version_tag = version_tag
+    entry.w_method = None
+    entry.slotindex = slotindex
     if pycode.space.config.objspace.std.withmethodcachecounter:
         entry.failure_counter += 1
 
+def _find_fixed_slot(space, w_obj, name):
+    # returns the index of the slot of w_obj that is read and written by
+    # 'w_obj.name', or -1.  The result only depends on the version_tag of
+    # the class of w_obj.
+    from pypy.interpreter.typedef import Member
+    from pypy.objspace.descroperation import object_setattr
+    w_type = w_obj.getclass(space)
+    if w_type.getattribute_if_not_from_object() is not None:
+        return -1
+    if space.lookup_in_type(w_type, '__setattr__') is not object_setattr(space):
+        return -1
+    version_tag = w_type.version_tag()
+    if version_tag is None:
+        return -1
+    _, w_descr = w_type._pure_lookup_where_with_method_cache(
+        name, version_tag)
+    if (isinstance(w_descr, Member) and
+            space.issubtype_w(w_type, w_descr.w_cls)):
+        return w_descr.index
+    return -1
+
+def _fixed_slot_entry_valid(entry, w_obj):
+    return (entry.slotindex >= 0 and
+            isinstance(w_obj, W_ObjectObjectUserSlots) and
+            w_obj.w__class__.version_tag() is entry.version_tag)
+
 def LOAD_ATTR_caching(pycode, w_obj, nameindex):
     # this whole mess is to make the interpreter quite a bit faster; it's not
     # used if we_are_jitted().
@@ -1228,13 +1311,25 @@ def LOAD_ATTR_caching(pycode, w_obj, nameindex):
         attr = entry.attr_wref()
         if attr is not None:
             return attr._direct_read(w_obj)
+    elif _fixed_slot_entry_valid(entry, w_obj):
+        w_value = w_obj.getslotvalue(entry.slotindex)
+        if w_value is not None:
+            return w_value
     return LOAD_ATTR_slowpath(pycode, w_obj, nameindex, map)
 LOAD_ATTR_caching._always_inline_ = True
 
 def LOAD_ATTR_slowpath(pycode, w_obj, nameindex, map):
     space = pycode.space
     w_name = pycode.co_names_w[nameindex]
-    if map is not None:
+    if isinstance(w_obj, W_ObjectObjectUserSlots):
+        slotindex = _find_fixed_slot(space, w_obj, space.text_w(w_name))
+        if slotindex >= 0:
+            _fill_slot_cache(pycode, nameindex,
+                             w_obj.w__class__.version_tag(), slotindex)
+            w_value = w_obj.getslotvalue(slotindex)
+            if w_value is not None:
+                return w_value
+    elif map is not None:
         w_type = map.terminator.w_cls
         w_descr = w_type.getattribute_if_not_from_object()
         if w_descr is not None:
@@ -1280,6 +1375,30 @@ def LOAD_ATTR_slowpath(pycode, w_obj, nameindex, map):
     return space.getattr(w_obj, w_name)
 LOAD_ATTR_slowpath._dont_inline_ = True
 
+def STORE_ATTR_caching(pycode, w_obj, nameindex, w_value):
+    # only for the instances that store their slots in fields, the
+    # instances using mapdict don't benefit from a cache here; it's not
+    # used if we_are_jitted().
+    entry = pycode._mapdict_caches[nameindex]
+    if _fixed_slot_entry_valid(entry, w_obj):
+        w_obj.setslotvalue(entry.slotindex, w_value)
+        return
+    STORE_ATTR_slowpath(pycode, w_obj, nameindex, w_value)
+STORE_ATTR_caching._always_inline_ = True
+
+def STORE_ATTR_slowpath(pycode, w_obj, nameindex, w_value):
+    space = pycode.space
+    w_name = pycode.co_names_w[nameindex]
+    if isinstance(w_obj, W_ObjectObjectUserSlots):
+        slotindex = _find_fixed_slot(space, w_obj, space.text_w(w_name))
+        if slotindex >= 0:
+            _fill_slot_cache(pycode, nameindex,
+                             w_obj.w__class__.version_tag(), slotindex)
+            w_obj.setslotvalue(slotindex, w_value)
+            return
+    space.setattr(w_obj, w_name, w_value)
+STORE_ATTR_slowpath._dont_inline_ = True
+
 def LOOKUP_METHOD_mapdict(f, nameindex, w_obj):
     pycode = f.getcode()
     entry = pycode._mapdict_caches[nameindex]
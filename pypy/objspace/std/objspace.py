@@ -29,6 +29,7 @@ from pypy.objspace.std.memoryobject import W_MemoryView
 from pypy.objspace.std.noneobject import W_NoneObject
 from pypy.objspace.std.objectobject import W_ObjectObject
 from pypy.objspace.std.setobject import W_SetObject, W_FrozensetObject
+from pypy.objspace.std.slotsobject import allocate_fixed_slots_instance
 from pypy.objspace.std.sliceobject import W_SliceObject
 from pypy.objspace.std.tupleobject import W_AbstractTupleObject, W_TupleObject
 from pypy.objspace.std.typeobject import W_TypeObject, TypeCache
@@ -53,6 +54,7 @@ class StdObjSpace(ObjSpace):
         self.UnicodeObjectCls = W_UnicodeObject
         self.IntObjectCls = W_IntObject
         self.FloatObjectCls = W_FloatObject
+        self.BoolObjectCls = W_BoolObject
 
         # singletons
         self.w_None = W_NoneObject.w_None
@@ -414,10 +416,13 @@ class StdObjSpace(ObjSpace):
             if cls.typedef.applevel_subclasses_base is not None:
                 cls = cls.typedef.applevel_subclasses_base
             #
-            subcls = get_unique_interplevel_subclass(self, cls)
-            instance = instantiate(subcls)
-            assert isinstance(instance, cls)
-            instance.user_setup(self, w_subtype)
+            if cls is W_ObjectObject and w_subtype.nfixedslots >= 0:
+                instance = allocate_fixed_slots_instance(self, w_subtype)
+            else:
+                subcls = get_unique_interplevel_subclass(self, cls)
+                instance = instantiate(subcls)
+                assert isinstance(instance, cls)
+                instance.user_setup(self, w_subtype)
             if w_subtype.hasuserdel:
                 self.finalizer_queue.register_finalizer(instance)
         else:
@@ -534,8 +539,10 @@ class StdObjSpace(ObjSpace):
     def listview_float(self, w_obj):
         if type(w_obj) is W_ListObject:
             return w_obj.getitems_float()
-        # dict and set don't have FloatStrategy, so we can just ignore them
-        # for now
+        if type(w_obj) is W_DictObject:
+            return w_obj.listview_float()
+        if type(w_obj) is W_SetObject or type(w_obj) is W_FrozensetObject:
+            return w_obj.listview_float()
         if isinstance(w_obj, W_ListObject) and self._uses_list_iter(w_obj):
             return w_obj.getitems_float()
         return None
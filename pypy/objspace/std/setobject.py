@@ -1,9 +1,15 @@
+import math
+
 from pypy.interpreter import gateway
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.signature import Signature
 from pypy.interpreter.typedef import TypeDef
 from pypy.objspace.std.bytesobject import W_BytesObject
+from pypy.objspace.std.floatobject import W_FloatObject
+from pypy.objspace.std.intbitmap import (
+    IntBitmap, bitmap_from_ints, ints_are_dense, trailing_zeros, MIN_LENGTH,
+    BLOCK_SHIFT, BLOCK_WORDS, WORD_SHIFT)
 from pypy.objspace.std.intobject import W_IntObject
 from pypy.objspace.std.unicodeobject import W_UnicodeObject
 from pypy.objspace.std.util import IDTAG_SPECIAL, IDTAG_SHIFT
@@ -95,6 +101,10 @@ class W_BaseSetObject(W_Root):
         """ If this is an int set return its contents as a list of uwnrapped ints. Otherwise return None. """
         return self.strategy.listview_int(self)
 
+    def listview_float(self):
+        """ If this is a float set return its contents as a list of uwnrapped floats. Otherwise return None. """
+        return self.strategy.listview_float(self)
+
     def get_storage_copy(self):
         """ Returns a copy of the storage. Needed when we want to clone all elements from one set and
         put them into another. """
@@ -729,6 +739,9 @@ class SetStrategy(object):
     def listview_int(self, w_set):
         return None
 
+    def listview_float(self, w_set):
+        return None
+
     #def erase(self, storage):
     #    raise NotImplementedError
 
@@ -826,6 +839,8 @@ class EmptySetStrategy(SetStrategy):
     def add(self, w_set, w_key):
         if type(w_key) is W_IntObject:
             strategy = self.space.fromcache(IntegerSetStrategy)
+        elif type(w_key) is W_FloatObject and not math.isnan(w_key.floatval):
+            strategy = self.space.fromcache(FloatSetStrategy)
         elif type(w_key) is W_BytesObject:
             strategy = self.space.fromcache(BytesSetStrategy)
         elif type(w_key) is W_UnicodeObject and w_key.is_ascii():
@@ -1101,9 +1116,15 @@ class AbstractUnwrappedSetStrategy(object):
         return strategy.erase(newsetdata)
 
     def _symmetric_difference_base(self, w_set, w_other):
+        space = self.space
+        bitmapstrategy = space.fromcache(IntegerBitmapSetStrategy)
         if self is w_other.strategy:
             strategy = w_set.strategy
             storage = self._symmetric_difference_unwrapped(w_set, w_other)
+        elif (w_other.strategy is bitmapstrategy and
+                self is space.fromcache(IntegerSetStrategy)):
+            storage, strategy = bitmapstrategy._symmetric_difference_int_dict(
+                w_other, w_set)
         else:
             strategy = self.space.fromcache(ObjectSetStrategy)
             storage = self._symmetric_difference_wrapped(w_set, w_other)
@@ -1123,6 +1144,8 @@ class AbstractUnwrappedSetStrategy(object):
         w_set.sstorage = storage
 
     def _intersect_base(self, w_set, w_other):
+        space = self.space
+        bitmapstrategy = space.fromcache(IntegerBitmapSetStrategy)
         if self is w_other.strategy:
             strategy = self
             if w_set.length() > w_other.length():
@@ -1130,6 +1153,10 @@ class AbstractUnwrappedSetStrategy(object):
                 storage = self._intersect_unwrapped(w_other, w_set)
             else:
                 storage = self._intersect_unwrapped(w_set, w_other)
+        elif (w_other.strategy is bitmapstrategy and
+                self is space.fromcache(IntegerSetStrategy)):
+            strategy = self
+            storage = bitmapstrategy._intersect_int_dict(w_other, w_set)
         elif not w_set.strategy.may_contain_equal_elements(w_other.strategy):
             strategy = self.space.fromcache(EmptySetStrategy)
             storage = strategy.get_empty_storage()
@@ -1238,6 +1265,11 @@ class AbstractUnwrappedSetStrategy(object):
             return
         if w_other.length() == 0:
             return
+        bitmapstrategy = self.space.fromcache(IntegerBitmapSetStrategy)
+        if (w_other.strategy is bitmapstrategy and
+                self is self.space.fromcache(IntegerSetStrategy)):
+            bitmapstrategy._update_int_dict(w_set, w_other)
+            return
         w_set.switch_to_object_strategy(self.space)
         w_set.update(w_other)
 
@@ -1275,6 +1307,10 @@ class BytesSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def may_contain_equal_elements(self, strategy):
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        elif strategy is self.space.fromcache(IntegerBitmapSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(FloatSetStrategy):
+            return False
         elif strategy is self.space.fromcache(EmptySetStrategy):
             return False
         elif strategy is self.space.fromcache(IdentitySetStrategy):
@@ -1314,6 +1350,10 @@ class AsciiSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def may_contain_equal_elements(self, strategy):
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        elif strategy is self.space.fromcache(IntegerBitmapSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(FloatSetStrategy):
+            return False
         elif strategy is self.space.fromcache(EmptySetStrategy):
             return False
         elif strategy is self.space.fromcache(IdentitySetStrategy):
@@ -1344,9 +1384,34 @@ class IntegerSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     def get_empty_dict(self):
         return {}
 
+    def get_storage_and_strategy_from_list(self, intlist):
+        if ints_are_dense(intlist, len(intlist)):
+            strategy = self.space.fromcache(IntegerBitmapSetStrategy)
+            return strategy.erase(bitmap_from_ints(intlist)), strategy
+        return self.get_storage_from_unwrapped_list(intlist), self
+
     def listview_int(self, w_set):
         return self.unerase(w_set.sstorage).keys()
 
+    def add(self, w_set, w_key):
+        if self.is_correct_type(w_key):
+            d = self.unerase(w_set.sstorage)
+            d[self.unwrap(w_key)] = None
+            # check the density again every time the length doubles
+            length = len(d)
+            if length >= MIN_LENGTH and length & (length - 1) == 0:
+                self.switch_to_bitmap_if_dense(w_set)
+        else:
+            w_set.switch_to_object_strategy(self.space)
+            w_set.add(w_key)
+
+    def switch_to_bitmap_if_dense(self, w_set):
+        d = self.unerase(w_set.sstorage)
+        if ints_are_dense(d, len(d)):
+            strategy = self.space.fromcache(IntegerBitmapSetStrategy)
+            w_set.strategy = strategy
+            w_set.sstorage = strategy.erase(bitmap_from_ints(d))
+
     def is_correct_type(self, w_key):
         return type(w_key) is W_IntObject
 
@@ -1371,6 +1436,330 @@ class IntegerSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
         return IntegerIteratorImplementation(self.space, self, w_set)
 
 
+class IntegerBitmapSetStrategy(SetStrategy):
+    """Items are ints, stored as an IntBitmap.  Only used for big sets of
+    ints that are dense enough, see intbitmap.py.  The operations with
+    other sets of ints that are not bitmaps work on the ints of the other
+    set; the operations with any other set go through a copy of the set
+    with IntegerSetStrategy."""
+    erase, unerase = rerased.new_erasing_pair("integerbitmap")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def get_empty_storage(self):
+        return self.erase(IntBitmap({}, 0))
+
+    def is_correct_type(self, w_key):
+        return type(w_key) is W_IntObject
+
+    def may_contain_equal_elements(self, strategy):
+        intstrategy = self.space.fromcache(IntegerSetStrategy)
+        return intstrategy.may_contain_equal_elements(strategy)
+
+    def listview_int(self, w_set):
+        return self.unerase(w_set.sstorage).tolist()
+
+    def _storage_and_strategy(self, bitmap):
+        # go back to a dict if the bitmap is not worth it
+        if bitmap.is_too_sparse():
+            strategy = self.space.fromcache(IntegerSetStrategy)
+            return strategy.get_storage_from_unwrapped_list(
+                bitmap.tolist()), strategy
+        return self.erase(bitmap), self
+
+    def _set_bitmap(self, w_set, bitmap):
+        w_set.sstorage, w_set.strategy = self._storage_and_strategy(bitmap)
+
+    def _new_set(self, w_set, bitmap):
+        storage, strategy = self._storage_and_strategy(bitmap)
+        return w_set.from_storage_and_strategy(storage, strategy)
+
+    def _as_int_dict_set(self, w_set):
+        # a copy of w_set with the IntegerSetStrategy
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        storage = strategy.get_storage_from_unwrapped_list(
+            self.listview_int(w_set))
+        return w_set.from_storage_and_strategy(storage, strategy)
+
+    def _switch_to_int_dict(self, w_set):
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        storage = strategy.get_storage_from_unwrapped_list(
+            self.listview_int(w_set))
+        w_set.strategy = strategy
+        w_set.sstorage = storage
+
+    def _int_dict_of(self, w_other):
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        assert w_other.strategy is strategy
+        return strategy.unerase(w_other.sstorage)
+
+    def length(self, w_set):
+        return self.unerase(w_set.sstorage).length
+
+    def clear(self, w_set):
+        w_set.switch_to_empty_strategy()
+
+    def copy_real(self, w_set):
+        bitmap = self.unerase(w_set.sstorage).copy()
+        return w_set.from_storage_and_strategy(self.erase(bitmap), self)
+
+    def add(self, w_set, w_key):
+        if self.is_correct_type(w_key):
+            bitmap = self.unerase(w_set.sstorage)
+            bitmap.add(self.space.int_w(w_key))
+            if bitmap.is_too_sparse():
+                self._set_bitmap(w_set, bitmap)
+        else:
+            w_set.switch_to_object_strategy(self.space)
+            w_set.add(w_key)
+
+    def remove(self, w_set, w_item):
+        if not self.is_correct_type(w_item):
+            w_set.switch_to_object_strategy(self.space)
+            return w_set.remove(w_item)
+        bitmap = self.unerase(w_set.sstorage)
+        if not bitmap.remove(self.space.int_w(w_item)):
+            return False
+        if bitmap.is_too_sparse():
+            self._set_bitmap(w_set, bitmap)
+        return True
+
+    def getdict_w(self, w_set):
+        result = newset(self.space)
+        for key in self.listview_int(w_set):
+            result[self.space.newint(key)] = None
+        return result
+
+    def get_storage_copy(self, w_set):
+        return self.erase(self.unerase(w_set.sstorage).copy())
+
+    def getkeys(self, w_set):
+        return [self.space.newint(key) for key in self.listview_int(w_set)]
+
+    def has_key(self, w_set, w_key):
+        if not self.is_correct_type(w_key):
+            w_set.switch_to_object_strategy(self.space)
+            return w_set.has_key(w_key)
+        return self.unerase(w_set.sstorage).contains(self.space.int_w(w_key))
+
+    def equals(self, w_set, w_other):
+        if w_set.length() != w_other.length():
+            return False
+        bitmap = self.unerase(w_set.sstorage)
+        if w_other.strategy is self:
+            return bitmap.issubset(self.unerase(w_other.sstorage))
+        if w_other.strategy is self.space.fromcache(IntegerSetStrategy):
+            for key in self._int_dict_of(w_other):
+                if not bitmap.contains(key):
+                    return False
+            return True
+        if not self.may_contain_equal_elements(w_other.strategy):
+            return False
+        return self._as_int_dict_set(w_set).equals(w_other)
+
+    def _difference_base(self, w_set, w_other):
+        bitmap = self.unerase(w_set.sstorage)
+        if w_other.strategy is self:
+            return bitmap.sub(self.unerase(w_other.sstorage))
+        bitmap = bitmap.copy()
+        for key in self._int_dict_of(w_other):
+            bitmap.remove(key)
+        return bitmap
+
+    def difference(self, w_set, w_other):
+        if (w_other.strategy is self or w_other.strategy is
+                self.space.fromcache(IntegerSetStrategy)):
+            return self._new_set(w_set, self._difference_base(w_set, w_other))
+        if not self.may_contain_equal_elements(w_other.strategy):
+            return w_set.copy_real()
+        return self._as_int_dict_set(w_set).difference(w_other)
+
+    def difference_update(self, w_set, w_other):
+        bitmap = self.unerase(w_set.sstorage)
+        if w_other.strategy is self:
+            bitmap.isub(self.unerase(w_other.sstorage))
+        elif w_other.strategy is self.space.fromcache(IntegerSetStrategy):
+            for key in self._int_dict_of(w_other):
+                bitmap.remove(key)
+        elif not self.may_contain_equal_elements(w_other.strategy):
+            return
+        else:
+            self._switch_to_int_dict(w_set)
+            w_set.difference_update(w_other)
+            return
+        self._set_bitmap(w_set, bitmap)
+
+    def _symmetric_difference_int_dict(self, w_set, w_other):
+        # w_other uses the IntegerSetStrategy
+        bitmap = self.unerase(w_set.sstorage).copy()
+        for key in self._int_dict_of(w_other):
+            if not bitmap.remove(key):
+                bitmap.add(key)
+        return self._storage_and_strategy(bitmap)
+
+    def symmetric_difference(self, w_set, w_other):
+        if w_other.strategy is self:
+            bitmap = self.unerase(w_set.sstorage)
+            return self._new_set(w_set,
+                                 bitmap.xor(self.unerase(w_other.sstorage)))
+        if w_other.strategy is self.space.fromcache(IntegerSetStrategy):
+            storage, strategy = self._symmetric_difference_int_dict(
+                w_set, w_other)
+            return w_set.from_storage_and_strategy(storage, strategy)
+        if w_other.length() == 0:
+            return w_set.copy_real()
+        return self._as_int_dict_set(w_set).symmetric_difference(w_other)
+
+    def symmetric_difference_update(self, w_set, w_other):
+        if w_other.strategy is self:
+            bitmap = self.unerase(w_set.sstorage)
+            bitmap.ixor(self.unerase(w_other.sstorage))
+            self._set_bitmap(w_set, bitmap)
+        elif w_other.strategy is self.space.fromcache(IntegerSetStrategy):
+            w_set.sstorage, w_set.strategy = (
+                self._symmetric_difference_int_dict(w_set, w_other))
+        elif w_other.length() != 0:
+            self._switch_to_int_dict(w_set)
+            w_set.symmetric_difference_update(w_other)
+
+    def _intersect_int_dict(self, w_set, w_other):
+        # w_other uses the IntegerSetStrategy, and so does the result
+        bitmap = self.unerase(w_set.sstorage)
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        result = strategy.get_empty_dict()
+        for key in self._int_dict_of(w_other):
+            if bitmap.contains(key):
+                result[key] = None
+        return strategy.erase(result)
+
+    def intersect(self, w_set, w_other):
+        if w_other.strategy is self:
+            bitmap = self.unerase(w_set.sstorage)
+            return self._new_set(w_set,
+                                 bitmap.and_(self.unerase(w_other.sstorage)))
+        strategy = self.space.fromcache(IntegerSetStrategy)
+        if w_other.strategy is strategy:
+            storage = self._intersect_int_dict(w_set, w_other)
+            return w_set.from_storage_and_strategy(storage, strategy)
+        if not self.may_contain_equal_elements(w_other.strategy):
+            strategy = self.space.fromcache(EmptySetStrategy)
+            return w_set.from_storage_and_strategy(
+                strategy.get_empty_storage(), strategy)
+        return self._as_int_dict_set(w_set).intersect(w_other)
+
+    def intersect_update(self, w_set, w_other):
+        w_intersection = self.intersect(w_set, w_other)
+        w_set.strategy = w_intersection.strategy
+        w_set.sstorage = w_intersection.sstorage
+
+    def issubset(self, w_set, w_other):
+        bitmap = self.unerase(w_set.sstorage)
+        if w_other.strategy is self:
+            return bitmap.issubset(self.unerase(w_other.sstorage))
+        if w_set.length() > w_other.length():
+            return False
+        if w_other.strategy is self.space.fromcache(IntegerSetStrategy):
+            d_other = self._int_dict_of(w_other)
+            for key in bitmap.tolist():
+                if key not in d_other:
+                    return False
+            return True
+        if not self.may_contain_equal_elements(w_other.strategy):
+            return w_set.length() == 0
+        return self._as_int_dict_set(w_set).issubset(w_other)
+
+    def isdisjoint(self, w_set, w_other):
+        bitmap = self.unerase(w_set.sstorage)
+        if w_other.strategy is self:
+            return bitmap.isdisjoint(self.unerase(w_other.sstorage))
+        if w_other.strategy is self.space.fromcache(IntegerSetStrategy):
+            for key in self._int_dict_of(w_other):
+                if bitmap.contains(key):
+                    return False
+            return True
+        if not self.may_contain_equal_elements(w_other.strategy):
+            return True
+        return self._as_int_dict_set(w_set).isdisjoint(w_other)
+
+    def update(self, w_set, w_other):
+        bitmap = self.unerase(w_set.sstorage)
+        if w_other.strategy is self:
+            bitmap.ior(self.unerase(w_other.sstorage))
+        elif w_other.strategy is self.space.fromcache(IntegerSetStrategy):
+            for key in self._int_dict_of(w_other):
+                bitmap.add(key)
+        else:
+            if w_other.length() != 0:
+                w_set.switch_to_object_strategy(self.space)
+                w_set.update(w_other)
+            return
+        self._set_bitmap(w_set, bitmap)
+
+    def _update_int_dict(self, w_set, w_other):
+        # w_set uses the IntegerSetStrategy, and gets the bitmap of w_other
+        bitmap = self.unerase(w_other.sstorage).copy()
+        for key in self._int_dict_of(w_set):
+            bitmap.add(key)
+        self._set_bitmap(w_set, bitmap)
+
+    def iter(self, w_set):
+        return IntegerBitmapIteratorImplementation(self.space, self, w_set)
+
+    def popitem(self, w_set):
+        bitmap = self.unerase(w_set.sstorage)
+        try:
+            result = bitmap.pop()
+        except KeyError:
+            raise oefmt(self.space.w_KeyError, "pop from an empty set")
+        if bitmap.is_too_sparse():
+            self._set_bitmap(w_set, bitmap)
+        return self.space.newint(result)
+
+
+class FloatSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
+    """Items are unboxed floats.  NaN is never stored, because two NaNs
+    are only the same item if they are the same object.  Floats can be
+    equal to ints, so there is no shortcut against IntegerSetStrategy."""
+    erase, unerase = rerased.new_erasing_pair("float")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    intersect_jmp = jit.JitDriver(greens = [], reds = 'auto',
+                                  name='set(float).intersect')
+
+    def get_empty_storage(self):
+        return self.erase({})
+
+    def get_empty_dict(self):
+        return {}
+
+    def listview_float(self, w_set):
+        return self.unerase(w_set.sstorage).keys()
+
+    def is_correct_type(self, w_key):
+        return type(w_key) is W_FloatObject and not math.isnan(w_key.floatval)
+
+    def may_contain_equal_elements(self, strategy):
+        if strategy is self.space.fromcache(BytesSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(AsciiSetStrategy):
+            return False
+        elif strategy is self.space.fromcache(EmptySetStrategy):
+            return False
+        elif strategy is self.space.fromcache(IdentitySetStrategy):
+            return False
+        return True
+
+    def unwrap(self, w_item):
+        return self.space.float_w(w_item)
+
+    def wrap(self, item):
+        return self.space.newfloat(item)
+
+    def iter(self, w_set):
+        return FloatIteratorImplementation(self.space, self, w_set)
+
+
 class ObjectSetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
     erase, unerase = rerased.new_erasing_pair("object")
     erase = staticmethod(erase)
@@ -1442,6 +1831,10 @@ class IdentitySetStrategy(AbstractUnwrappedSetStrategy, SetStrategy):
             return False
         if strategy is self.space.fromcache(IntegerSetStrategy):
             return False
+        if strategy is self.space.fromcache(IntegerBitmapSetStrategy):
+            return False
+        if strategy is self.space.fromcache(FloatSetStrategy):
+            return False
         if strategy is self.space.fromcache(BytesSetStrategy):
             return False
         if strategy is self.space.fromcache(AsciiSetStrategy):
@@ -1547,6 +1940,53 @@ class IntegerIteratorImplementation(IteratorImplementation):
         else:
             return None
 
+class IntegerBitmapIteratorImplementation(IteratorImplementation):
+    def __init__(self, space, strategy, w_set):
+        IteratorImplementation.__init__(self, space, strategy, w_set)
+        self.bitmap = strategy.unerase(w_set.sstorage)
+        self.keys = self.bitmap.sorted_keys()
+        self.keyindex = 0
+        self.block = None
+        self.base = 0
+        self.wordindex = BLOCK_WORDS
+        self.word = r_uint(0)
+
+    def next_entry(self):
+        while not self.word:
+            if self.wordindex < BLOCK_WORDS - 1:
+                self.wordindex += 1
+            else:
+                # go to the next block, skipping the blocks removed
+                # since the creation of the iterator
+                while True:
+                    if self.keyindex == len(self.keys):
+                        return None
+                    key = self.keys[self.keyindex]
+                    self.keyindex += 1
+                    block = self.bitmap.blocks.get(key, None)
+                    if block is not None:
+                        break
+                self.block = block
+                self.base = key << BLOCK_SHIFT
+                self.wordindex = 0
+            self.word = self.block[self.wordindex]
+        word = self.word
+        self.word = word & (word - 1)
+        return self.space.newint(self.base + (self.wordindex << WORD_SHIFT) +
+                                 trailing_zeros(word))
+
+class FloatIteratorImplementation(IteratorImplementation):
+    def __init__(self, space, strategy, w_set):
+        IteratorImplementation.__init__(self, space, strategy, w_set)
+        d = strategy.unerase(w_set.sstorage)
+        self.iterator = d.iterkeys()
+
+    def next_entry(self):
+        for key in self.iterator:
+            return self.space.newfloat(key)
+        else:
+            return None
+
 class IdentityIteratorImplementation(IteratorImplementation):
     def __init__(self, space, strategy, w_set):
         IteratorImplementation.__init__(self, space, strategy, w_set)
@@ -1634,8 +2074,15 @@ def set_strategy_and_setdata(space, w_set, w_iterable):
     intlist = space.listview_int(w_iterable)
     if intlist is not None:
         strategy = space.fromcache(IntegerSetStrategy)
+        w_set.sstorage, w_set.strategy = (
+            strategy.get_storage_and_strategy_from_list(intlist))
+        return
+
+    floatlist = space.listview_float(w_iterable)
+    if floatlist is not None and not _contains_nan(floatlist):
+        strategy = space.fromcache(FloatSetStrategy)
         w_set.strategy = strategy
-        w_set.sstorage = strategy.get_storage_from_unwrapped_list(intlist)
+        w_set.sstorage = strategy.get_storage_from_unwrapped_list(floatlist)
         return
 
     length_hint = space.length_hint(w_iterable, 0)
@@ -1648,6 +2095,12 @@ def set_strategy_and_setdata(space, w_set, w_iterable):
     _update_from_iterable(space, w_set, w_iterable)
 
 
+def _contains_nan(floatlist):
+    for f in floatlist:
+        if math.isnan(f):
+            return True
+    return False
+
 @jit.unroll_safe
 def _pick_correct_strategy_unroll(space, w_set, w_iterable):
 
@@ -1661,6 +2114,15 @@ def _pick_correct_strategy_unroll(space, w_set, w_iterable):
         w_set.sstorage = w_set.strategy.get_storage_from_list(iterable_w)
         return
 
+    # check for floats
+    for w_item in iterable_w:
+        if type(w_item) is not W_FloatObject or math.isnan(w_item.floatval):
+            break
+    else:
+        w_set.strategy = space.fromcache(FloatSetStrategy)
+        w_set.sstorage = w_set.strategy.get_storage_from_list(iterable_w)
+        return
+
     # check for strings
     for w_item in iterable_w:
         if type(w_item) is not W_BytesObject:
@@ -0,0 +1,222 @@
+"""dict implementation for the many dicts that get the same string keys in
+the same order, like the rows made by dict(zip(names, row)) or by
+csv.DictReader.
+
+Somewhat similar to MapDictStrategy: the keys are stored in a map shared
+by all these dicts, and every dict only stores a list of values.  The
+maps are never reordered, because a dict must keep the insertion order of
+its keys.
+"""
+
+from rpython.rlib import jit, rerased
+
+from pypy.objspace.std.dictmultiobject import (
+    BytesDictStrategy, DictStrategy, _never_equal_to_string,
+    create_iterator_classes)
+from pypy.objspace.std.kwargsdict import ZipItemsWithHash
+from pypy.objspace.std.mapdict import Terminator, PlainAttribute, DICT
+
+# a dict with more keys than that devolves to a BytesDictStrategy
+LIMIT_SHARED_KEYS = 32
+
+# the maps are never freed.  After that many were created, dicts that
+# would need a new one devolve to a BytesDictStrategy instead
+LIMIT_SHARED_MAPS = 10000
+
+
+class SharedKeysMaps(object):
+    """ The root of the maps used by SharedKeysDictStrategy, one per space.
+    """
+    def __init__(self, space):
+        self.num_maps = 0
+        terminator = Terminator(space, None)
+        self.root_strategy = SharedKeysDictStrategy(space, terminator, self)
+
+
+def switch_to_shared_keys_strategy(space, w_dict):
+    """ Make an empty dict use the SharedKeysDictStrategy. """
+    strategy = space.fromcache(SharedKeysMaps).root_strategy
+    w_dict.set_strategy(strategy)
+    w_dict.dstorage = strategy.get_empty_storage()
+
+
+class SharedKeysDictStrategy(DictStrategy):
+    """ There is one instance of this strategy per map.  Adding a key moves
+    the dict to the strategy of the next map. """
+
+    erase, unerase = rerased.new_erasing_pair("sharedkeys")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    _immutable_fields_ = ['map', 'maps']
+
+    def __init__(self, space, map, maps):
+        DictStrategy.__init__(self, space)
+        self.map = map
+        self.maps = maps
+        self.next_strategies = None
+        self.keys_in_order = None
+
+    def get_empty_storage(self):
+        assert self.map.num_attributes() == 0
+        return self.erase([])
+
+    @jit.elidable
+    def get_index(self, key):
+        attr = self.map.find_map_attr(key, DICT)
+        if attr is None:
+            return -1
+        assert isinstance(attr, PlainAttribute)
+        return attr.storageindex
+
+    @jit.elidable
+    def get_next_strategy(self, key):
+        """ Return the strategy for the dicts having the keys of this one
+        followed by 'key', or None if we don't want to create it. """
+        next_strategies = self.next_strategies
+        if next_strategies is None:
+            next_strategies = self.next_strategies = {}
+        strategy = next_strategies.get(key, None)
+        if strategy is None:
+            maps = self.maps
+            if (self.map.num_attributes() >= LIMIT_SHARED_KEYS or
+                    maps.num_maps >= LIMIT_SHARED_MAPS):
+                return None
+            maps.num_maps += 1
+            attr = PlainAttribute(key, DICT, self.map, len(next_strategies))
+            strategy = SharedKeysDictStrategy(self.space, attr, maps)
+            next_strategies[key] = strategy
+        return strategy
+
+    @jit.elidable
+    def get_keys_in_order(self):
+        keys_in_order = self.keys_in_order
+        if keys_in_order is None:
+            keys_in_order = []
+            attr = self.map
+            while isinstance(attr, PlainAttribute):
+                keys_in_order.append(attr.name)
+                attr = attr.back
+            keys_in_order.reverse()
+            self.keys_in_order = keys_in_order
+        return keys_in_order
+
+    def is_correct_type(self, w_obj):
+        space = self.space
+        return space.is_w(space.type(w_obj), space.w_text)
+
+    def _never_equal_to(self, w_lookup_type):
+        return _never_equal_to_string(self.space, w_lookup_type)
+
+    def length(self, w_dict):
+        return len(self.unerase(w_dict.dstorage))
+
+    def getitem(self, w_dict, w_key):
+        space = self.space
+        if self.is_correct_type(w_key):
+            return self.getitem_str(w_dict, space.text_w(w_key))
+        elif self._never_equal_to(space.type(w_key)):
+            return None
+        else:
+            self.switch_to_bytes_strategy(w_dict)
+            return w_dict.getitem(w_key)
+
+    def getitem_str(self, w_dict, key):
+        values_w = self.unerase(w_dict.dstorage)
+        if jit.isconstant(key):
+            jit.promote(self)
+        index = self.get_index(key)
+        if index == -1:
+            return None
+        return values_w[index]
+
+    def setitem(self, w_dict, w_key, w_value):
+        if self.is_correct_type(w_key):
+            self.setitem_str(w_dict, self.space.text_w(w_key), w_value)
+        else:
+            self.switch_to_bytes_strategy(w_dict)
+            w_dict.setitem(w_key, w_value)
+
+    def setitem_str(self, w_dict, key, w_value):
+        values_w = self.unerase(w_dict.dstorage)
+        if jit.isconstant(key):
+            jit.promote(self)
+        index = self.get_index(key)
+        if index != -1:
+            values_w[index] = w_value
+            return
+        strategy = self.get_next_strategy(key)
+        if strategy is None:
+            self.switch_to_bytes_strategy(w_dict)
+            w_dict.setitem_str(key, w_value)
+            return
+        # the values of a dict are never shared with another one, so the new
+        # one can be appended in place
+        values_w.append(w_value)
+        w_dict.set_strategy(strategy)
+
+    def setdefault(self, w_dict, w_key, w_default):
+        if self.is_correct_type(w_key):
+            key = self.space.text_w(w_key)
+            w_result = self.getitem_str(w_dict, key)
+            if w_result is not None:
+                return w_result
+            self.setitem_str(w_dict, key, w_default)
+            return w_default
+        else:
+            self.switch_to_bytes_strategy(w_dict)
+            return w_dict.setdefault(w_key, w_default)
+
+    def delitem(self, w_dict, w_key):
+        self.switch_to_bytes_strategy(w_dict)
+        return w_dict.delitem(w_key)
+
+    def popitem(self, w_dict):
+        self.switch_to_bytes_strategy(w_dict)
+        return w_dict.popitem()
+
+    def switch_to_bytes_strategy(self, w_dict):
+        strategy = self.space.fromcache(BytesDictStrategy)
+        values_w = self.unerase(w_dict.dstorage)
+        storage = strategy.get_empty_storage()
+        d_new = strategy.unerase(storage)
+        keys_in_order = self.get_keys_in_order()
+        assert len(keys_in_order) == len(values_w)
+        for index in range(len(keys_in_order)):
+            d_new[keys_in_order[index]] = values_w[index]
+        w_dict.set_strategy(strategy)
+        w_dict.dstorage = storage
+
+    def listview_bytes(self, w_dict):
+        return self.get_keys_in_order()[:]
+
+    def w_keys(self, w_dict):
+        return self.space.newlist_bytes(self.listview_bytes(w_dict))
+
+    def values(self, w_dict):
+        return self.unerase(w_dict.dstorage)[:]
+
+    def items(self, w_dict):
+        space = self.space
+        keys_in_order = self.get_keys_in_order()
+        values_w = self.unerase(w_dict.dstorage)
+        return [space.newtuple([space.newtext(keys_in_order[i]), values_w[i]])
+                for i in range(len(values_w))]
+
+    def view_as_kwargs(self, w_dict):
+        return self.get_keys_in_order()[:], self.unerase(w_dict.dstorage)[:]
+
+    def getiterkeys(self, w_dict):
+        return iter(self.get_keys_in_order())
+
+    def getitervalues(self, w_dict):
+        return iter(self.unerase(w_dict.dstorage))
+
+    def getiteritems_with_hash(self, w_dict):
+        return ZipItemsWithHash(self.get_keys_in_order(),
+                                self.unerase(w_dict.dstorage))
+
+    def wrapkey(space, key):
+        return space.newtext(key)
+
+create_iterator_classes(SharedKeysDictStrategy)
@@ -0,0 +1,95 @@
+"""Instances of the user subclasses of 'object' that only have slots, i.e.
+whose __slots__ doesn't contain '__dict__'.  It may contain '__weakref__':
+like with mapdict, these instances always support weakrefs anyway.
+
+They don't use mapdict: the slots are stored in fixed fields, next to the
+class and the weakref lifeline.  See W_TypeObject.nfixedslots.
+"""
+
+from rpython.rlib import jit
+from rpython.rlib.objectmodel import instantiate
+from rpython.rlib.unroll import unrolling_iterable
+
+from pypy.objspace.std.objectobject import W_ObjectObject
+
+# classes with more slots than that use mapdict
+MAX_FIXED_SLOTS = 8
+
+
+class W_ObjectObjectUserSlots(W_ObjectObject):
+    user_overridden_class = True
+    nslots = 0
+    _lifeline_ = None
+
+    def getclass(self, space):
+        return jit.promote(self.w__class__)
+
+    def setclass(self, space, w_cls):
+        # the caller checked that w_cls has the same instance layout
+        assert w_cls.nfixedslots == self.nslots
+        self.w__class__ = w_cls
+
+    def user_setup(self, space, w_subtype):
+        assert w_subtype.nfixedslots == self.nslots
+        self.w__class__ = w_subtype
+        self._init_slots()
+
+    def _init_slots(self):
+        pass
+
+    def delslotvalue(self, slotindex):
+        if self.getslotvalue(slotindex) is None:
+            return False
+        self.setslotvalue(slotindex, None)
+        return True
+
+    # like mapdict, always support weakrefs, even without '__weakref__'
+
+    def getweakref(self):
+        return self._lifeline_
+
+    def setweakref(self, space, weakreflifeline):
+        self._lifeline_ = weakreflifeline
+
+    def delweakref(self):
+        self._lifeline_ = None
+
+
+def _make_fixed_slots_class(n):
+    rangen = unrolling_iterable(range(n))
+
+    class subcls(W_ObjectObjectUserSlots):
+        nslots = n
+
+        def _init_slots(self):
+            for i in rangen:
+                setattr(self, "_slot%d" % i, None)
+
+        def getslotvalue(self, slotindex):
+            for i in rangen:
+                if slotindex == i:
+                    return getattr(self, "_slot%d" % i)
+            raise AssertionError("bad slot index")
+
+        def setslotvalue(self, slotindex, w_value):
+            for i in rangen:
+                if slotindex == i:
+                    setattr(self, "_slot%d" % i, w_value)
+                    return
+            raise AssertionError("bad slot index")
+
+    subcls.__name__ = "W_ObjectObjectUserSlots%d" % n
+    return subcls
+
+_fixed_slots_classes = unrolling_iterable(
+    [(_n, _make_fixed_slots_class(_n)) for _n in range(MAX_FIXED_SLOTS + 1)])
+
+
+def allocate_fixed_slots_instance(space, w_subtype):
+    nslots = w_subtype.nfixedslots
+    for n, cls in _fixed_slots_classes:
+        if nslots == n:
+            instance = instantiate(cls)
+            instance.user_setup(space, w_subtype)
+            return instance
+    raise AssertionError("too many slots")
@@ -169,11 +169,17 @@ def makespecialisedtuple(space, list_w):
 # This is a trade-off, but it looks like a good idea to keep
 # the list uniform for the JIT---not to mention, it is much
 # faster to move the decision out of the loop.
+# Zipping two lists of ints or two lists of floats directly
+# gives a list using the IntIntTupleListStrategy or the
+# FloatFloatTupleListStrategy, without building any tuple.
 
 @specialize.arg(1)
-def _build_zipped_spec(space, Cls, lst1, lst2):
+def _build_zipped_columns(space, strategycls, lst1, lst2):
+    from pypy.objspace.std.listobject import W_ListObject
     length = min(len(lst1), len(lst2))
-    return [Cls(space, lst1[i], lst2[i]) for i in range(length)]
+    strategy = space.fromcache(strategycls)
+    storage = strategy.storage_from_columns(lst1[:length], lst2[:length])
+    return W_ListObject.from_storage_and_strategy(space, storage, strategy)
 
 def _build_zipped_spec_oo(space, w_list1, w_list2):
     strat1 = w_list1.strategy
@@ -190,7 +196,8 @@ def _build_zipped_unspec(space, w_list1, w_list2):
                             strat2.getitem(w_list2, i)]) for i in range(length)]
 
 def specialized_zip_2_lists(space, w_list1, w_list2):
-    from pypy.objspace.std.listobject import W_ListObject
+    from pypy.objspace.std.listobject import (W_ListObject,
+        IntIntTupleListStrategy, FloatFloatTupleListStrategy)
     if type(w_list1) is not W_ListObject or type(w_list2) is not W_ListObject:
         raise oefmt(space.w_TypeError, "expected two exact lists")
 
@@ -199,17 +206,16 @@ def specialized_zip_2_lists(space, w_list1, w_list2):
         if intlist1 is not None:
             intlist2 = w_list2.getitems_int()
             if intlist2 is not None:
-                lst_w = _build_zipped_spec(
-                        space, Cls_ii, intlist1, intlist2)
-                return space.newlist(lst_w)
+                return _build_zipped_columns(
+                        space, IntIntTupleListStrategy, intlist1, intlist2)
         else:
             floatlist1 = w_list1.getitems_float()
             if floatlist1 is not None:
                 floatlist2 = w_list2.getitems_float()
                 if floatlist2 is not None:
-                    lst_w = _build_zipped_spec(
-                        space, Cls_ff, floatlist1, floatlist2)
-                    return space.newlist(lst_w)
+                    return _build_zipped_columns(
+                        space, FloatFloatTupleListStrategy,
+                        floatlist1, floatlist2)
 
         lst_w = _build_zipped_spec_oo(space, w_list1, w_list2)
         return space.newlist(lst_w)
@@ -0,0 +1,120 @@
+"""A str built by repeated concatenations, e.g. 's += chunk' in a loop.
+
+The characters are kept in a StringBuilder, so that adding to the end of
+the most recent W_StringBufferObject does not copy the whole string.  Any
+other operation first builds the real string, see force().
+"""
+
+import inspect
+
+import py
+
+from rpython.rlib.buffer import StringBuffer
+from rpython.rlib.rstring import StringBuilder
+
+from pypy.interpreter.buffer import SimpleView
+from pypy.objspace.std.bytesobject import W_AbstractBytesObject, W_BytesObject
+
+# concatenations giving a shorter string than that are done by copying
+MIN_BUFFER_LENGTH = 1024
+
+
+def concat_into_buffer(s1, s2):
+    """ Return a new W_StringBufferObject containing s1 + s2. """
+    builder = StringBuilder(len(s1) + len(s2))
+    builder.append(s1)
+    builder.append(s2)
+    return W_StringBufferObject(builder)
+
+
+class W_StringBufferObject(W_AbstractBytesObject):
+    w_str = None
+
+    def __init__(self, builder):
+        self.builder = builder             # StringBuilder
+        self.length = builder.getlength()
+
+    def force(self):
+        if self.w_str is None:
+            s = self.builder.build()
+            if self.length < len(s):
+                s = s[:self.length]
+            self.w_str = W_BytesObject(s)
+        return self.w_str
+
+    def __repr__(self):
+        """ representation for debugging purposes """
+        return "%s(%r[:%d])" % (
+            self.__class__.__name__, self.builder, self.length)
+
+    def unwrap(self, space):
+        return self.force()._value
+
+    def str_w(self, space):
+        return self.force()._value
+
+    def utf8_w(self, space):
+        return self.force()._value
+
+    charbuf_w = str_w
+
+    def buffer_w(self, space, flags):
+        space.check_buf_flags(flags, True)
+        return SimpleView(StringBuffer(self.force()._value))
+
+    def readbuf_w(self, space):
+        return StringBuffer(self.force()._value)
+
+    def writebuf_w(self, space):
+        return self.force().writebuf_w(space)
+
+    def listview_bytes(self):
+        return self.force().listview_bytes()
+
+    def ord(self, space):
+        return self.force().ord(space)
+
+    def descr_len(self, space):
+        return space.newint(self.length)
+
+    def descr_add(self, space, w_other):
+        if not isinstance(w_other, W_AbstractBytesObject):
+            # unicode or bytearray
+            return self.force().descr_add(space, w_other)
+        other = space.bytes_w(w_other)
+        if self.builder.getlength() != self.length:
+            # someone already added something else to our builder
+            return concat_into_buffer(self.force()._value, other)
+        self.builder.append(other)
+        return W_StringBufferObject(self.builder)
+
+    def descr_str(self, space):
+        # you cannot get subclasses of W_StringBufferObject here
+        assert type(self) is W_StringBufferObject
+        return self
+
+
+def _make_forwarding_method(name):
+    func = getattr(W_AbstractBytesObject, name).im_func
+    args = inspect.getargs(func.func_code)
+    if args.varargs or args.keywords:
+        raise TypeError("Varargs and keywords not supported in unwrap_spec")
+    argspec = ', '.join([arg for arg in args.args[1:]])
+    func_code = py.code.Source("""
+    def f(self, %(args)s):
+        return self.force().%(func_name)s(%(args)s)
+    """ % {'args': argspec, 'func_name': name})
+    d = {}
+    exec func_code.compile() in d
+    f = d['f']
+    f.func_defaults = func.func_defaults
+    f.__module__ = __name__
+    f.func_name = name + "_StringBuffer"
+    setattr(W_StringBufferObject, name, f)
+
+for _name in W_AbstractBytesObject.__dict__:
+    if _name.startswith('descr_') and _name not in W_StringBufferObject.__dict__:
+        _make_forwarding_method(_name)
+del _name
+
+W_StringBufferObject.typedef = W_BytesObject.typedef
@@ -155,6 +155,13 @@ class TestW_DictObject(object):
         w_d.initialize_content([(w(1), w("a")), (w(2), w("b"))])
         assert self.space.listview_int(w_d) == [1, 2]
 
+    def test_listview_float_dict(self):
+        w = self.space.wrap
+        w_d = self.space.newdict()
+        w_d.initialize_content([(w(1.5), w("a")), (w(-2.0), w("b"))])
+        assert self.space.listview_float(w_d) == [1.5, -2.0]
+        assert self.space.listview_int(w_d) is None
+
     def test_keys_on_string_unicode_int_dict(self, monkeypatch):
         w = self.space.wrap
         wb = self.space.newbytes
@@ -1182,6 +1189,54 @@ class AppTestStrategies(object):
         assert "IntDictStrategy" in self.get_strategy(d)
         assert d[1L] == "hi"
 
+    def test_empty_to_float(self):
+        d = {}
+        d[1.5] = "hi"
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert d[1.5] == "hi"
+        assert d.get("1.5") is None
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        d[-0.0] = "zero"
+        assert d[0.0] == "zero"
+        d[0.0] = "other zero"
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert len(d) == 2
+        assert [str(key) for key in sorted(d)] == ["-0.0", "1.5"]
+        assert type(d.keys()[0]) is float
+        del d[-0.0]
+        assert d.items() == [(1.5, "hi")]
+
+    def test_float_dict_mixed_keys(self):
+        d = {2.0: "two"}
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert d[2] == "two"
+        assert d[2L] == "two"
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        #
+        d = {2.0: "two"}
+        d[2] = "int two"
+        assert d == {2.0: "int two"}
+        assert type(d.keys()[0]) is float
+        #
+        class F(float):
+            pass
+        d = {2.0: "two"}
+        d[F(3.0)] = "three"
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d[3.0] == "three"
+
+    def test_float_dict_nan(self):
+        nan = float("nan")
+        d = {nan: 1}
+        assert "FloatDictStrategy" not in self.get_strategy(d)
+        assert d[nan] == 1
+        #
+        d = {1.0: 1}
+        d[nan] = 2
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d[nan] == 2
+        assert len(d) == 2
+
     def test_iter_dict_length_change(self):
         d = {1: 2, 3: 4, 5: 6}
         it = d.iteritems()
@@ -1271,7 +1326,7 @@ class FakeSpace:
 
     def wrap(self, obj):
         return obj
-    newtext = newbytes = newint = newfloat = wrap
+    newtext = newbytes = newint = newfloat = newbool = wrap
 
     def isinstance_w(self, obj, klass):
         return isinstance(obj, klass)
@@ -1315,6 +1370,7 @@ class FakeSpace:
     UnicodeObjectCls = FakeUnicode
     IntObjectCls = int
     FloatObjectCls = float
+    BoolObjectCls = bool
     w_dict = W_DictObject
     iter = iter
     fixedview = list
@@ -1325,6 +1381,8 @@ class Config:
         class std:
             methodcachesizeexp = 11
             withmethodcachecounter = False
+            withsharedkeydicts = False
+            withfixedslots = False
 
 FakeSpace.config = Config()
 
@@ -0,0 +1,175 @@
+class TestQuickening(object):
+    spaceconfig = {"objspace.std.quickening": True}
+
+    def test_globals_cache(self):
+        space = self.space
+        w_mod = space.call_function(space.type(space.sys),
+                                    space.newtext('m'))
+        w_globals = space.getattr(w_mod, space.newtext('__dict__'))
+        space.exec_("x = 5\ndef f(): return x, len\n", w_globals, w_globals)
+        w_f = space.getitem(w_globals, space.newtext('f'))
+        pycode = w_f.code
+        assert pycode._globals_caches == [None, None]
+        space.call_function(w_f)
+        entry_x, entry_len = pycode._globals_caches
+        assert entry_x.builtins_version is None
+        assert entry_len.builtins_version is not None
+        assert space.int_w(entry_x.cell) == 5
+        w_res = space.call_function(w_f)
+        assert space.int_w(space.getitem(w_res, space.newint(0))) == 5
+        assert pycode._globals_caches == [entry_x, entry_len]
+
+
+class AppTestQuickening(object):
+    spaceconfig = {"objspace.std.quickening": True}
+
+    def test_int_float_arithmetic(self):
+        import sys
+        def f(a, b):
+            return a + b, a - b
+        def add(a, b):
+            return a + b
+        assert f(5, 3) == (8, 2)
+        assert f(sys.maxint, 1) == (sys.maxint + 1, sys.maxint - 1)
+        assert type(f(sys.maxint, 1)[0]) is long
+        assert f(-sys.maxint - 1, 1)[1] == -sys.maxint - 2
+        assert f(1.5, 0.25) == (1.75, 1.25)
+        assert f(1, 0.5) == (1.5, 0.5)
+        assert add('a', 'b') == 'ab'
+        x = 1.5
+        x += 1.0
+        x -= 0.25
+        assert x == 2.25
+        class F(float):
+            def __add__(self, other):
+                return 'add'
+        assert add(F(1.0), 2.0) == 'add'
+
+    def test_compare(self):
+        def f(a, b):
+            return [a < b, a <= b, a == b, a != b, a > b, a >= b]
+        assert f(1, 2) == [True, True, False, True, False, False]
+        assert f(2, 2) == [False, True, True, False, False, True]
+        assert f(2.5, 1.5) == [False, False, False, True, True, True]
+        nan = float('nan')
+        assert f(nan, nan) == [False, False, False, True, False, False]
+        assert f(1, 1.0) == [False, True, True, False, False, True]
+        assert f(True, 1) == [False, True, True, False, False, True]
+        class I(int):
+            def __lt__(self, other):
+                return 'lt'
+        assert f(I(5), 3)[0] == 'lt'
+        assert 1 in [1, 2] and 3 not in [1, 2]
+
+    def test_load_global(self):
+        import sys
+        ns = type(sys)('m').__dict__
+        ns['x'] = 1
+        exec """if 1:
+            def f():
+                return x, len
+            def setx(value):
+                global x
+                x = value
+        """ in ns
+        f = ns['f']
+        assert f() == (1, len)
+        assert f() == (1, len)
+        ns['setx'](2)
+        assert f() == (2, len)
+        ns['setx'](3)      # now 'x' is stored in a cell
+        assert f() == (3, len)
+        ns['x'] = 'z'
+        assert f() == ('z', len)
+        ns['len'] = 'mylen'
+        assert f() == ('z', 'mylen')
+        del ns['len']
+        assert f() == ('z', len)
+        del ns['x']
+        raises(NameError, f)
+        ns['x'] = 4
+        assert f() == (4, len)
+
+    def test_load_global_builtins_change(self):
+        import sys, __builtin__
+        ns = type(sys)('m').__dict__
+        exec "def f(): return quickening_test_name" in ns
+        f = ns['f']
+        raises(NameError, f)
+        __builtin__.quickening_test_name = 42
+        try:
+            assert f() == 42
+            assert f() == 42
+            __builtin__.quickening_test_name = 43
+            assert f() == 43
+        finally:
+            del __builtin__.quickening_test_name
+        raises(NameError, f)
+
+    def test_load_global_same_code_other_globals(self):
+        import sys
+        code = compile("def f(): return x", "<test>", "exec")
+        ns1 = type(sys)('m1').__dict__
+        ns2 = type(sys)('m2').__dict__
+        ns1['x'] = 1
+        ns2['x'] = 2
+        exec code in ns1
+        exec code in ns2
+        for i in range(3):
+            assert ns1['f']() == 1
+            assert ns2['f']() == 2
+        f = ns1['f']
+        g = type(f)(f.func_code, ns2)
+        for i in range(3):
+            assert f() == 1
+            assert g() == 2
+        ns3 = {'x': 3}
+        h = type(f)(f.func_code, ns3)
+        assert h() == 3
+        assert f() == 1
+        ns3['x'] = 4
+        assert h() == 4
+
+    def test_load_fast_pair(self):
+        def f(a, b):
+            return a, b
+        assert f(1, 2) == (1, 2)
+        def g(a):
+            if a:
+                b = 5
+            return a, b
+        assert g(1) == (1, 5)
+        exc = raises(UnboundLocalError, g, 0)
+        assert "'b'" in str(exc.value)
+
+    def test_load_fast_pair_traceback_line(self):
+        import sys
+        def g(a):
+            if a:
+                b = 5
+            return (a,
+                    b)
+        try:
+            g(0)
+        except UnboundLocalError:
+            tb = sys.exc_info()[2]
+        while tb.tb_next is not None:
+            tb = tb.tb_next
+        assert tb.tb_lineno == g.func_code.co_firstlineno + 4
+
+    def test_load_fast_pair_trace(self):
+        import sys
+        def g(a, b):
+            return (a,
+                    b)
+        lines = []
+        def trace(frame, event, arg):
+            if frame.f_code is g.func_code:
+                lines.append((event, frame.f_lineno - g.func_code.co_firstlineno))
+            return trace
+        sys.settrace(trace)
+        try:
+            g(1, 2)
+        finally:
+            sys.settrace(None)
+        assert lines == [('call', 0), ('line', 1), ('line', 2), ('return', 2)]
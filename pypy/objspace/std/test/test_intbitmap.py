@@ -0,0 +1,103 @@
+import random
+
+from rpython.rlib.rarithmetic import r_uint, LONG_BIT
+from pypy.objspace.std.intbitmap import (
+    IntBitmap, bitmap_from_ints, ints_are_dense, popcount, trailing_zeros,
+    BLOCK_SIZE, MIN_LENGTH, MIN_DENSITY)
+
+
+def random_ints(n, start, stop):
+    return [random.randrange(start, stop) for i in range(n)]
+
+def check(bitmap, expected):
+    assert bitmap.length == len(expected)
+    assert bitmap.tolist() == sorted(expected)
+    for block in bitmap.blocks.values():
+        assert any(block)
+
+
+def test_popcount():
+    assert popcount(r_uint(0)) == 0
+    assert popcount(r_uint(1)) == 1
+    assert popcount(r_uint(-1)) == LONG_BIT
+    assert popcount(r_uint(0b101100)) == 3
+    assert trailing_zeros(r_uint(1)) == 0
+    assert trailing_zeros(r_uint(0b101100)) == 2
+    assert trailing_zeros(r_uint(1) << (LONG_BIT - 1)) == LONG_BIT - 1
+
+def test_add_remove_contains():
+    bitmap = IntBitmap({}, 0)
+    ints = [0, 1, 63, 64, BLOCK_SIZE - 1, BLOCK_SIZE, -1, -BLOCK_SIZE,
+            -BLOCK_SIZE - 1, 10 ** 12, -10 ** 12]
+    for x in ints:
+        bitmap.add(x)
+        bitmap.add(x)
+    check(bitmap, ints)
+    for x in ints:
+        assert bitmap.contains(x)
+        assert bitmap.contains(x + 2) == (x + 2 in ints)
+    assert bitmap.remove(-1)
+    assert not bitmap.remove(-1)
+    assert not bitmap.remove(2)
+    ints.remove(-1)
+    check(bitmap, ints)
+    for x in ints:
+        assert bitmap.remove(x)
+    check(bitmap, [])
+    assert bitmap.blocks == {}
+
+def test_pop():
+    ints = set(random_ints(200, -BLOCK_SIZE * 3, BLOCK_SIZE * 3))
+    bitmap = bitmap_from_ints(list(ints))
+    popped = set()
+    for i in range(len(ints)):
+        popped.add(bitmap.pop())
+    assert popped == ints
+    check(bitmap, [])
+    raises(KeyError, bitmap.pop)
+
+def test_copy():
+    bitmap = bitmap_from_ints([1, 2, 3])
+    bitmap2 = bitmap.copy()
+    bitmap2.add(4)
+    check(bitmap, [1, 2, 3])
+    check(bitmap2, [1, 2, 3, 4])
+
+def test_operations():
+    for i in range(5):
+        size = random.choice([10, 1000, 3000])
+        ints1 = set(random_ints(size, -BLOCK_SIZE * 2, BLOCK_SIZE * 4))
+        ints2 = set(random_ints(size, -BLOCK_SIZE * 4, BLOCK_SIZE * 2))
+        for a, b in [(ints1, ints2), (ints1, ints1), (ints1, set()),
+                     (set(), ints2), (ints1 & ints2, ints1)]:
+            bitmap1 = bitmap_from_ints(list(a))
+            bitmap2 = bitmap_from_ints(list(b))
+            check(bitmap1.and_(bitmap2), a & b)
+            check(bitmap1.or_(bitmap2), a | b)
+            check(bitmap1.sub(bitmap2), a - b)
+            check(bitmap1.xor(bitmap2), a ^ b)
+            assert bitmap1.issubset(bitmap2) == (a <= b)
+            assert bitmap1.isdisjoint(bitmap2) == (not (a & b))
+            check(bitmap1, a)
+            check(bitmap2, b)
+
+def test_inplace_operations_with_itself():
+    bitmap = bitmap_from_ints([1, 2, 3])
+    bitmap.ior(bitmap)
+    check(bitmap, [1, 2, 3])
+    bitmap.ixor(bitmap)
+    check(bitmap, [])
+    bitmap = bitmap_from_ints([1, 2, 3])
+    bitmap.isub(bitmap)
+    check(bitmap, [])
+
+def test_density():
+    dense = range(MIN_LENGTH)
+    assert ints_are_dense(dense, len(dense))
+    assert not ints_are_dense(dense[:-1], len(dense) - 1)
+    sparse = range(0, MIN_LENGTH * BLOCK_SIZE, BLOCK_SIZE)
+    assert not ints_are_dense(sparse, len(sparse))
+    d = dict.fromkeys(range(0, MIN_LENGTH * MIN_DENSITY, MIN_DENSITY))
+    assert ints_are_dense(d, len(d))
+    assert not bitmap_from_ints(d).is_too_sparse()
+    assert bitmap_from_ints(sparse).is_too_sparse()
@@ -704,3 +704,7 @@ class AppTestIntShortcut(AppTestInt):
         a = 8.5
         a -= .5
         assert a == 8
+
+
+class AppTestIntQuickening(AppTestIntShortcut):
+    spaceconfig = {"objspace.std.quickening": True}
@@ -1251,6 +1251,21 @@ class AppTestListObject(object):
         assert c.count('h') == 1
         assert c.count('w') == 0
 
+    def test_count_unboxed(self):
+        l = [1, 2, 1, 3, 1]
+        assert l.count(1) == 3
+        assert l.count(1.0) == 3
+        assert l.count(4) == 0
+        nan = float('nan')
+        l = [1.0, nan, -0.0, 1.0]
+        assert l.count(1.0) == 2
+        assert l.count(nan) == 1
+        assert l.count(0.0) == 1
+        assert l.count(1) == 2
+        l = [1, 2.5, 1, 1.0]
+        assert l.count(1) == 3
+        assert l.count(2.5) == 1
+
     def test_insert(self):
         c = list('hello world')
         c.insert(0, 'X')
@@ -1567,6 +1582,25 @@ class AppTestListObject(object):
         assert ([5] >  [N]) is False
         assert ([5] >= [N]) is False
 
+    def test_comparison_unboxed(self):
+        nan = float('nan')
+        l = [1.0, nan, 2.0]
+        assert l == l
+        assert l == [1.0, nan, 2.0]
+        assert not l < [1.0, nan, 2.0]
+        assert l <= [1.0, nan, 2.0]
+        assert l < [1.0, nan, 3.0]
+        assert [0.0, 1.5] == [-0.0, 1.5]
+        assert [0.0, 1.5] < [-0.0, 2.5]
+        assert [1.5, 2.5] < [1.5, 2.5, 0.0]
+        assert [1, 2, 3] < [1, 2, 4]
+        assert [1, 2, 3] > [1, 2]
+        assert [1, 2, 3] >= [1, 2, 3]
+        assert not [1, 2, 3] > [1, 2, 3]
+        assert ['a', 'b'] < ['a', 'c']
+        assert [1, 2.5] == [1.0, 2.5]
+        assert [1, 2.5] < [1.0, 3]
+
     def test_resizelist_hint(self):
         if self.on_cpython:
             skip('pypy-only test')
@@ -4,7 +4,8 @@ from pypy.objspace.std.listobject import (
     W_ListObject, EmptyListStrategy, ObjectListStrategy, IntegerListStrategy,
     FloatListStrategy, BytesListStrategy, RangeListStrategy,
     SimpleRangeListStrategy, make_range_list, AsciiListStrategy,
-    IntOrFloatListStrategy)
+    IntOrFloatListStrategy, IntIntTupleListStrategy,
+    FloatFloatTupleListStrategy)
 from pypy.objspace.std import listobject
 from pypy.objspace.std.test.test_listobject import TestW_ListObject
 
@@ -1051,6 +1052,65 @@ class TestW_ListStrategies(TestW_ListObject):
         assert isinstance(w_item, space.StringObjectCls)
 
 
+class TestW_TupleListStrategies:
+    spaceconfig = {"objspace.std.withspecialisedtuple": True}
+
+    def test_columns(self):
+        from pypy.objspace.std.specialisedtupleobject import (
+            specialized_zip_2_lists)
+        space = self.space
+        w = space.wrap
+        # lists of existing tuples don't use the columns
+        w_l = W_ListObject(space, [w((1, 2)), w((3, 4))])
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        w_l = W_ListObject(space, [])
+        w_l.append(w((1.5, 2.5)))
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        #
+        w_l = specialized_zip_2_lists(space, W_ListObject(space, [w(1), w(3)]),
+                                      W_ListObject(space, [w(2), w(4)]))
+        assert isinstance(w_l.strategy, IntIntTupleListStrategy)
+        storage = w_l.strategy.unerase(w_l.lstorage)
+        assert w_l.length() == 2
+        w_l.sort(True)
+        assert storage.col0 == [3, 1]
+        assert storage.col1 == [4, 2]
+        assert space.unwrap(w_l.pop_end()) == (1, 2)
+        assert isinstance(w_l.strategy, IntIntTupleListStrategy)
+        w_t = w((5, 6))
+        w_l.append(w_t)
+        assert isinstance(w_l.strategy, IntIntTupleListStrategy)
+        assert storage.cache_w == [None, w_t]
+        assert w_l.getitem(1) is w_t
+        # once all the tuples are built, the columns are dropped
+        w_t0 = w_l.getitem(0)
+        assert isinstance(w_l.strategy, ObjectListStrategy)
+        assert w_l.getitems() == [w_t0, w_t]
+        assert space.unwrap(w_l) == [(3, 4), (5, 6)]
+
+    def test_zip(self):
+        from pypy.objspace.std.specialisedtupleobject import (
+            specialized_zip_2_lists)
+        space = self.space
+        w = space.wrap
+        w_l1 = W_ListObject(space, [w(1), w(2), w(3)])
+        w_l2 = W_ListObject(space, [w(4), w(5)])
+        w_res = specialized_zip_2_lists(space, w_l1, w_l2)
+        assert isinstance(w_res.strategy, IntIntTupleListStrategy)
+        storage = w_res.strategy.unerase(w_res.lstorage)
+        assert storage.col0 == [1, 2]
+        assert storage.col1 == [4, 5]
+        # the columns are not shared with the zipped lists
+        w_l1.setitem(0, w(42))
+        assert storage.col0 == [1, 2]
+        #
+        w_l1 = W_ListObject(space, [w(1.5)])
+        w_l2 = W_ListObject(space, [w(2.5)])
+        w_res = specialized_zip_2_lists(space, w_l1, w_l2)
+        assert isinstance(w_res.strategy, FloatFloatTupleListStrategy)
+        assert space.unwrap(w_res) == [(1.5, 2.5)]
+
+
 class TestW_ListStrategiesDisabled:
     spaceconfig = {"objspace.std.withliststrategies": False}
 
@@ -10,6 +10,8 @@ class Config:
         class std:
             methodcachesizeexp = 11
             withmethodcachecounter = False
+            withsharedkeydicts = False
+            withfixedslots = False
 
 space = FakeSpace()
 space.config = Config
@@ -628,10 +630,13 @@ def test_unboxed_type_change():
     cls = Class(allow_unboxing=True)
     w_obj = cls.instantiate(space)
     w_obj.setdictvalue(space, "b", 15.12)
+    unboxed_map = w_obj.map
     w_obj.setdictvalue(space, "b", "woopsie")
     assert w_obj.getdictvalue(space, "b") == "woopsie"
     assert type(w_obj.map) is PlainAttribute
-    assert w_obj.map.terminator.allow_unboxing == False
+    assert unboxed_map.boxed
+    # only this attribute is not unboxed any more
+    assert w_obj.map.terminator.allow_unboxing == True
 
     w_obj = cls.instantiate(space)
     w_obj.setdictvalue(space, "b", 15.12)
@@ -651,7 +656,7 @@ def test_unboxed_type_change_other_object():
     w_obj1.setdictvalue(space, "b", "woopsie")
     assert w_obj1.getdictvalue(space, "b") == "woopsie"
     assert type(w_obj1.map) is PlainAttribute
-    assert w_obj1.map.terminator.allow_unboxing == False
+    assert w_obj2.map.boxed
 
     # w_obj2 is unaffected so far
     assert type(w_obj2.map) is UnboxedPlainAttribute
@@ -669,7 +674,61 @@ def test_unboxed_mixed_two_different_instances():
     w_obj2 = cls.instantiate(space)
     w_obj2.setdictvalue(space, "b", "abc")
 
-    assert w_obj2.map.terminator.allow_unboxing == False
+    assert type(w_obj2.map) is PlainAttribute
+    assert w_obj1.map.boxed
+    assert w_obj1.getdictvalue(space, "b") == 15.12
+    assert w_obj1.map is w_obj2.map
+
+def test_unboxed_write_bool():
+    cls = Class(allow_unboxing=True)
+    w_obj = cls.instantiate(space)
+    w_obj.setdictvalue(space, "a", True)
+    w_obj.setdictvalue(space, "b", 1.5)
+    w_obj.setdictvalue(space, "c", False)
+    assert isinstance(w_obj.map, UnboxedPlainAttribute)
+    assert isinstance(w_obj.map.back, UnboxedPlainAttribute)
+    assert isinstance(w_obj.map.back.back, UnboxedPlainAttribute)
+    assert unerase_unboxed(w_obj.storage[0]) == [
+        longlong2float(1), 1.5, longlong2float(0)]
+    assert w_obj.getdictvalue(space, "a") is True
+    assert w_obj.getdictvalue(space, "c") is False
+    w_obj.setdictvalue(space, "a", False)
+    assert w_obj.getdictvalue(space, "a") is False
+    assert isinstance(w_obj.map.back.back, UnboxedPlainAttribute)
+
+def test_unboxed_type_change_other_attributes_stay_unboxed():
+    cls = Class(allow_unboxing=True)
+    w_obj1 = cls.instantiate(space)
+    w_obj1.setdictvalue(space, "a", 1.5)
+    w_obj1.setdictvalue(space, "b", 2.5)
+    w_obj1.setdictvalue(space, "c", 3.5)
+    w_obj1.setdictvalue(space, "b", "x")
+    assert w_obj1.getdictvalue(space, "a") == 1.5
+    assert w_obj1.getdictvalue(space, "b") == "x"
+    assert w_obj1.getdictvalue(space, "c") == 3.5
+    assert type(w_obj1.map) is UnboxedPlainAttribute
+    assert type(w_obj1.map.back) is PlainAttribute
+    assert type(w_obj1.map.back.back) is UnboxedPlainAttribute
+    w_obj1._check_unboxed_storage_consistency()
+
+    w_obj2 = cls.instantiate(space)
+    w_obj2.setdictvalue(space, "a", 4.5)
+    w_obj2.setdictvalue(space, "b", 5.5)
+    w_obj2.setdictvalue(space, "c", 6.5)
+    assert w_obj2.map is w_obj1.map
+    assert w_obj2.getdictvalue(space, "b") == 5.5
+
+def test_unboxed_too_many_type_changes():
+    cls = Class(allow_unboxing=True)
+    for i in range(LIMIT_UNBOXING_TYPE_CHANGES):
+        assert cls.terminator.allow_unboxing
+        w_obj = cls.instantiate(space)
+        w_obj.setdictvalue(space, "a%s" % i, 1.5)
+        w_obj.setdictvalue(space, "a%s" % i, "x")
+    assert not cls.terminator.allow_unboxing
+    w_obj = cls.instantiate(space)
+    w_obj.setdictvalue(space, "b", 1.5)
+    assert type(w_obj.map) is PlainAttribute
 
 def test_unboxed_attr_immutability(monkeypatch):
     cls = Class(allow_unboxing=True)
@@ -81,7 +81,7 @@ class TestW_SetObject:
     def test_create_set_from_list(self):
         from pypy.interpreter.baseobjspace import W_Root
         from pypy.objspace.std.setobject import BytesSetStrategy, ObjectSetStrategy
-        from pypy.objspace.std.floatobject import W_FloatObject
+        from pypy.objspace.std.setobject import FloatSetStrategy
 
         w = self.space.wrap
         wb = self.space.newbytes
@@ -116,9 +116,15 @@ class TestW_SetObject:
         w_list = W_ListObject(self.space, [w(1.0), w(2.0), w(3.0)])
         w_set = W_SetObject(self.space)
         _initialize_set(self.space, w_set, w_list)
+        assert w_set.strategy is self.space.fromcache(FloatSetStrategy)
+        assert w_set.strategy.unerase(w_set.sstorage) == {1.0:None, 2.0:None, 3.0:None}
+
+        w_list = W_ListObject(self.space, [w(1.0), w(2), w(3.0)])
+        w_set = W_SetObject(self.space)
+        _initialize_set(self.space, w_set, w_list)
         assert w_set.strategy is self.space.fromcache(ObjectSetStrategy)
         for item in w_set.strategy.unerase(w_set.sstorage):
-            assert isinstance(item, W_FloatObject)
+            assert isinstance(item, W_Root)
 
         # changed cached object, need to change it back for other tests to pass
         intstr.get_storage_from_list = tmp_func
@@ -1037,6 +1043,41 @@ class AppTestAppSetTest:
         # operands when the first set is larger than the second
         assert type(frozenset([1, 2]) & set([2])) is frozenset
 
+    def test_float_strategy(self):
+        from __pypy__ import strategy
+        s = set([1.5, -0.0])
+        assert strategy(s) == "FloatSetStrategy"
+        s.add(0.0)
+        assert len(s) == 2
+        assert 0.0 in s and 1.5 in s
+        assert s == set([1.5, 0.0])
+        assert s & set([1.5, 7.0]) == set([1.5])
+        assert strategy(s) == "FloatSetStrategy"
+        assert set([1.0, 2.5]) == set([1, 2.5])
+        assert not set([1.5]).isdisjoint(set([1.5]))
+        assert set(["a"]).isdisjoint(set([1.5]))
+        #
+        s = set([2.0])
+        s.add(2)
+        assert strategy(s) == "ObjectSetStrategy"
+        assert len(s) == 1 and type(list(s)[0]) is float
+        assert set([1.0, 2.0]) - set([1]) == set([2.0])
+
+    def test_float_strategy_nan(self):
+        from __pypy__ import strategy
+        nan = float("nan")
+        s = set([nan, nan, 1.0])
+        assert strategy(s) == "ObjectSetStrategy"
+        assert len(s) == 2
+        assert nan in s
+        s = set()
+        s.add(nan)
+        assert strategy(s) != "FloatSetStrategy"
+        s = set([1.5])
+        s.add(nan)
+        assert len(s) == 2
+        assert nan in s
+
     def test_update_bug_strategy(self):
         from __pypy__ import strategy
         s = set([1, 2, 3])
@@ -1069,6 +1110,37 @@ class AppTestAppSetTest:
         s.intersection_update(set())
         assert strategy(s) == "EmptySetStrategy"
 
+    def test_int_bitmap_strategy(self):
+        from __pypy__ import strategy
+        a = set(range(0, 2100, 2))
+        b = frozenset(range(0, 3300, 3))
+        c = set([-1, 6, 7, 10 ** 10])
+        assert strategy(a) == strategy(b) == "IntegerBitmapSetStrategy"
+        assert strategy(c) == "IntegerSetStrategy"
+        for x, y in [(a, b), (b, a), (a, c), (c, a), (a, set([1.5, 2.0]))]:
+            dx, dy = dict.fromkeys(x), dict.fromkeys(y)
+            assert sorted(x & y) == sorted([i for i in dx if i in dy])
+            assert sorted(x | y) == sorted(dict.fromkeys(list(x) + list(y)))
+            assert sorted(x - y) == sorted([i for i in dx if i not in dy])
+            assert sorted(x ^ y) == sorted([i for i in dx if i not in dy] +
+                                           [i for i in dy if i not in dx])
+            assert type(x & y) is type(x)
+            assert (x & y) <= x
+            assert not (x <= y)
+            assert not x.isdisjoint(y)
+            z = set(x)
+            z &= y
+            assert z == x & y
+            z = set(x)
+            z ^= y
+            assert z == x ^ y
+        assert a == set(list(a))
+        assert a != b
+        assert 2.0 in a
+        assert sorted(a) == range(0, 2100, 2)
+        assert a.pop() in range(0, 2100, 2)
+        assert len(a) == 1049
+
     def test_weird_exception_from_iterable(self):
         def f():
            raise ValueError
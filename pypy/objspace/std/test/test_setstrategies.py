@@ -1,8 +1,11 @@
 from pypy.objspace.std.setobject import W_SetObject
 from pypy.objspace.std.setobject import (
     BytesIteratorImplementation, BytesSetStrategy, EmptySetStrategy,
+    FloatIteratorImplementation, FloatSetStrategy,
     IntegerIteratorImplementation, IntegerSetStrategy, ObjectSetStrategy,
-    UnicodeIteratorImplementation, AsciiSetStrategy)
+    UnicodeIteratorImplementation, AsciiSetStrategy,
+    IntegerBitmapSetStrategy, IntegerBitmapIteratorImplementation)
+from pypy.objspace.std.intbitmap import BLOCK_SIZE, MIN_LENGTH
 from pypy.objspace.std.listobject import W_ListObject
 
 class TestW_SetStrategies:
@@ -29,6 +32,12 @@ class TestW_SetStrategies:
         s = W_SetObject(self.space, self.wrapped([u"a", u"b"]))
         assert s.strategy is self.space.fromcache(AsciiSetStrategy)
 
+        s = W_SetObject(self.space, self.wrapped([1.5, 2.0]))
+        assert s.strategy is self.space.fromcache(FloatSetStrategy)
+
+        s = W_SetObject(self.space, self.wrapped([1.5, float("nan")]))
+        assert s.strategy is self.space.fromcache(ObjectSetStrategy)
+
     def test_switch_to_object(self):
         s = W_SetObject(self.space, self.wrapped([1,2,3,4,5]))
         s.add(self.space.wrap("six"))
@@ -122,6 +131,11 @@ class TestW_SetStrategies:
         assert space.unwrap(it.next()) == 1
         assert space.unwrap(it.next()) == 2
         #
+        s = W_SetObject(space, self.wrapped([1.5]))
+        it = s.iter()
+        assert isinstance(it, FloatIteratorImplementation)
+        assert space.unwrap(it.next()) == 1.5
+        #
         s = W_SetObject(space, self.wrapped(["a", "b"]))
         it = s.iter()
         assert isinstance(it, BytesIteratorImplementation)
@@ -142,5 +156,93 @@ class TestW_SetStrategies:
         s = W_SetObject(space, self.wrapped(["a", "b"]))
         assert sorted(space.listview_bytes(s)) == ["a", "b"]
         #
+        s = W_SetObject(space, self.wrapped([2.5, 1.0]))
+        assert sorted(space.listview_float(s)) == [1.0, 2.5]
+        assert space.listview_int(s) is None
+        #
         #s = W_SetObject(space, self.wrapped([u"a", u"b"]))
         #assert sorted(space.listview_unicode(s)) == [u"a", u"b"]
+
+    def test_bitmap(self):
+        space = self.space
+        bitmap = space.fromcache(IntegerBitmapSetStrategy)
+        ints = space.fromcache(IntegerSetStrategy)
+        s = W_SetObject(space, self.wrapped(range(MIN_LENGTH)))
+        assert s.strategy is bitmap
+        s = W_SetObject(space, self.wrapped(range(MIN_LENGTH - 1)))
+        assert s.strategy is ints
+        s.add(space.wrap(MIN_LENGTH))
+        assert s.strategy is bitmap
+        s = W_SetObject(space, self.wrapped(range(0, MIN_LENGTH * BLOCK_SIZE,
+                                                  BLOCK_SIZE)))
+        assert s.strategy is ints
+        #
+        s = W_SetObject(space, self.wrapped(range(MIN_LENGTH)))
+        for i in range(MIN_LENGTH // 2 + 1):
+            s.remove(space.wrap(i))
+        assert s.strategy is ints
+        assert space.len_w(s) == MIN_LENGTH // 2 - 1
+        #
+        s = W_SetObject(space, self.wrapped(range(MIN_LENGTH)))
+        s.add(space.wrap("x"))
+        assert s.strategy is space.fromcache(ObjectSetStrategy)
+        assert space.len_w(s) == MIN_LENGTH + 1
+
+    def test_bitmap_operations(self):
+        space = self.space
+        bitmap = space.fromcache(IntegerBitmapSetStrategy)
+        ints = space.fromcache(IntegerSetStrategy)
+        s1 = W_SetObject(space, self.wrapped(range(0, 4 * MIN_LENGTH)))
+        s2 = W_SetObject(space, self.wrapped(range(2 * MIN_LENGTH,
+                                                   6 * MIN_LENGTH)))
+        s3 = W_SetObject(space, self.wrapped([-5, 3, 10 ** 9]))
+        assert s1.strategy is s2.strategy is bitmap
+        assert s3.strategy is ints
+        #
+        s = s1.intersect(s2)
+        assert s.strategy is bitmap
+        assert space.len_w(s) == 2 * MIN_LENGTH
+        s = s1.intersect(s3)
+        assert s.strategy is ints
+        assert space.listview_int(s) == [3]
+        s = s3.intersect(s1)
+        assert s.strategy is ints
+        assert space.listview_int(s) == [3]
+        #
+        s = s1.copy_real()
+        s.update(s2)
+        assert s.strategy is bitmap
+        assert space.len_w(s) == 6 * MIN_LENGTH
+        s = s3.copy_real()
+        s.update(s1)
+        assert s.strategy is bitmap
+        assert space.len_w(s) == 4 * MIN_LENGTH + 2
+        #
+        s = s1.difference(s2)
+        assert s.strategy is bitmap
+        assert space.listview_int(s) == range(2 * MIN_LENGTH)
+        s = s1.symmetric_difference(s3)
+        assert s.strategy is bitmap
+        assert space.len_w(s) == 4 * MIN_LENGTH + 1
+        s = s1.difference(s1)
+        assert s.strategy is ints
+        assert space.len_w(s) == 0
+        #
+        assert s1.intersect(s2).issubset(s1)
+        assert not s1.issubset(s2)
+        assert not s1.isdisjoint(s2)
+        assert s1.isdisjoint(W_SetObject(space, self.wrapped([-1])))
+        assert s1.equals(s1.copy_real())
+
+    def test_bitmap_iter(self):
+        space = self.space
+        s = W_SetObject(space, self.wrapped(range(-MIN_LENGTH, MIN_LENGTH)))
+        it = s.iter()
+        assert isinstance(it, IntegerBitmapIteratorImplementation)
+        result = []
+        while True:
+            w_item = it.next()
+            if w_item is None:
+                break
+            result.append(space.int_w(w_item))
+        assert result == range(-MIN_LENGTH, MIN_LENGTH)
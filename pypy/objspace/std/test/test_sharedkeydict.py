@@ -0,0 +1,158 @@
+from pypy.objspace.std.sharedkeydict import (
+    SharedKeysDictStrategy, SharedKeysMaps, LIMIT_SHARED_KEYS)
+
+
+class TestSharedKeys(object):
+    spaceconfig = {"objspace.std.withsharedkeydicts": True}
+
+    def test_share_map(self):
+        space = self.space
+        w_d1 = space.newdict()
+        w_d2 = space.newdict()
+        for w_d in [w_d1, w_d2]:
+            space.setitem_str(w_d, "a", space.newint(1))
+            space.setitem_str(w_d, "b", space.newint(2))
+        strategy = w_d1.get_strategy()
+        assert isinstance(strategy, SharedKeysDictStrategy)
+        assert w_d2.get_strategy() is strategy
+        assert strategy.get_keys_in_order() == ["a", "b"]
+        assert len(strategy.unerase(w_d1.dstorage)) == 2
+
+        w_d3 = space.newdict()
+        space.setitem_str(w_d3, "b", space.newint(2))
+        space.setitem_str(w_d3, "a", space.newint(1))
+        assert w_d3.get_strategy() is not strategy
+        assert w_d3.get_strategy().get_keys_in_order() == ["b", "a"]
+
+    def test_append_in_place(self):
+        space = self.space
+        w_d = space.newdict()
+        space.setitem_str(w_d, "a", space.newint(1))
+        values_w = w_d.get_strategy().unerase(w_d.dstorage)
+        space.setitem_str(w_d, "b", space.newint(2))
+        assert w_d.get_strategy().unerase(w_d.dstorage) is values_w
+        assert len(values_w) == 2
+
+    def test_limit_keys(self):
+        space = self.space
+        w_d = space.newdict()
+        for i in range(LIMIT_SHARED_KEYS + 1):
+            space.setitem_str(w_d, "k%d" % i, space.newint(i))
+        assert w_d.get_strategy().__class__.__name__ == "BytesDictStrategy"
+        assert space.len_w(w_d) == LIMIT_SHARED_KEYS + 1
+
+    def test_limit_maps(self, monkeypatch):
+        from pypy.objspace.std import sharedkeydict
+        space = self.space
+        maps = space.fromcache(SharedKeysMaps)
+        monkeypatch.setattr(sharedkeydict, "LIMIT_SHARED_MAPS",
+                            maps.num_maps)
+        w_d = space.newdict()
+        space.setitem_str(w_d, "never seen before", space.newint(1))
+        assert w_d.get_strategy().__class__.__name__ == "BytesDictStrategy"
+
+
+class AppTest(object):
+    spaceconfig = {"objspace.std.withsharedkeydicts": True}
+
+    def test_check_strategy(self):
+        import __pypy__
+        d = {}
+        assert __pypy__.strategy(d) == "EmptyDictStrategy"
+        d["a"] = 1
+        assert __pypy__.strategy(d) == "SharedKeysDictStrategy"
+        d = dict(zip(["x", "y"], [1, 2]))
+        assert __pypy__.strategy(d) == "SharedKeysDictStrategy"
+        d = {1: 2}
+        assert __pypy__.strategy(d) == "IntDictStrategy"
+
+    def test_simple(self):
+        import __pypy__
+        rows = [dict(zip(["a", "b", "c"], row))
+                for row in [(1, 2, 3), (4, 5, 6)]]
+        d = rows[1]
+        assert len(d) == 3
+        assert d["a"] == 4
+        assert d["c"] == 6
+        assert "x" not in d
+        assert 1 not in d
+        d["b"] = 7
+        assert d == {"a": 4, "b": 7, "c": 6}
+        assert d.keys() == ["a", "b", "c"]
+        assert d.values() == [4, 7, 6]
+        assert d.items() == [("a", 4), ("b", 7), ("c", 6)]
+        assert list(d.iteritems()) == d.items()
+        assert list(reversed(list(d))) == ["c", "b", "a"]
+        assert rows[0] == {"a": 1, "b": 2, "c": 3}
+        assert __pypy__.strategy(d) == "SharedKeysDictStrategy"
+
+    def test_copy(self):
+        import __pypy__
+        d = {"a": 1, "b": 2}
+        d2 = d.copy()
+        assert d2 == d
+        assert __pypy__.strategy(d2) == "SharedKeysDictStrategy"
+        d2["a"] = 3
+        assert d["a"] == 1
+        assert dict(d, c=3) == {"a": 1, "b": 2, "c": 3}
+
+    def test_kwargs(self):
+        def f(**kwargs):
+            return kwargs
+        d = {"a": 1, "b": 2}
+        assert f(**d) == d
+
+    def test_setdefault(self):
+        import __pypy__
+        d = {"a": 1}
+        assert d.setdefault("a", 5) == 1
+        assert d.setdefault("b", 6) == 6
+        assert d == {"a": 1, "b": 6}
+        assert __pypy__.strategy(d) == "SharedKeysDictStrategy"
+        d.setdefault(1, 2)
+        assert __pypy__.strategy(d) == "ObjectDictStrategy"
+        assert d == {"a": 1, "b": 6, 1: 2}
+
+    def test_delitem(self):
+        import __pypy__
+        d = {"a": 1, "b": 2}
+        del d["a"]
+        assert __pypy__.strategy(d) == "BytesDictStrategy"
+        assert d == {"b": 2}
+        raises(KeyError, "del d['a']")
+
+    def test_popitem(self):
+        import __pypy__
+        d = {"a": 1, "b": 2}
+        k, v = d.popitem()
+        assert __pypy__.strategy(d) == "BytesDictStrategy"
+        assert len(d) == 1
+        d[k] = v
+        assert d == {"a": 1, "b": 2}
+
+    def test_pop(self):
+        d = {"a": 1, "b": 2}
+        assert d.pop("a") == 1
+        assert d.pop("x", 5) == 5
+        assert d == {"b": 2}
+
+    def test_non_string_key(self):
+        import __pypy__
+        d = {"a": 1}
+        d[u"b"] = 2
+        assert __pypy__.strategy(d) == "ObjectDictStrategy"
+        assert d == {"a": 1, "b": 2}
+
+        class S(str):
+            pass
+        d = {"a": 1}
+        assert S("a") in d
+        d[S("b")] = 2
+        assert d == {"a": 1, "b": 2}
+
+    def test_clear(self):
+        import __pypy__
+        d = {"a": 1}
+        d.clear()
+        assert __pypy__.strategy(d) == "EmptyDictStrategy"
+        assert d == {}
@@ -0,0 +1,189 @@
+from pypy.objspace.std.slotsobject import (
+    W_ObjectObjectUserSlots, MAX_FIXED_SLOTS)
+
+
+class TestFixedSlots(object):
+    spaceconfig = {"objspace.std.withfixedslots": True}
+
+    def test_nfixedslots(self):
+        space = self.space
+        w_n = space.newint(MAX_FIXED_SLOTS + 1)
+        w_A, w_B, w_C, w_D, w_E, w_F = space.fixedview(space.appexec(
+                [w_n], """(n):
+            class A(object):
+                __slots__ = ('x', 'y')
+            class B(A):
+                __slots__ = ('z',)
+            class C(A):
+                pass
+            class D(object):
+                __slots__ = ('x', '__dict__')
+            class E(object):
+                __slots__ = tuple(['a%d' % i for i in range(n)])
+            class F(object):
+                __slots__ = ('x', '__weakref__')
+            return A, B, C, D, E, F
+        """))
+        assert w_A.nfixedslots == 2
+        assert w_B.nfixedslots == 3
+        assert w_C.nfixedslots == -1
+        assert w_D.nfixedslots == -1
+        assert w_E.nfixedslots == -1
+        assert w_F.nfixedslots == 1
+        assert space.w_object.nfixedslots == -1
+
+    def test_allocate(self):
+        space = self.space
+        w_a = space.appexec([], """():
+            class A(object):
+                __slots__ = ('x', 'y')
+            a = A()
+            a.y = 42
+            return a
+        """)
+        assert isinstance(w_a, W_ObjectObjectUserSlots)
+        assert w_a._get_mapdict_map() is None
+        assert w_a.nslots == 2
+        assert w_a._slot0 is None
+        assert space.int_w(w_a._slot1) == 42
+
+    def test_load_store_attr_cache(self):
+        space = self.space
+        w_f, w_res = space.fixedview(space.appexec([], """():
+            class A(object):
+                __slots__ = ('x', 'y')
+            def f(a, n):
+                for i in range(n):
+                    a.x = i
+                    a.y = a.x + 1
+                return a.y
+            return f, f(A(), 10)
+        """))
+        assert space.int_w(w_res) == 10
+        w_code = space.getattr(w_f, space.newtext('func_code'))
+        names = [space.text_w(w_name) for w_name in w_code.co_names_w]
+        assert w_code._mapdict_caches[names.index('x')].slotindex == 0
+        assert w_code._mapdict_caches[names.index('y')].slotindex == 1
+
+
+class AppTestFixedSlots(object):
+    spaceconfig = {"objspace.std.withfixedslots": True}
+
+    def test_strategy(self):
+        import __pypy__
+        class A(object):
+            __slots__ = ('x',)
+        class B(object):
+            __slots__ = ('x', '__dict__')
+        assert __pypy__.strategy(A()) == "W_ObjectObjectUserSlots1"
+        assert __pypy__.strategy(B()) != "W_ObjectObjectUserSlots1"
+
+    def test_slots(self):
+        class A(object):
+            __slots__ = ('x', 'y')
+        a = A()
+        raises(AttributeError, "a.x")
+        raises(AttributeError, "a.z = 1")
+        a.x = 1
+        a.y = 2
+        assert (a.x, a.y) == (1, 2)
+        del a.x
+        raises(AttributeError, "a.x")
+        raises(AttributeError, "del a.x")
+        assert a.y == 2
+        raises(AttributeError, "a.__dict__")
+
+    def test_getattr_on_empty_slot(self):
+        class A(object):
+            __slots__ = ('x',)
+            def __getattr__(self, name):
+                return name + '!'
+        def f(a):
+            return a.x
+        a = A()
+        assert f(a) == 'x!'
+        a.x = 5
+        assert f(a) == 5
+        del a.x
+        assert f(a) == 'x!'
+
+    def test_class_changes(self):
+        class A(object):
+            __slots__ = ('x',)
+        def get(a):
+            return a.x
+        def set(a, value):
+            a.x = value
+        a = A()
+        set(a, 1)
+        assert get(a) == 1
+        A.x = property(lambda self: 42, lambda self, value: None)
+        assert get(a) == 42
+        set(a, 3)
+        assert get(a) == 42
+
+    def test_setattr_getattribute(self):
+        class A(object):
+            __slots__ = ('x',)
+        class B(A):
+            __slots__ = ()
+            def __setattr__(self, name, value):
+                A.__setattr__(self, name, value * 2)
+        class C(A):
+            __slots__ = ()
+            def __getattribute__(self, name):
+                return 'C'
+        def get(a):
+            return a.x
+        def set(a, value):
+            a.x = value
+        for cls in [A, B, A, B]:
+            a = cls()
+            set(a, 5)
+            assert get(a) == (10 if cls is B else 5)
+        c = C()
+        set(c, 5)
+        assert get(c) == 'C'
+        assert A.x.__get__(c) == 5
+
+    def test_foreign_member(self):
+        class A(object):
+            __slots__ = ('x',)
+        class B(object):
+            __slots__ = ('y',)
+            x = A.x
+        def get(a):
+            return a.x
+        a = A()
+        a.x = 1
+        assert get(a) == 1
+        raises(TypeError, get, B())
+
+    def test_class_assignment(self):
+        class A(object):
+            __slots__ = ('x',)
+        class B(object):
+            __slots__ = ('x',)
+        class C(object):
+            __slots__ = ('x', 'y')
+        a = A()
+        a.x = 1
+        a.__class__ = B
+        assert type(a) is B
+        assert a.x == 1
+        raises(TypeError, "a.__class__ = C")
+
+    def test_weakref_and_del(self):
+        import weakref, gc
+        deleted = []
+        class A(object):
+            __slots__ = ('x',)
+            def __del__(self):
+                deleted.append(True)
+        a = A()
+        r = weakref.ref(a)
+        assert r() is a
+        del a
+        gc.collect(); gc.collect()
+        assert r() is None
+        assert deleted == [True]
@@ -251,6 +251,92 @@ class AppTestW_SpecialisedTupleObject:
         assert T == (N, N)
         assert (0.0, 0.0) == (-0.0, -0.0)
 
+    def test_tuple_list_strategy(self):
+        from __pypy__ import strategy
+        l = zip([1, 2, 3], [4, 5, 6])
+        assert strategy(l) == "IntIntTupleListStrategy"
+        assert len(l) == 3
+        assert l.index((2, 5)) == 1
+        assert (3, 6) in l
+        assert (3, 5) not in l
+        assert l.count((1, 4)) == 1
+        l.sort(reverse=True)
+        l.reverse()
+        assert l.pop() == (3, 6)
+        assert l.pop(0) == (1, 4)
+        assert strategy(l) == "IntIntTupleListStrategy"
+        # reading items switches to the ObjectListStrategy
+        assert l[0] == (2, 5)
+        assert strategy(l) == "ObjectListStrategy"
+        assert self.isspecialised(l[0], '_ii')
+        l = zip([1, 2, 3], [4, 5, 6])
+        assert (3.0, 6) in l
+        #
+        l = zip([3, 1, 2], [6, 4, 5])
+        l.sort(key=lambda t: t[1])
+        assert strategy(l) == "ObjectListStrategy"
+        assert l == [(1, 4), (2, 5), (3, 6)]
+        l = zip([1, 2], [3, 4])
+        assert l * 2 == l + l
+        assert l == [(1, 3), (2, 4)]
+        l = zip([1, 2], [3, 4])
+        l.append((1, "x"))
+        assert strategy(l) == "ObjectListStrategy"
+        assert l == [(1, 3), (2, 4), (1, "x")]
+        #
+        l = [(1, 2), (3, 4)]
+        assert strategy(l) == "ObjectListStrategy"
+        l = []
+        l.append((1.5, 2.5))
+        assert strategy(l) == "ObjectListStrategy"
+
+    def test_tuple_list_identity(self):
+        t = (1, 2)
+        l = [t]
+        assert l[0] is t
+        l = [t, t]
+        assert l[0] is l[1]
+        l = []
+        l.append(t)
+        l.append(t)
+        assert l[0] is t and l[1] is t
+        u = (1.5, 2.5)
+        l = [u, u]
+        assert l[0] is u and l[1] is u
+        # also for the lists built by zip()
+        l = zip([1, 2], [3, 4])
+        assert l[0] is l[0]
+        l.append(t)
+        assert l[-1] is t
+        l = zip([1, 2], [3, 4])
+        l[1] = t
+        assert l[1] is t
+        for copy in [lambda l: l[:], list, lambda l: l * 2,
+                     lambda l: l + [], sorted]:
+            l = zip([1, 2], [3, 4])
+            l2 = copy(l)
+            assert l2[0] is l[0]
+        l = zip([1, 2], [3, 4])
+        l.extend(l)
+        assert l[0] is l[2]
+        seen = []
+        l = zip([2, 1], [3, 4])
+        l.sort(key=lambda t: seen.append(t) or t)
+        assert l[0] is seen[1] and l[1] is seen[0]
+
+    def test_float_tuple_list_strategy(self):
+        from __pypy__ import strategy
+        nan = float("nan")
+        l = zip([2.5, nan, 1.5, 1.5], [1.0, 2.0, nan, -1.0])
+        assert strategy(l) == "FloatFloatTupleListStrategy"
+        assert l.index((nan, 2.0)) == 1
+        assert l.count((1.5, nan)) == 1
+        l2 = zip([2.5, nan, 1.5, 1.5], [1.0, 2.0, nan, -1.0])
+        l2.sort()
+        assert strategy(l2) == "FloatFloatTupleListStrategy"
+        assert sorted(l) == l2
+        assert zip([1.5], [2]) == [(1.5, 2)]
+        assert strategy(zip([1.5], [2])) == "ObjectListStrategy"
 
 class AppTestAll(test_tupleobject.AppTestW_TupleObject):
     spaceconfig = {"objspace.std.withspecialisedtuple": True}
@@ -0,0 +1,91 @@
+from pypy.objspace.std.test import test_bytesobject
+
+
+class AppTestStringObject(test_bytesobject.AppTestBytesObject):
+    spaceconfig = {"objspace.std.withstrbuf": True}
+
+    def setup_class(cls):
+        from pypy.objspace.std.strbufobject import MIN_BUFFER_LENGTH
+        cls.w_big = cls.space.wrap("x" * MIN_BUFFER_LENGTH)
+
+    def test_basic(self):
+        import __pypy__
+        # cannot do "Hello, " + "World!" because cpy2.5 optimises this
+        # away on AST level
+        s = "Hello, ".__add__("World!")
+        assert type(s) is str
+        assert 'W_StringBufferObject' not in __pypy__.internal_repr(s)
+        s = self.big + "!"
+        assert type(s) is str
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(s)
+
+    def test_add_twice(self):
+        x = self.big + "a"
+        y = x + "b"
+        c = x + "c"
+        assert y == self.big + "ab"
+        assert c == self.big + "ac"
+        assert x == self.big + "a"
+        assert len(y) == len(c) == len(x) + 1
+
+    def test_add(self):
+        import __pypy__
+        all = ""
+        for i in range(20):
+            all += str(i) * 100
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(all)
+        assert len(all) == 3000
+        assert all == "".join([str(i) * 100 for i in range(20)])
+
+    def test_hash(self):
+        import __pypy__
+        def join(s): return s[:len(s) // 2] + s[len(s) // 2:]
+        t = self.big + 'abc'
+        s = join(t)
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(s)
+        assert hash(s) == hash(t)
+        assert s in {t: 1}
+
+    def test_len(self):
+        s = self.big + "abc"
+        assert len(s) == len(self.big) + 3
+        s += "def"
+        assert len(s) == len(self.big) + 6
+        assert s[-6:] == "abcdef"
+
+    def test_mul(self):
+        s = self.big + "a"
+        t = s * 2
+        assert t == (self.big + "a") * 2
+
+    def test_add_strbuf(self):
+        # make three strbuf objects
+        s = self.big + 'a'
+        t = self.big + 'b'
+        u = self.big + 'c'
+
+        # add two different strbufs to the same string
+        v = u + s
+        w = u + t
+
+        # check that insanity hasn't resulted.
+        assert v == self.big + 'c' + self.big + 'a'
+        assert w == self.big + 'c' + self.big + 'b'
+        assert s + t == self.big + 'a' + self.big + 'b'
+
+    def test_add_non_string(self):
+        s = self.big + 'a'
+        assert s + u'b' == self.big + u'ab'
+        assert s + bytearray('b') == bytearray(self.big + 'ab')
+        raises(TypeError, "s + 1")
+
+    def test_methods(self):
+        s = self.big + 'a'
+        assert s.startswith(self.big)
+        assert s.count('x') == len(self.big)
+        assert s.upper() == self.big.upper() + 'A'
+        assert "%s" % s == s
+        assert "{0}".format(s) == s
+        assert str(s) is s
+        assert buffer(s)[-1] == 'a'
+        assert s.__buffer__(0) == s
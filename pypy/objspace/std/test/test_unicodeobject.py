@@ -53,6 +53,41 @@ class TestUnicodeObject:
         assert space.eq_w(w_char1, w_uni._getitem_result(space, 0))
         assert space.eq_w(w_char2, w_uni._getitem_result(space, 1))
 
+    def test_index_storage_lazy(self):
+        space = self.space
+        u = u"\xe4" * 1000
+        w_uni = space.newutf8(u.encode("utf-8"), len(u))
+        w_char = space.getitem(w_uni, space.newint(100))
+        assert space.eq_w(w_char, space.newutf8("\xc3\xa4", 1))
+        storage = w_uni._index_storage
+        assert rutf8._index_storage_entry_filled(storage, 1)
+        assert not rutf8._index_storage_entry_filled(storage, 2)
+
+    def test_slice_index_view(self):
+        from pypy.objspace.std.unicodeobject import MIN_INDEX_VIEW_LENGTH
+        space = self.space
+        u = u"x\xe4\u1234" * MIN_INDEX_VIEW_LENGTH
+        w_uni = space.newutf8(u.encode("utf-8"), len(u))
+        w_slice = space.getslice(w_uni, space.newint(5),
+                                 space.newint(len(u) - 7))
+        assert w_slice._index_storage.base == w_uni._index_storage
+        assert len(w_slice._index_storage.entries) == 0
+        w_slice2 = space.getslice(w_slice, space.newint(3),
+                                  space.newint(len(u) - 25))
+        assert w_slice2._index_storage.base == w_uni._index_storage
+        assert w_slice2._index_storage.index_ofs == 8
+        for w_s, s in [(w_slice, u[5:-7]), (w_slice2, u[8:-20])]:
+            for i in range(0, len(s), 37) + [1, 2, 3, 4, len(s) - 1]:
+                w_char = space.getitem(w_s, space.newint(i))
+                assert space.utf8_w(w_char) == s[i].encode("utf-8")
+            w_index = space.call_method(w_s, "find",
+                                        space.newutf8("\xc3\xa4x", 2),
+                                        space.newint(1000))
+            assert space.int_w(w_index) == s.find(u"\xe4x", 1000)
+        # a small slice does not keep the storage alive
+        w_small = space.getslice(w_uni, space.newint(5), space.newint(20))
+        assert not w_small._index_storage
+
 
     if HAS_HYPOTHESIS:
         @given(strategies.text(), strategies.integers(min_value=0, max_value=10),
@@ -151,6 +151,7 @@ class W_TypeObject(W_Root):
                           'weakrefable',
                           'hasdict',
                           'layout',
+                          'nfixedslots',
                           'terminator',
                           '_version_tag?',
                           'name?',
@@ -167,6 +168,10 @@ class W_TypeObject(W_Root):
     # used to cache the type's __new__ function
     w_new_function = None
 
+    # number of slots of the instances if they store them in fixed fields,
+    # see slotsobject.py; -1 if they use mapdict
+    nfixedslots = -1
+
     @dont_look_inside
     def __init__(self, space, name, bases_w, dict_w,
                  overridetypedef=None, force_new_layout=False,
@@ -191,6 +196,7 @@ class W_TypeObject(W_Root):
             layout = setup_builtin_type(self, overridetypedef)
         else:
             layout = setup_user_defined_type(self, force_new_layout)
+            self.nfixedslots = compute_nfixedslots(self, layout)
         self.layout = layout
 
         if not is_mro_purely_of_types(self.mro_w):
@@ -1221,6 +1227,17 @@ def setup_user_defined_type(w_self, force_new_layout):
     ensure_common_attributes(w_self)
     return layout
 
+def compute_nfixedslots(w_self, layout):
+    # this only depends on the instance layout, so that __class__
+    # assignment can never switch between the two kinds of instances
+    from pypy.objspace.std.objectobject import W_ObjectObject
+    from pypy.objspace.std.slotsobject import MAX_FIXED_SLOTS
+    if (w_self.space.config.objspace.std.withfixedslots and
+            layout.typedef is W_ObjectObject.typedef and
+            not w_self.hasdict and layout.nslots <= MAX_FIXED_SLOTS):
+        return layout.nslots
+    return -1
+
 def setup_builtin_type(w_self, instancetypedef):
     w_self.hasdict = instancetypedef.hasdict
     w_self.weakrefable = instancetypedef.weakrefable
@@ -33,6 +33,9 @@ __all__ = ['W_UnicodeObject', 'wrapunicode', 'plain_str2unicode',
 
 MAX_UNROLL_NEXT_CODEPOINT_POS = 4
 
+# slices at least that long of a non-ascii string reuse its index storage
+MIN_INDEX_VIEW_LENGTH = 1024
+
 @jit.elidable
 def next_codepoint_pos_dont_look_inside(utf8, p):
     return rutf8.next_codepoint_pos(utf8, p)
@@ -764,13 +767,32 @@ class W_UnicodeObject(W_Root):
             return self._unicode_sliced(space, start, stop)
 
     def _unicode_sliced(self, space, start, stop):
-        # XXX maybe some heuristic, like first slice does not create
-        #     full index, but second does?
         assert start >= 0
         assert stop >= 0
         byte_start = self._index_to_byte(start)
         byte_stop = self._index_to_byte(stop)
-        return W_UnicodeObject(self._utf8[byte_start:byte_stop], stop - start)
+        w_res = W_UnicodeObject(self._utf8[byte_start:byte_stop], stop - start)
+        if stop - start >= MIN_INDEX_VIEW_LENGTH and not w_res.is_ascii():
+            w_res._index_storage = self._make_index_view(start, byte_start,
+                                                         stop - start)
+        return w_res
+
+    @jit.dont_look_inside
+    def _make_index_view(self, start, byte_start, length):
+        """ Return a view on our index storage for our slice of 'length'
+        characters starting at the character 'start', or a null storage if
+        it would keep alive an index storage too big for it.  The storage
+        is already filled up to the end of the slice by _index_to_byte().
+        """
+        storage = self._index_storage
+        assert storage
+        if storage.base:
+            size = len(storage.base.entries)
+        else:
+            size = len(storage.entries)
+        if length < size * 8:    # less than 1/8 of the string
+            return rutf8.null_storage()
+        return rutf8.new_utf8_index_view(storage, start, byte_start)
 
     @jit.unroll_safe
     def _unicode_sliced_constant_index_jit(self, space, start, stop):
@@ -921,7 +943,8 @@ class W_UnicodeObject(W_Root):
                     W_UnicodeObject._compute_index_storage, self)
 
     def _compute_index_storage(self):
-        storage = rutf8.create_utf8_index_storage(self._utf8, self._length)
+        # the storage is filled lazily, up to the biggest index used
+        storage = rutf8.new_utf8_index_storage(self._length)
         self._index_storage = storage
         return storage
 
@@ -972,8 +995,14 @@ class W_UnicodeObject(W_Root):
         if self.is_ascii():
             assert index >= 0
             return index
-        return rutf8.codepoint_position_at_index(
-            self._utf8, self._get_index_storage(), index)
+        storage = self._get_index_storage()
+        if storage.base:
+            # a view on the storage of a bigger string
+            if index == self._length:
+                return len(self._utf8)
+            return rutf8.codepoint_position_at_index_in_slice(
+                self._utf8, storage, index)
+        return rutf8.codepoint_position_at_index(self._utf8, storage, index)
 
     def _codepoints_in_utf8(self, start, end):
         if self.is_ascii():
@@ -986,6 +1015,18 @@ class W_UnicodeObject(W_Root):
         """
         if self.is_ascii():
             return bytepos
+        storage = self._index_storage
+        if storage and storage.base:
+            # binary search using the index storage of the bigger string
+            index_min = 0
+            index_max = self._length
+            while index_min < index_max:
+                index_middle = (index_min + index_max) // 2
+                if self._index_to_byte(index_middle) < bytepos:
+                    index_min = index_middle + 1
+                else:
+                    index_max = index_middle
+            return index_min
         return rutf8.codepoint_index_at_byte_position(
             self._utf8, self._get_index_storage(), bytepos, self._len())
 
@@ -0,0 +1,89 @@
+#! /usr/bin/env python
+"""
+Byte-compiles the .py files of directory trees like 'compileall', but in
+several processes.  The compileall of the stdlib is left as in CPython 2.7,
+which has no -j option.
+
+Syntax:  parallel_compileall.py [-f] [-q] [-x regexp] [-j workers] dir...
+
+-f:         force the compilation, even if the timestamps are up-to-date
+-q:         be quiet
+-x regexp:  skip the files that match the regular expression
+-j workers: number of processes; 0 (the default) means one per CPU
+"""
+import sys, os
+import compileall
+
+
+def list_files(dir, maxlevels=10):
+    """Return the files in the tree of 'dir', in the order compileall
+    would compile them, without following symlinks to directories."""
+    try:
+        names = os.listdir(dir)
+    except os.error:
+        print "Can't list", dir
+        names = []
+    names.sort()
+    result = []
+    for name in names:
+        fullname = os.path.join(dir, name)
+        if not os.path.isdir(fullname):
+            result.append(fullname)
+        elif (maxlevels > 0 and name != os.curdir and name != os.pardir and
+              not os.path.islink(fullname)):
+            result += list_files(fullname, maxlevels - 1)
+    return result
+
+def _compile_file(args):
+    fullname, force, rx, quiet = args
+    return compileall.compile_file(fullname, None, force, rx, quiet)
+
+def compile_dirs(dirs, force=0, rx=None, quiet=0, workers=0):
+    """Byte-compile all the modules in the trees of 'dirs'.  Returns 1 if
+    they all compiled, like compileall.compile_dir().  If no process
+    can be started, the files are compiled in this one."""
+    if workers < 0:
+        raise ValueError('workers must be greater or equal to 0')
+    files = []
+    for dir in dirs:
+        files += [(fullname, force, rx, quiet)
+                  for fullname in list_files(dir)]
+    pool = None
+    if workers != 1:
+        try:
+            import multiprocessing
+            pool = multiprocessing.Pool(workers or None)
+        except (ImportError, NotImplementedError, OSError):
+            pass
+    if pool is None:
+        results = map(_compile_file, files)
+    else:
+        try:
+            results = pool.map(_compile_file, files)
+        finally:
+            pool.close()
+            pool.join()
+    return min([1] + results)
+
+def main(argv):
+    import getopt
+    try:
+        opts, args = getopt.getopt(argv, 'fqx:j:')
+        opts = dict(opts)
+        workers = int(opts.get('-j', 0))
+    except (getopt.error, ValueError), msg:
+        print msg
+        print __doc__
+        return 2
+    if not args or workers < 0:
+        print __doc__
+        return 2
+    rx = None
+    if '-x' in opts:
+        import re
+        rx = re.compile(opts['-x'])
+    success = compile_dirs(args, '-f' in opts, rx, '-q' in opts, workers)
+    return int(not success)
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,37 @@
+import py
+from pypy.tool import parallel_compileall
+
+
+def make_tree(tmpdir):
+    tmpdir.join('a.py').write('x = 1\n')
+    tmpdir.ensure('sub', dir=1).join('b.py').write('y = 2\n')
+    return [tmpdir.join('a.py'), tmpdir.join('sub', 'b.py')]
+
+def test_list_files(tmpdir):
+    make_tree(tmpdir)
+    tmpdir.join('c.txt').write('')
+    files = parallel_compileall.list_files(str(tmpdir))
+    assert files == [str(tmpdir.join('a.py')), str(tmpdir.join('c.txt')),
+                     str(tmpdir.join('sub', 'b.py'))]
+    files = parallel_compileall.list_files(str(tmpdir), maxlevels=0)
+    assert files == [str(tmpdir.join('a.py')), str(tmpdir.join('c.txt'))]
+
+def test_compile_dirs(tmpdir):
+    sources = make_tree(tmpdir)
+    py.test.raises(ValueError, parallel_compileall.compile_dirs,
+                   [str(tmpdir)], workers=-1)
+    for workers in [1, 2]:
+        assert parallel_compileall.compile_dirs([str(tmpdir)], force=1,
+                                                quiet=1, workers=workers)
+        for source in sources:
+            compiled = source.new(ext='.pyc')
+            assert compiled.check(file=1)
+            compiled.remove()
+
+def test_compile_error(tmpdir):
+    make_tree(tmpdir)
+    tmpdir.join('bad.py').write('x = (\n')
+    assert parallel_compileall.main(['-q', '-j', '2', str(tmpdir)]) == 1
+    assert tmpdir.join('a.pyc').check(file=1)
+    assert parallel_compileall.main(['-j', 'x', str(tmpdir)]) == 2
+    assert parallel_compileall.main([]) == 2
@@ -25,10 +25,13 @@ class TestARM64(LLtypeBackendTest):
     # for the individual tests see
     # ====> ../../test/runner_test.py
 
-    add_loop_instructions = 'ldr; add; cmp; b.eq; b; brk;'
+    # the loops and the bridges increment their entry counter first
+    add_loop_instructions = ('mov; (movk; )*ldr; add; str; '
+                             'ldr; add; cmp; b.eq; b; brk;')
     bridge_loop_instructions = ('ldr; mov; nop; nop; nop; '
                                 'cmp; b.ge; sub; str; mov; (movk; )*'
                                 'str; mov; (movk; )*blr; '
+                                'mov; (movk; )*ldr; add; str; '
                                 'mov; (movk; )*br; brk;')
 
     def get_cpu(self):
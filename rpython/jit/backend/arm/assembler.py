@@ -600,6 +600,7 @@ class AssemblerARM(ResOpAssembler):
         clt.frame_info = rffi.cast(jitframe.JITFRAMEINFOPTR, frame_info)
         clt.frame_info.clear() # for now
 
+        operations = self._inject_entry_counter(looptoken, operations)
         if log:
             operations = self._inject_debugging_code(looptoken, operations,
                                                      'e', looptoken.number)
@@ -688,6 +689,8 @@ class AssemblerARM(ResOpAssembler):
 
         self.setup(original_loop_token)
         #self.codemap.inherit_code_from_position(faildescr.adr_jump_offset)
+        operations = self._inject_bridge_entry_counter(original_loop_token,
+                                                       operations)
         descr_number = compute_unique_id(faildescr)
         if log:
             operations = self._inject_debugging_code(faildescr, operations,
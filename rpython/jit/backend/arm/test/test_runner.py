@@ -26,13 +26,20 @@ class TestARM(LLtypeBackendTest):
     # for the individual tests see
     # ====> ../../test/runner_test.py
 
-    add_loop_instructions = 'ldr; adds; cmp; beq; b;'
+    # the loops and the bridges increment their entry counter first
     arch_version = detect_arch_version()
     if arch_version == 7:
+        add_loop_instructions = ('movw; movt; ldr; add; str; '
+                                 'ldr; adds; cmp; beq; b;')
         bridge_loop_instructions = ('ldr; movw; nop; cmp; bge; '
                                     'push; movw; movt; push; movw; movt; '
-                                    'blx; movw; movt; bx;')
+                                    'blx; movw; movt; ldr; add; str; '
+                                    'movw; movt; bx;')
     else:
+        add_loop_instructions = ('ldr; mov; '
+                                 '[^;]+; ' # inline constant
+                                 'ldr; add; str; '
+                                 'ldr; adds; cmp; beq; b;')
         bridge_loop_instructions = ('ldr; mov; nop; nop; nop; cmp; bge; '
                                     'push; ldr; mov; '
                                     '[^;]+; ' # inline constant
@@ -40,6 +47,9 @@ class TestARM(LLtypeBackendTest):
                                     '[^;]+; ' # inline constant
                                     'blx; ldr; mov; '
                                     '[^;]+; ' # inline constant
+                                    'ldr; add; str; '
+                                    'ldr; mov; '
+                                    '[^;]+; ' # inline constant
                                     'bx;')
 
     def get_cpu(self):
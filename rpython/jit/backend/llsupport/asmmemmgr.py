@@ -18,17 +18,28 @@ class AsmMemoryManager(object):
                        num_indices      = NUM_INDICES):
         self.total_memory_allocated = r_uint(0)
         self.total_mallocs = r_uint(0)
+        self.total_memory_released = r_uint(0)
         self.large_alloc_size = large_alloc_size
         self.min_fragment = min_fragment
         self.num_indices = num_indices
         self.free_blocks = {}      # map {start: stop}
         self.free_blocks_end = {}  # map {stop: start}
         self.blocks_by_size = [[] for i in range(self.num_indices)]
+        self.large_blocks = {}     # map {start: stop} of the mmap()ed blocks
 
     def get_stats(self):
         """Returns stats for rlib.jit.jit_hooks.stats_asmmemmgr_*()."""
         return (self.total_memory_allocated, self.total_mallocs)
 
+    def get_free_stats(self):
+        """Returns (number of free blocks, size of the largest free block,
+        total memory released to the OS so far).  The free memory that is
+        not in the largest block is the fragmented part."""
+        largest = 0
+        for start, stop in self.free_blocks.items():
+            largest = max(largest, stop - start)
+        return (len(self.free_blocks), largest, self.total_memory_released)
+
     def malloc(self, minsize, maxsize):
         """Allocate executable memory, between minsize and maxsize bytes,
         and return a pair (start, stop).  Does not perform any rounding
@@ -48,7 +59,8 @@ class AsmMemoryManager(object):
         """Free a block (start, stop) returned by a previous malloc()."""
         if r_uint is not None:
             self.total_mallocs -= r_uint(stop - start)
-        self._add_free_block(start, stop)
+        start = self._add_free_block(start, stop)
+        self._release_large_blocks(start)
 
     def open_malloc(self, minsize):
         """Allocate at least minsize bytes.  Returns (start, stop)."""
@@ -61,7 +73,8 @@ class AsmMemoryManager(object):
         """Used for freeing the end of an open-allocated block of memory."""
         if stop - middle >= self.min_fragment:
             self.total_mallocs -= r_uint(stop - middle)
-            self._add_free_block(middle, stop)
+            start = self._add_free_block(middle, stop)
+            self._release_large_blocks(start)
             return True
         else:
             return False    # too small to record
@@ -79,6 +92,17 @@ class AsmMemoryManager(object):
                 rmmap.hint.pos += 0x80000000 - size
         return data
 
+    def _mmap_free(self, data, size):
+        # overridden by a test
+        ptr = rffi.cast(rmmap.PTR, data)
+        if not we_are_translated():
+            for entry in self._allocated:
+                if rffi.cast(lltype.Signed, entry[0]) == data:
+                    self._allocated.remove(entry)
+                    ptr = entry[0]
+                    break
+        rmmap.free(ptr, size)
+
     def _allocate_large_block(self, minsize):
         # Compute 'size' from 'minsize': it must be rounded up to
         # 'large_alloc_size'.  Additionally, we use the following line
@@ -89,8 +113,41 @@ class AsmMemoryManager(object):
         data = self._mmap_alloc(size)
         self.total_memory_allocated += r_uint(size)
         data = rffi.cast(lltype.Signed, data)
+        self.large_blocks[data] = data + size
         return self._add_free_block(data, data + size)
 
+    def _release_large_blocks(self, start):
+        # Called when the free block starting at 'start' grew.  If it now
+        # contains whole mmap()ed blocks, give them back to the OS, as
+        # long as at least 'large_alloc_size' bytes remain free for the
+        # next allocations; otherwise a process that keeps compiling and
+        # freeing loops would never see its memory usage go down.
+        stop = self.free_blocks[start]
+        if stop - start < self.large_alloc_size:
+            return
+        for data, data_stop in self.large_blocks.items():
+            if not (start <= data and data_stop <= stop):
+                continue
+            size = data_stop - data
+            free_memory = self.total_memory_allocated - self.total_mallocs
+            if free_memory < r_uint(size + self.large_alloc_size):
+                continue
+            self._del_free_block(start, stop)
+            if start < data:
+                self._add_free_block(start, data)
+            if data_stop < stop:
+                self._add_free_block(data_stop, stop)
+            del self.large_blocks[data]
+            self._mmap_free(data, size)
+            self.total_memory_allocated -= r_uint(size)
+            self.total_memory_released += r_uint(size)
+            # look again in what remains on both sides
+            if start < data:
+                self._release_large_blocks(start)
+            if data_stop < stop:
+                self._release_large_blocks(data_stop)
+            return
+
     def _get_index(self, length):
         i = 0
         while length > self.min_fragment:
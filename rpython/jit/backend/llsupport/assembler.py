@@ -360,6 +360,29 @@ class BaseAssembler(object):
     def get_loop_run_counters(self, index):
         return self.loop_run_counters[index]
 
+    def _inject_entry_counter(self, looptoken, operations):
+        # always count the entries of a loop, for the memory manager;
+        # unlike the debugging counters, this one is freed with the loop.
+        # Only the entries are counted, not the iterations, so that the
+        # loops themselves don't pay for it.
+        counter = lltype.malloc(rffi.SIGNEDP.TO, 1, flavor='raw',
+                                track_allocation=False)
+        counter[0] = 0
+        looptoken.compiled_loop_token.entry_counter = counter
+        c_adr = ConstInt(rffi.cast(lltype.Signed, counter))
+        return ([ResOperation(rop.INCREMENT_DEBUG_COUNTER, [c_adr])] +
+                operations)
+
+    def _inject_bridge_entry_counter(self, original_loop_token, operations):
+        # a bridge that is entered is also an entry in its loop, through
+        # a guard that failed
+        counter = original_loop_token.compiled_loop_token.entry_counter
+        if not counter:
+            return operations
+        c_adr = ConstInt(rffi.cast(lltype.Signed, counter))
+        return ([ResOperation(rop.INCREMENT_DEBUG_COUNTER, [c_adr])] +
+                operations)
+
     @specialize.argtype(1)
     def _inject_debugging_code(self, looptoken, operations, tp, number):
         if self._debug or jl.jitlog_enabled():
@@ -250,6 +250,11 @@ class AbstractLLCPU(AbstractCPU):
             compiled_loop_token.asmmemmgr_gcreftracers = None
             for tracer in tracers:
                 self.gc_ll_descr.clear_gcref_tracer(tracer)
+        if compiled_loop_token.entry_counter:
+            lltype.free(compiled_loop_token.entry_counter, flavor='raw',
+                        track_allocation=False)
+            compiled_loop_token.entry_counter = lltype.nullptr(
+                rffi.SIGNEDP.TO)
         # then free all blocks of code and raw data
         blocks = compiled_loop_token.asmmemmgr_blocks
         if blocks is not None:
@@ -260,6 +265,19 @@ class AbstractLLCPU(AbstractCPU):
                 if self.HAS_CODEMAP:
                     self.codemap.free_asm_block(rawstart, rawstop)
 
+    def get_loop_stats(self, looptoken):
+        clt = looptoken.compiled_loop_token
+        if clt is None:
+            return (-1, 0, 0)
+        entries = -1
+        if clt.entry_counter:
+            entries = clt.entry_counter[0]
+        code_size = 0
+        if clt.asmmemmgr_blocks is not None:
+            for rawstart, rawstop in clt.asmmemmgr_blocks:
+                code_size += rawstop - rawstart
+        return (entries, code_size, clt.bridges_count)
+
     def force(self, addr_of_force_token):
         frame = rffi.cast(jitframe.JITFRAMEPTR, addr_of_force_token)
         frame = frame.resolve()
@@ -92,6 +92,58 @@ def test_malloc_with_fragment():
             assert memmgr.free_blocks_end == {}
             assert memmgr.blocks_by_size == [[], [], [], [], []]
 
+def test_get_free_stats():
+    memmgr = AsmMemoryManager(min_fragment=8,
+                              num_indices=5)
+    assert memmgr.get_free_stats() == (0, 0, 0)
+    memmgr._add_free_block(10, 18)
+    memmgr._add_free_block(20, 50)
+    assert memmgr.get_free_stats() == (2, 30, 0)
+
+def test_release_large_blocks():
+    freed = []
+    class FakeAMM(AsmMemoryManager):
+        def _mmap_alloc(self, size):
+            return 0x100000 + 0x10000 * len(self.large_blocks)
+        def _mmap_free(self, data, size):
+            freed.append((data, size))
+    memmgr = FakeAMM(min_fragment=8, num_indices=5, large_alloc_size=4096)
+    blocks = [memmgr.malloc(3000, 3000) for i in range(3)]
+    assert memmgr.total_memory_allocated == 3 * 4096
+    memmgr.free(*blocks[0])
+    # the first large block is completely free, but it is kept because
+    # only 4096 - 3000 bytes would remain free otherwise
+    assert freed == []
+    memmgr.free(*blocks[1])
+    assert freed in ([(0x100000, 4096)], [(0x110000, 4096)])
+    assert memmgr.total_memory_allocated == 2 * 4096
+    assert memmgr.get_free_stats()[2] == 4096
+    memmgr.free(*blocks[2])
+    assert len(freed) == 2
+    assert memmgr.total_memory_allocated == 4096
+    assert memmgr.total_mallocs == 0
+    assert memmgr.get_free_stats() == (1, 4096, 2 * 4096)
+    # the remaining block is still used for the next allocation
+    start, stop = memmgr.malloc(100, 100)
+    assert memmgr.total_memory_allocated == 4096
+    assert memmgr.large_blocks[start] == start + 4096
+
+def test_release_adjacent_large_blocks():
+    class FakeAMM(AsmMemoryManager):
+        def _mmap_alloc(self, size):
+            # all large blocks are contiguous and merge in 'free_blocks'
+            return 0x100000 + 4096 * len(self.large_blocks)
+        def _mmap_free(self, data, size):
+            pass
+    memmgr = FakeAMM(min_fragment=8, num_indices=5, large_alloc_size=4096)
+    blocks = [memmgr.malloc(3000, 3000) for i in range(4)]
+    for block in blocks:
+        memmgr.free(*block)
+    assert memmgr.total_memory_allocated == 4096
+    assert len(memmgr.large_blocks) == 1
+    [(start, stop)] = memmgr.free_blocks.items()
+    assert memmgr.large_blocks == {start: stop}
+
 
 class TestAsmMemoryManager:
     AMMClass = AsmMemoryManager
@@ -206,6 +258,9 @@ class TestFakeAsmMemoryManager(TestAsmMemoryManager):
         def _mmap_alloc(self, size):
             assert size == 8192
             return self._pool.pop()
+        def _mmap_free(self, data, size):
+            assert size == 8192
+            self._pool.append(data)
         def _delete(self):
             pass
 
@@ -1,6 +1,6 @@
 import weakref
 from rpython.rlib.debug import debug_start, debug_print, debug_stop
-from rpython.rtyper.lltypesystem import lltype, llmemory
+from rpython.rtyper.lltypesystem import lltype, llmemory, rffi
 from rpython.rtyper.rclass import OBJECTPTR
 from rpython.jit.metainterp.history import ConstInt
 from rpython.jit.metainterp.support import ptr2int
@@ -162,6 +162,18 @@ class AbstractCPU(object):
         """
         pass
 
+    def get_loop_stats(self, looptoken):
+        """Return a tuple (entries, code_size, bridges) about the
+        compiled loop: how many times it was entered, at its start or
+        through one of its bridges, the size in bytes of the machine code
+        of the loop and its bridges, and the number of bridges.  'entries'
+        is -1 if the backend does not count them.
+        """
+        clt = looptoken.compiled_loop_token
+        if clt is None:
+            return (-1, 0, 0)
+        return (-1, 0, clt.bridges_count)
+
     def sizeof(self, S):
         raise NotImplementedError
 
@@ -292,6 +304,9 @@ class AbstractCPU(object):
 class CompiledLoopToken(object):
     asmmemmgr_blocks = None
     asmmemmgr_gcreftracers = None
+    # incremented by the machine code each time the loop or one of its
+    # bridges is entered
+    entry_counter = lltype.nullptr(rffi.SIGNEDP.TO)
 
     def __init__(self, cpu, number):
         cpu.tracker.total_compiled_loops += 1
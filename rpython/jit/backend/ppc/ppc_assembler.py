@@ -759,6 +759,7 @@ class AssemblerPPC(OpAssembler, BaseAssembler):
         clt.frame_info = rffi.cast(jitframe.JITFRAMEINFOPTR, frame_info)
         clt.frame_info.clear() # for now
 
+        operations = self._inject_entry_counter(looptoken, operations)
         if log:
             operations = self._inject_debugging_code(looptoken, operations,
                                                      'e', looptoken.number)
@@ -849,6 +850,8 @@ class AssemblerPPC(OpAssembler, BaseAssembler):
             assert len(set(inputargs)) == len(inputargs)
 
         self.setup(original_loop_token)
+        operations = self._inject_bridge_entry_counter(original_loop_token,
+                                                       operations)
         descr_number = compute_unique_id(faildescr)
         if log:
             operations = self._inject_debugging_code(faildescr, operations,
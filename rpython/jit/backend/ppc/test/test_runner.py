@@ -24,13 +24,17 @@ class TestPPC(LLtypeBackendTest):
     assert not IS_PPC_32
     load_imm_instructions = (
         "(li|lis(; ori)?)(; rldicr(; oris)?(; ori)?)?")
-    add_loop_instructions = "ld; add; cmpdi; beq-?; b;"
+    # the loops and the bridges increment their entry counter first
+    add_loop_instructions = (
+        "%s; ld; addi; std; "
+        "ld; add; cmpdi; beq-?; b;" % (load_imm_instructions,))
     bridge_loop_instructions = (
         "ld; cmpdi; bge.; "
         "li; %s; mtctr; %s; bctrl; "
+        "%s; ld; addi; std; "
         "%s; mtctr; bctr;" % (
             load_imm_instructions, load_imm_instructions,
-            load_imm_instructions))
+            load_imm_instructions, load_imm_instructions))
 
     def get_cpu(self):
         cpu = PPC_CPU(rtyper=None, stats=FakeStats())
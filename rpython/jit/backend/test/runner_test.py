@@ -196,6 +196,41 @@ class BaseBackendTest(Runner):
         res = self.cpu.get_int_value(deadframe, 0)
         assert res == 10
 
+    def test_loop_stats_count_entries(self):
+        looptoken = JitCellToken()
+        targettoken = TargetToken()
+        faildescr1 = BasicFailDescr(1)
+        loop = parse("""
+        [i0]
+        label(i0, descr=targettoken)
+        i1 = int_add(i0, 1)
+        i2 = int_le(i1, 9)
+        guard_true(i2, descr=faildescr1) [i1]
+        jump(i1, descr=targettoken)
+        """, namespace={'targettoken': targettoken,
+                        'faildescr1': faildescr1})
+        self.cpu.compile_loop(loop.inputargs, loop.operations, looptoken)
+        entries, code_size, bridges = self.cpu.get_loop_stats(looptoken)
+        if entries == -1:
+            py.test.skip("the backend does not count the entries of loops")
+        assert entries == 0
+        assert bridges == 0
+        # the iterations are not counted
+        self.cpu.execute_token(looptoken, 2)
+        assert self.cpu.get_loop_stats(looptoken)[0] == 1
+        # but the entries through a bridge are
+        bridge = parse("""
+        [i1]
+        finish(i1, descr=finaldescr)
+        """, namespace={'finaldescr': BasicFinalDescr(2)})
+        self.cpu.compile_bridge(faildescr1, bridge.inputargs,
+                                bridge.operations, looptoken)
+        deadframe = self.cpu.execute_token(looptoken, 2)
+        assert self.cpu.get_latest_descr(deadframe).identifier == 2
+        entries, code_size, bridges = self.cpu.get_loop_stats(looptoken)
+        assert entries == 1 + 2
+        assert bridges == 1
+
     def test_compile_with_holes_in_fail_args(self):
         targettoken = TargetToken()
         loop = parse("""
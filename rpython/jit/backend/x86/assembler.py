@@ -524,6 +524,7 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
         clt.frame_info = rffi.cast(jitframe.JITFRAMEINFOPTR, frame_info)
         clt.frame_info.clear() # for now
 
+        operations = self._inject_entry_counter(looptoken, operations)
         if log or self._debug:
             number = looptoken.number
             operations = self._inject_debugging_code(looptoken, operations,
@@ -627,6 +628,8 @@ class Assembler386(BaseAssembler, VectorAssemblerMixin):
             self.codemap_builder.inherit_code_from_position(
                 faildescr.adr_jump_offset)
         self.mc.force_frame_size(DEFAULT_FRAME_BYTES)
+        operations = self._inject_bridge_entry_counter(original_loop_token,
+                                                       operations)
         descr_number = compute_unique_id(faildescr)
         if log or self._debug:
             operations = self._inject_debugging_code(faildescr, operations,
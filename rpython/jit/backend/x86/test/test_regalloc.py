@@ -206,9 +206,10 @@ class TestCheckRegistersExplicitly(BaseTestCheckRegistersExplicitly):
         finish(i9)
         '''
         self.interpret(ops, [5, 6, 7, 8])
-        add1 = self.log[2]
-        op = self.log[5]
-        assert op.name == "op"
+        adds = [entry for entry in self.log
+                if entry.name == "op" and entry.args[0] == "int_add"]
+        add1 = adds[0]
+        op = adds[2]
         # make sure that the arguments of the third op are not swapped (since
         # that would break coalescing between i7 and i9)
         assert op.args[1][0] is add1.args[-1]
@@ -29,17 +29,20 @@ class TestX86(LLtypeBackendTest):
     # for the individual tests see
     # ====> ../../test/runner_test.py
 
+    # the loops and the bridges increment their entry counter first
     if WORD == 4:
-        add_loop_instructions = ('mov; '
+        add_loop_instructions = ('inc; '
+                                 'mov; '
                                  'lea; '    # a nop, for the label
                                  'add; test; je; jmp;')   # plus some padding
-        bridge_loop_instructions = 'cmp; jl; jmp;'
+        bridge_loop_instructions = 'cmp; jl; inc; jmp;'
     else:
-        add_loop_instructions = ('mov; '
+        add_loop_instructions = ('movabs; inc; '
+                                 'mov; '
                                  'nop; '    # for the label
                                  'add; test; je; jmp;')   # plus some padding
         bridge_loop_instructions = (
-            'cmp; jl; mov(abs)?; jmp;')
+            'cmp; jl; movabs; inc; mov(abs)?; jmp;')
 
     def get_cpu(self):
         cpu = CPU(rtyper=None, stats=FakeStats())
@@ -459,8 +462,8 @@ class TestX86(LLtypeBackendTest):
         debug._log = None
         #
         assert ops_offset is looptoken._x86_ops_offset
-        # 2*increment_debug_counter + ops + None
-        assert len(ops_offset) == 2 + len(loop.operations) + 1
+        # entry counter + 2*increment_debug_counter + ops + None
+        assert len(ops_offset) == 3 + len(loop.operations) + 1
         assert (ops_offset[loop.operations[0]] <=
                 ops_offset[loop.operations[1]] <=
                 ops_offset[loop.operations[2]] <=
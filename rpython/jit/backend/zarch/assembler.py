@@ -630,6 +630,7 @@ class AssemblerZARCH(BaseAssembler, OpAssembler,
         clt.frame_info = rffi.cast(jitframe.JITFRAMEINFOPTR, frame_info)
         clt.frame_info.clear() # for now
 
+        operations = self._inject_entry_counter(looptoken, operations)
         if log:
             operations = self._inject_debugging_code(looptoken, operations,
                                                      'e', looptoken.number)
@@ -710,6 +711,8 @@ class AssemblerZARCH(BaseAssembler, OpAssembler,
             assert len(set(inputargs)) == len(inputargs)
 
         self.setup(original_loop_token)
+        operations = self._inject_bridge_entry_counter(original_loop_token,
+                                                       operations)
         descr_number = compute_unique_id(faildescr)
         if log:
             operations = self._inject_debugging_code(faildescr, operations,
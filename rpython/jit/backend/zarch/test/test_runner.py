@@ -24,6 +24,10 @@ class TestZARCH(LLtypeBackendTest):
         cpu.setup_once()
         return cpu
 
-    add_loop_instructions = "lg; lgr; larl; agr; cgfi; jge; j;$"
+    # the loops and the bridges increment their entry counter first
+    add_loop_instructions = "((lgfi|iilf);( iihf;)?|lg;) lg; aghi; stg; " \
+                            "lg; lgr; larl; agr; cgfi; jge; j;$"
     bridge_loop_instructions = "lg; cgfi; jnl; lghi; " \
-                               "(lgfi|iilf);( iihf;)? (lgfi|iilf);( iihf;)? stg; basr; larl; (lgfi|iilf);( iihf;)? br;$"
+                               "(lgfi|iilf);( iihf;)? (lgfi|iilf);( iihf;)? stg; basr; larl; " \
+                               "((lgfi|iilf);( iihf;)?|lg;) lg; aghi; stg; " \
+                               "(lgfi|iilf);( iihf;)? br;$"
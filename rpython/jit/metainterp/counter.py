@@ -12,6 +12,12 @@ ENTRY = lltype.Struct('timetable_entry',
                       ('times', lltype.FixedSizeArray(rffi.FLOAT, 5)),
                       ('subhashes', lltype.FixedSizeArray(rffi.USHORT, 5)))
 
+# the warm values go with the 5 ways of every entry of the timetable
+WARMTABLE = rffi.CArray(rffi.FLOAT)
+
+# the warm values decay this many times more slowly than the time values
+WARM_DECAY_SLOWDOWN = 16
+
 
 class JitCounter:
     """A process translated with the JIT contains one prebuilt instance
@@ -66,6 +72,16 @@ class JitCounter:
     a fraction close to (but smaller than) 1.0, computed from the
     'decay' parameter.
 
+    'set_warm(warm)' sets which part of the time removed by the decay
+    is moved to the 'warm' value that goes with every time value.  The
+    warm values decay WARM_DECAY_SLOWDOWN times more slowly, and tick()
+    reports that the bound is reached when the sum of both values
+    reaches 1.0.  This is for code that runs often, but never often
+    enough to reach the threshold between two decays: the typical
+    "warm" code of a server, which would otherwise stay forever in the
+    interpreter.  The warm values are in the separate 'warmtable', which
+    is only allocated by the first set_warm(warm) with warm > 0.
+
     'install_new_cell(hash, newcell)' adds the new JitCell to the
     celltable, at the index given by 'hash' (bits 21:32).  Unlike
     the timetable, the celltable stores a linked list of JitCells
@@ -98,6 +114,13 @@ class JitCounter:
                                        flavor='raw', zero=True,
                                        track_allocation=False)
         self._nexthash = r_uint(0)
+        self.decay_by_mult = 1.0
+        #
+        # The 'warm' values, see set_warm().  The way number 'n' of the
+        # entry number 'index' has its warm value at 'index * 5 + n'.
+        self.warmtable = lltype.nullptr(WARMTABLE)
+        self.warm_enabled = False
+        self.warm_keep = 0.0
         #
         # The table of JitCell entries, recording already-compiled loops
         self.celltable = [None] * size
@@ -152,7 +175,7 @@ class JitCounter:
                                          (1 << (self.shift - 16)))
         return result
 
-    def _swap(self, p_entry, n):
+    def _swap(self, p_entry, index, n):
         if float(p_entry.times[n]) > float(p_entry.times[n + 1]):
             return n + 1
         else:
@@ -162,37 +185,56 @@ class JitCounter:
             x = p_entry.subhashes[n]
             p_entry.subhashes[n] = p_entry.subhashes[n + 1]
             p_entry.subhashes[n + 1] = x
+            if self.warm_enabled:
+                i = index * 5 + n
+                x = self.warmtable[i]
+                self.warmtable[i] = self.warmtable[i + 1]
+                self.warmtable[i + 1] = x
             return n
     _swap._always_inline_ = True
 
-    def _tick_slowpath(self, p_entry, subhash):
+    def _is_free(self, p_entry, index, n):
+        if float(p_entry.times[n]) != 0.0:
+            return False
+        return (not self.warm_enabled or
+                float(self.warmtable[index * 5 + n]) == 0.0)
+    _is_free._always_inline_ = True
+
+    def _tick_slowpath(self, p_entry, index, subhash):
         if p_entry.subhashes[1] == subhash:
-            n = self._swap(p_entry, 0)
+            n = self._swap(p_entry, index, 0)
         elif p_entry.subhashes[2] == subhash:
-            n = self._swap(p_entry, 1)
+            n = self._swap(p_entry, index, 1)
         elif p_entry.subhashes[3] == subhash:
-            n = self._swap(p_entry, 2)
+            n = self._swap(p_entry, index, 2)
         elif p_entry.subhashes[4] == subhash:
-            n = self._swap(p_entry, 3)
+            n = self._swap(p_entry, index, 3)
         else:
             n = 4
-            while n > 0 and float(p_entry.times[n - 1]) == 0.0:
+            while n > 0 and self._is_free(p_entry, index, n - 1):
                 n -= 1
             p_entry.subhashes[n] = rffi.cast(rffi.USHORT, subhash)
             p_entry.times[n] = r_singlefloat(0.0)
+            if self.warm_enabled:
+                self.warmtable[index * 5 + n] = r_singlefloat(0.0)
         return n
 
     def tick(self, hash, increment):
-        p_entry = self.timetable[self._get_index(hash)]
+        index = self._get_index(hash)
+        p_entry = self.timetable[index]
         subhash = self._get_subhash(hash)
         #
         if p_entry.subhashes[0] == subhash:
             n = 0
         else:
-            n = self._tick_slowpath(p_entry, subhash)
+            n = self._tick_slowpath(p_entry, index, subhash)
         #
         counter = float(p_entry.times[n]) + increment
-        if counter < 1.0:
+        if self.warm_enabled:
+            bound = 1.0 - float(self.warmtable[index * 5 + n])
+        else:
+            bound = 1.0
+        if counter < bound:
             p_entry.times[n] = r_singlefloat(counter)
             return False
         else:
@@ -205,15 +247,16 @@ class JitCounter:
         """Change the value stored for 'hash' to be the given 'new_fraction',
         which should be a float equal to or slightly lower than 1.0.
         """
-        p_entry = self.timetable[self._get_index(hash)]
+        index = self._get_index(hash)
+        p_entry = self.timetable[index]
         subhash = self._get_subhash(hash)
 
         # find in 'n' the index that will be overwritten: the first within
-        # range(5) that contains either the right subhash, or a null time
+        # range(5) that contains either the right subhash, or a free entry
         # (or, if there isn't any, then just n == 4 will do).
         n = 0
         while n < 4 and (p_entry.subhashes[n] != subhash and
-                         float(p_entry.times[n]) != 0.0):
+                         not self._is_free(p_entry, index, n)):
             n += 1
 
         # move one step to the right all elements [n - 1, n - 2, ..., 0],
@@ -222,19 +265,27 @@ class JitCounter:
             n -= 1
             p_entry.subhashes[n + 1] = p_entry.subhashes[n]
             p_entry.times[n + 1]     = p_entry.times[n]
+            if self.warm_enabled:
+                i = index * 5 + n
+                self.warmtable[i + 1] = self.warmtable[i]
 
         # insert the new hash at index 0.  This is a good approximation,
         # because change_current_fraction() should be used for
         # new_fraction == value close to 1.0.
         p_entry.subhashes[0] = rffi.cast(rffi.USHORT, subhash)
         p_entry.times[0]     = r_singlefloat(new_fraction)
+        if self.warm_enabled:
+            self.warmtable[index * 5] = r_singlefloat(0.0)
 
     def reset(self, hash):
-        p_entry = self.timetable[self._get_index(hash)]
+        index = self._get_index(hash)
+        p_entry = self.timetable[index]
         subhash = self._get_subhash(hash)
         for i in range(5):
             if p_entry.subhashes[i] == subhash:
                 p_entry.times[i] = r_singlefloat(0.0)
+                if self.warm_enabled:
+                    self.warmtable[index * 5 + i] = r_singlefloat(0.0)
 
     def lookup_chain(self, hash):
         return self.celltable[self._get_index(hash)]
@@ -263,6 +314,23 @@ class JitCounter:
             decay = 1000
         self.decay_by_mult = 1.0 - (decay * 0.001)
 
+    def set_warm(self, warm):
+        """Set the part of the decay that is moved to the 'warm' values,
+        from 0 (none, the default) to 1000 (all)."""
+        if warm < 0:
+            warm = 0
+        elif warm > 1000:
+            warm = 1000
+        if warm > 0 and not self.warm_enabled:
+            self._allocate_warmtable()
+            self.warm_enabled = True
+        self.warm_keep = warm * 0.001
+
+    def _allocate_warmtable(self):
+        self.warmtable = lltype.malloc(WARMTABLE, self.size * 5,
+                                       flavor='raw', zero=True,
+                                       track_allocation=False)
+
     def decay_all_counters(self):
         # Called during a minor collection by the GC, to gradually decay
         # counters that didn't reach their maximum.  Thus if a counter
@@ -275,23 +343,72 @@ class JitCounter:
         # than one loop because all counters reach the bound at the same
         # time, but where compiling all but the first one is pointless.
         p = rffi.cast(rffi.CCHARP, self.timetable)
-        pypy__decay_jit_counters(p, self.decay_by_mult, self.size)
+        if self.warm_enabled:
+            # 'warm_keep' may be 0.0 again: then the warm values only decay
+            warm_decay = (1.0 - (1.0 - self.decay_by_mult) /
+                          WARM_DECAY_SLOWDOWN)
+            pypy__decay_jit_warm_counters(p, self.warmtable,
+                                          self.decay_by_mult, self.warm_keep,
+                                          warm_decay, self.size)
+        else:
+            pypy__decay_jit_counters(p, self.decay_by_mult, self.size)
 
 
-# this function is written directly in C; gcc will optimize it using SSE
+# these functions are written directly in C; gcc will optimize them using SSE
 eci = ExternalCompilationInfo(post_include_bits=["""
-static void pypy__decay_jit_counters(char *data, double f1, long size) {
-    struct rpy_jitcnt { float times[5]; unsigned short subhashes[5]; };
+RPY_EXTERN void pypy__decay_jit_counters(char *data, double f1, long size);
+RPY_EXTERN void pypy__decay_jit_warm_counters(char *data, float *warm,
+                                              double f1, double w1,
+                                              double g1, long size);
+"""], separate_module_sources=["""
+struct rpy_jitcnt { float times[5]; unsigned short subhashes[5]; };
+
+RPY_EXTERN
+void pypy__decay_jit_counters(char *data, double f1, long size) {
+    struct rpy_jitcnt *p = (struct rpy_jitcnt *)data;
+    float f = (float)f1;
+    long i;
+    for (i=0; i<size; i++) {
+        p->times[0] *= f;
+        p->times[1] *= f;
+        p->times[2] *= f;
+        p->times[3] *= f;
+        p->times[4] *= f;
+        ++p;
+    }
+}
+
+/* Like pypy__decay_jit_counters(), but first moves the part 'w1' of what
+   the decay removes from every time value to the corresponding warm
+   value, after the warm values themselves decayed by 'g1'.  The warm
+   values that become negligible are cleared, so that their way of the
+   entry is free again. */
+#define RPY_JITCNT_WARM(k)                            \
+    x = warm[k] * g + p->times[k] * w;                \
+    warm[k] = x < 0.001f ? 0.0f : x
+
+RPY_EXTERN
+void pypy__decay_jit_warm_counters(char *data, float *warm, double f1,
+                                   double w1, double g1, long size) {
     struct rpy_jitcnt *p = (struct rpy_jitcnt *)data;
     float f = (float)f1;
+    float w = (float)((1.0 - f1) * w1);
+    float g = (float)g1;
+    float x;
     long i;
     for (i=0; i<size; i++) {
+        RPY_JITCNT_WARM(0);
+        RPY_JITCNT_WARM(1);
+        RPY_JITCNT_WARM(2);
+        RPY_JITCNT_WARM(3);
+        RPY_JITCNT_WARM(4);
         p->times[0] *= f;
         p->times[1] *= f;
         p->times[2] *= f;
         p->times[3] *= f;
         p->times[4] *= f;
         ++p;
+        warm += 5;
     }
 }
 """])
@@ -300,6 +417,12 @@ pypy__decay_jit_counters = rffi.llexternal(
     "pypy__decay_jit_counters", [rffi.CCHARP, lltype.Float, lltype.Signed],
     lltype.Void, compilation_info=eci, _nowrapper=True, sandboxsafe=True)
 
+pypy__decay_jit_warm_counters = rffi.llexternal(
+    "pypy__decay_jit_warm_counters",
+    [rffi.CCHARP, lltype.Ptr(WARMTABLE), lltype.Float, lltype.Float,
+     lltype.Float, lltype.Signed],
+    lltype.Void, compilation_info=eci, _nowrapper=True, sandboxsafe=True)
+
 
 # ____________________________________________________________
 #
@@ -315,6 +438,11 @@ class DeterministicJitCounter(JitCounter):
         self.timetable = defaultdict(make_null_entry)
         self.celltable = defaultdict(lambda: None)
 
+    def _allocate_warmtable(self):
+        "NOT_RPYTHON"
+        from collections import defaultdict
+        self.warmtable = defaultdict(lambda: r_singlefloat(0.0))
+
     def _get_index(self, hash):
         "NOT_RPYTHON"
         return hash
@@ -326,3 +454,5 @@ class DeterministicJitCounter(JitCounter):
     def _clear_all(self):
         self.timetable.clear()
         self.celltable.clear()
+        if self.warm_enabled:
+            self.warmtable.clear()
@@ -2,6 +2,7 @@ import math
 from rpython.rlib.rarithmetic import r_int64
 from rpython.rlib.debug import debug_start, debug_print, debug_stop
 from rpython.rlib.objectmodel import we_are_translated
+from rpython.rlib.rjitlog import rjitlog as jl
 
 #
 # Logic to decide which loops are old and not used any more.
@@ -19,10 +20,24 @@ from rpython.rlib.objectmodel import we_are_translated
 # 'generation' field is much smaller than the current generation, and
 # removed from the set.
 #
+# If the backend counts how many times each loop is entered, at its
+# start or through a failing guard that goes to one of its bridges, a
+# loop entered since the last check counts as used, even if it was only
+# entered from other machine code.  The iterations are not counted, as
+# the loops would pay for that.  And a loop that is not used any
+# more is removed sooner if it was entered only a few times compared to
+# its cost, which grows with the size of its machine code and its number
+# of bridges: loops that were traced and then run only once or twice
+# should not fill the memory.
+#
+
+# one unit of cost per this many bytes of machine code
+LOOP_COST_CODE_SIZE = 4096
 
 class MemoryManager(object):
 
-    def __init__(self):
+    def __init__(self, cpu=None):
+        self.cpu = cpu
         self.check_frequency = -1
         # NB. use of r_int64 to be extremely far on the safe side:
         # this is increasing by one after each loop or bridge is
@@ -68,8 +83,11 @@ class MemoryManager(object):
         debug_print("Loop tokens before:", oldtotal)
         max_generation = self.current_generation - (self.max_age-1)
         for looptoken in self.alive_loops.keys():
+            if self.cpu is not None:
+                max_generation = self._get_max_generation(looptoken)
             if (0 <= looptoken.generation < max_generation or
                 looptoken.invalidated):
+                self._log_release(looptoken)
                 del self.alive_loops[looptoken]
         newtotal = len(self.alive_loops)
         debug_print("Loop tokens freed: ", oldtotal - newtotal)
@@ -82,8 +100,29 @@ class MemoryManager(object):
             rgc.collect(); rgc.collect(); rgc.collect()
         debug_stop("jit-mem-collect")
 
+    def _get_max_generation(self, looptoken):
+        entries, code_size, bridges = self.cpu.get_loop_stats(looptoken)
+        max_age = self.max_age
+        if entries >= 0:
+            if entries != looptoken.seen_entries:
+                looptoken.seen_entries = entries
+                if looptoken.generation >= 0:
+                    looptoken.generation = self.current_generation
+            cost = 1 + bridges + code_size // LOOP_COST_CODE_SIZE
+            if entries + 1 < cost:
+                max_age = max(max_age * (entries + 1) // cost, 1)
+        return self.current_generation - (max_age-1)
+
+    def _log_release(self, looptoken):
+        if self.cpu is not None and jl.jitlog_enabled():
+            entries, code_size, bridges = self.cpu.get_loop_stats(looptoken)
+            jl.release_loop(looptoken.number, entries, code_size, bridges)
+
     def release_all_loops(self):
         debug_start("jit-mem-releaseall")
         debug_print("Loop tokens cleared:", len(self.alive_loops))
+        if jl.jitlog_enabled():
+            for looptoken in self.alive_loops.keys():
+                self._log_release(looptoken)
         self.alive_loops.clear()
         debug_stop("jit-mem-releaseall")
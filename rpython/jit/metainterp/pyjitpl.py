@@ -2469,7 +2469,7 @@ class MetaInterp(object):
 
     def blackhole_if_trace_too_long(self):
         warmrunnerstate = self.jitdriver_sd.warmstate
-        if (self.history.length() > warmrunnerstate.trace_limit or
+        if (self.history.length() > self.trace_limit or
                 self.history.trace_tag_overflow()):
             jd_sd, greenkey_of_huge_function = self.find_biggest_function()
             self.staticdata.stats.record_aborted(greenkey_of_huge_function)
@@ -2483,6 +2483,14 @@ class MetaInterp(object):
                     jd_sd = self.jitdriver_sd
                     greenkey = self.current_merge_points[0][0][:jd_sd.num_green_args]
                     warmrunnerstate.JitCell.trace_next_iteration(greenkey)
+            elif (isinstance(self.resumekey, compile.ResumeFromInterpDescr)
+                    and not self.history.trace_tag_overflow()):
+                # a loop too long by itself: allow longer traces from it
+                greenkey = self.resumekey.original_greenkey
+                if warmrunnerstate.allow_longer_trace(greenkey):
+                    self.aborted_tracing_jitdriver = self.jitdriver_sd
+                    self.aborted_tracing_greenkey = greenkey
+                    warmrunnerstate.JitCell.trace_next_iteration(greenkey)
             raise SwitchToBlackhole(Counters.ABORT_TOO_LONG)
 
     def _interpret(self):
@@ -2530,6 +2538,8 @@ class MetaInterp(object):
         num_green_args = self.jitdriver_sd.num_green_args
         original_greenkey = original_boxes[:num_green_args]
         self.resumekey = compile.ResumeFromInterpDescr(original_greenkey)
+        self.trace_limit = self.jitdriver_sd.warmstate.get_trace_limit(
+            original_greenkey)
         self.seen_loop_header_for_jdindex = -1
         try:
             self.create_empty_history()
@@ -2564,6 +2574,7 @@ class MetaInterp(object):
     def _handle_guard_failure(self, resumedescr, key, inputargs, deadframe):
         self.current_merge_points = []
         self.resumekey = resumedescr
+        self.trace_limit = self.jitdriver_sd.warmstate.trace_limit
         self.seen_loop_header_for_jdindex = -1
         if isinstance(key, compile.ResumeAtPositionDescr):
             self.seen_loop_header_for_jdindex = self.jitdriver_sd.index
@@ -43,6 +43,9 @@ def _get_jitcodes(testself, CPUClass, func, values,
         def get_location_str(self, args):
             return 'location'
 
+        def get_trace_limit(self, greenkey):
+            return self.trace_limit
+
         class JitCell:
             @staticmethod
             def get_jit_cell_at_key(greenkey):
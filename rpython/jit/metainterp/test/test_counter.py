@@ -128,3 +128,89 @@ def test_change_current_fraction():
     assert r is False
     r = jc.tick(index2hash(jc, 104), incr)
     assert r is True
+
+def test_entry_size():
+    # the entries must stay 32 bytes long, to fit two of them in a cache line
+    import ctypes
+    from rpython.jit.metainterp.counter import ENTRY
+    from rpython.rtyper.lltypesystem.ll2ctypes import get_ctypes_type
+    assert ctypes.sizeof(get_ctypes_type(ENTRY)) == 32
+
+def test_warm_off_by_default():
+    from rpython.rlib.jit import PARAMETERS
+    assert PARAMETERS['warm'] == 0
+    jc = JitCounter(size=128)
+    jc.set_warm(PARAMETERS['warm'])
+    assert not jc.warm_enabled
+
+def test_decay_all_counters():
+    jc = JitCounter(size=128)
+    jc.set_decay(500)
+    incr = jc.compute_threshold(4)
+    hash = index2hash(jc, 104)
+    jc.tick(hash, incr)
+    jc.decay_all_counters()
+    assert abs(float(jc.timetable[104].times[0]) - incr * 0.5) < 1e-6
+    jc.decay_all_counters()
+    assert abs(float(jc.timetable[104].times[0]) - incr * 0.25) < 1e-6
+
+def test_decay_keeps_warm_part():
+    jc = JitCounter(size=128)
+    jc.set_decay(500)
+    incr = jc.compute_threshold(4)
+    hash = index2hash(jc, 104)
+    # without 'warm', the decay prevents the bound from ever being reached
+    for i in range(20):
+        assert jc.tick(hash, incr) is False
+        jc.decay_all_counters()
+    # with 'warm', half of the decayed part is moved to the warm value
+    jc.reset(hash)
+    jc.set_warm(500)
+    results = []
+    for i in range(20):
+        results.append(jc.tick(hash, incr))
+        jc.decay_all_counters()
+    assert True in results
+    # reaching the bound resets the warm part too
+    n = results.index(True)
+    assert results[n + 1] is False
+
+def test_decay_warm_decays_slowly():
+    jc = JitCounter(size=128)
+    jc.set_decay(1000)
+    jc.set_warm(1000)
+    incr = jc.compute_threshold(4)
+    hash = index2hash(jc, 104)
+    jc.tick(hash, incr)
+    jc.tick(hash, incr)
+    jc.decay_all_counters()     # everything goes to 'warm'
+    assert float(jc.timetable[104].times[0]) == 0.0
+    warm = float(jc.warmtable[104 * 5])
+    assert abs(warm - 2 * incr) < 1e-6
+    # then the warm value decays 16 times more slowly than the times
+    jc.decay_all_counters()
+    assert abs(float(jc.warmtable[104 * 5]) - warm * 15 / 16) < 1e-6
+    # and it eventually goes away if the code no longer runs
+    jc.set_warm(0)
+    for i in range(200):
+        jc.decay_all_counters()
+    assert float(jc.warmtable[104 * 5]) == 0.0
+    # then its way of the entry is free again
+    assert jc.tick(index2hash(jc, 104, subhash=2), incr) is False
+    assert jc.timetable[104].subhashes[0] == 2
+
+def test_decay_warm_survives_reordering():
+    jc = JitCounter(size=128)
+    jc.set_decay(1000)
+    jc.set_warm(1000)
+    incr = jc.compute_threshold(4)
+    hash1 = index2hash(jc, 104, subhash=1)
+    hash2 = index2hash(jc, 104, subhash=2)
+    jc.tick(hash1, incr)
+    jc.tick(hash1, incr)
+    jc.tick(hash1, incr)
+    jc.decay_all_counters()     # everything goes to 'warm'
+    # 'hash2' moves ahead of 'hash1' in the entry
+    for i in range(3):
+        jc.tick(hash2, incr)
+    assert jc.tick(hash1, incr) is True
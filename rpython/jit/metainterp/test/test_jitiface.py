@@ -227,6 +227,24 @@ class JitHookInterfaceTests(object):
         self.meta_interp(main, [1, 1], inline=True)
         self.check_resops(call_assembler_n=8)
 
+    def test_jitcell_decisions(self):
+        driver = JitDriver(greens = ['s'], reds = ['i'], name='jit')
+
+        def loop(i, s):
+            while i > 0:
+                driver.jit_merge_point(i=i, s=s)
+                i -= 1
+
+        def main(s):
+            loop(30, s)
+            llcell = jit_hooks.get_jitcell_at_key("jit", s)
+            assert not jit_hooks.jitcell_dont_trace_here(llcell)
+            assert jit_hooks.jitcell_trace_limit_shift(llcell) == 0
+            jit_hooks.dont_trace_here("jit", s)
+            assert jit_hooks.jitcell_dont_trace_here(llcell)
+
+        self.meta_interp(main, [5])
+
     def test_trace_next_iteration_hash(self):
         driver = JitDriver(greens = ['s'], reds = ['i'], name="name")
         class Hashes(object):
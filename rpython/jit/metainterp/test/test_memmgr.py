@@ -21,6 +21,15 @@ from rpython.rlib import rgc
 class FakeLoopToken:
     generation = 0
     invalidated = False
+    seen_entries = 0
+    number = 0
+
+class FakeCPU:
+    def __init__(self):
+        self.loop_stats = {}
+
+    def get_loop_stats(self, looptoken):
+        return self.loop_stats.get(looptoken, (-1, 0, 0))
 
 
 class _TestMemoryManager:
@@ -79,6 +88,47 @@ class _TestMemoryManager:
                 assert tokens[i] in memmgr.alive_loops
 
 
+    def test_entered_from_machine_code(self):
+        cpu = FakeCPU()
+        memmgr = MemoryManager(cpu)
+        memmgr.set_max_age(4, 1)
+        token = FakeLoopToken()
+        memmgr.keep_loop_alive(token)
+        for i in range(10):
+            # never entered from the interpreter, but from other loops
+            cpu.loop_stats[token] = (i, 100, 0)
+            memmgr.next_generation()
+            assert memmgr.alive_loops == {token: None}
+        for i in range(10):
+            memmgr.next_generation()
+            if i < 3:
+                assert memmgr.alive_loops == {token: None}
+            else:
+                assert memmgr.alive_loops == {}
+
+    def test_cost(self):
+        cpu = FakeCPU()
+        memmgr = MemoryManager(cpu)
+        memmgr.set_max_age(8, 1)
+        cheap = FakeLoopToken()
+        big = FakeLoopToken()
+        many_bridges = FakeLoopToken()
+        cpu.loop_stats[cheap] = (1, 100, 0)
+        cpu.loop_stats[big] = (1, 6 * 4096, 1)        # cost 8
+        cpu.loop_stats[many_bridges] = (2, 100, 3)    # cost 4
+        for token in [cheap, big, many_bridges]:
+            memmgr.keep_loop_alive(token)
+        lifetimes = {}
+        for i in range(10):
+            memmgr.next_generation()
+            for token in [cheap, big, many_bridges]:
+                if token in memmgr.alive_loops:
+                    lifetimes[token] = i + 1
+        assert lifetimes[cheap] == 8
+        assert lifetimes[big] == 2
+        assert lifetimes[many_bridges] == 6
+
+
 class _TestIntegration(LLJitMixin):
     # See comments in TestMemoryManager.  To get temporarily the normal
     # behavior just rename this class to TestIntegration.
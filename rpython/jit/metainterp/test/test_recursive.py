@@ -345,6 +345,38 @@ class RecursiveTests:
         self.check_enter_count_at_most(10) # maybe
         self.check_aborted_count(6)
 
+    def test_trace_limit_growth(self):
+        myjitdriver = JitDriver(greens=[], reds=['n', 'total'])
+        @unroll_safe
+        def body(n):
+            i = 0
+            total = 0
+            while i < 20:
+                total += n ^ i
+                i += 1
+            return total
+        def loop(n):
+            total = 0
+            while n > 0:
+                myjitdriver.can_enter_jit(n=n, total=total)
+                myjitdriver.jit_merge_point(n=n, total=total)
+                total += body(n)
+                n -= 1
+            return total
+        TRACE_LIMIT = 30
+        expected = loop(100)
+        # nothing to blame but the loop itself: without growth, tracing
+        # is always aborted
+        res = self.meta_interp(loop, [100], enable_opts='',
+                               trace_limit=TRACE_LIMIT)
+        assert res == expected
+        self.check_trace_count(0)
+        res = self.meta_interp(loop, [100], enable_opts='',
+                               trace_limit=TRACE_LIMIT, trace_limit_growth=2)
+        assert res == expected
+        self.check_trace_count(1)
+        self.check_aborted_count(1)
+
     def test_trace_limit_bridge(self):
         def recursive(n):
             if n > 0:
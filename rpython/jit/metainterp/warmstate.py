@@ -137,6 +137,7 @@ JC_TRACING         = 0x01
 JC_DONT_TRACE_HERE = 0x02
 JC_TEMPORARY       = 0x04
 JC_TRACING_OCCURRED= 0x08
+JC_LONG_TRACE      = 0x10
 
 class BaseJitCell(object):
     """Subclasses of BaseJitCell are used in tandem with the single
@@ -183,8 +184,14 @@ class BaseJitCell(object):
         this particular function.  (We only set this flag when aborting
         due to a trace too long, so we use the same flag as a hint to
         also mean "please trace from here as soon as possible".)
+
+        JC_LONG_TRACE: tracing from here was aborted because the trace
+        was too long, and no inlined function was to blame.  The next
+        traces from here can be longer: 'trace_limit_shift' says how
+        many times the trace_limit is doubled.
     """
     flags = 0     # JC_xxx flags
+    trace_limit_shift = 0
     wref_procedure_token = None
     next = None
 
@@ -214,8 +221,8 @@ class BaseJitCell(object):
             return False    # don't remove JitCells with a procedure_token
         if self.flags & JC_TRACING:
             return False    # don't remove JitCells that are being traced
-        if self.flags & JC_DONT_TRACE_HERE:
-            # if we have this flag, and we *had* a procedure_token but
+        if self.flags & (JC_DONT_TRACE_HERE | JC_LONG_TRACE):
+            # if we have these flags, and we *had* a procedure_token but
             # we no longer have one, then remove me.  this prevents this
             # JitCell from being immortal.
             return self.has_seen_a_procedure_token()     # i.e. dead weakref
@@ -258,9 +265,15 @@ class WarmEnterState(object):
     def set_param_trace_limit(self, value):
         self.trace_limit = value
 
+    def set_param_trace_limit_growth(self, value):
+        self.trace_limit_growth = value
+
     def set_param_decay(self, decay):
         self.warmrunnerdesc.jitcounter.set_decay(decay)
 
+    def set_param_warm(self, warm):
+        self.warmrunnerdesc.jitcounter.set_warm(warm)
+
     def set_param_inlining(self, value):
         self.inlining = value
 
@@ -325,6 +338,31 @@ class WarmEnterState(object):
         debug_print("disabled inlining", loc)
         debug_stop("jit-disableinlining")
 
+    def allow_longer_trace(self, greenkey):
+        """Called when tracing from 'greenkey' was too long, but not
+        because of an inlined function.  Doubles the trace_limit of the
+        next traces from there, up to 'trace_limit_growth' times.
+        Returns False if the limit cannot grow any more."""
+        cell = self.JitCell.ensure_jit_cell_at_key(greenkey)
+        if cell.trace_limit_shift >= self.trace_limit_growth:
+            return False
+        cell.trace_limit_shift += 1
+        cell.flags |= JC_LONG_TRACE
+        debug_start("jit-longertrace")
+        loc = self.get_location_str(greenkey)
+        debug_print("allowed longer trace", loc, cell.trace_limit_shift)
+        debug_stop("jit-longertrace")
+        return True
+
+    def get_trace_limit(self, greenkey):
+        cell = self.JitCell.get_jit_cell_at_key(greenkey)
+        if cell is None or cell.trace_limit_shift == 0:
+            return self.trace_limit
+        shift = cell.trace_limit_shift
+        if self.trace_limit > (sys.maxint >> shift):
+            return sys.maxint
+        return self.trace_limit << shift
+
     def attach_procedure_to_interp(self, greenkey, procedure_token):
         cell = self.JitCell.ensure_jit_cell_at_key(greenkey)
         old_token = cell.get_procedure_token()
@@ -467,9 +505,10 @@ class WarmEnterState(object):
             # machine code was already compiled for these greenargs
             procedure_token = cell.get_procedure_token()
             if procedure_token is None:
-                if cell.flags & JC_DONT_TRACE_HERE:
+                if cell.flags & (JC_DONT_TRACE_HERE | JC_LONG_TRACE):
                     if not cell.has_seen_a_procedure_token():
-                        # A JC_DONT_TRACE_HERE, i.e. a non-inlinable function.
+                        # A JC_DONT_TRACE_HERE, i.e. a non-inlinable function,
+                        # or a JC_LONG_TRACE waiting to be traced again.
                         # If we never tried to trace it, try it now immediately.
                         # Otherwise, count normally.
                         if cell.flags & JC_TRACING_OCCURRED:
@@ -164,6 +164,9 @@ class GCBase(object):
         self.collect()
         return True
 
+    def assist_collect_step(self):
+        return False  # not incremental: there is never a collection to assist
+
     def malloc(self, typeid, length=0, zero=False):
         """NOT_RPYTHON
         For testing.  The interface used by the gctransformer is
@@ -223,6 +226,9 @@ class GCBase(object):
     def set_max_heap_size(self, size):
         raise NotImplementedError
 
+    def set_alloc_sample_interval(self, nbytes):
+        pass     # allocation sampling is only implemented by incminimark
+
     def trace(self, obj, callback, arg):
         """Enumerate the locations inside the given obj that can contain
         GC pointers.  For each such location, callback(pointer, arg) is
@@ -21,9 +21,14 @@ class GcHooks(object):
     def is_gc_collect_enabled(self):
         return False
 
-    def on_gc_minor(self, duration, total_memory_used, pinned_objects):
+    def is_gc_alloc_sample_enabled(self):
+        return False
+
+    def on_gc_minor(self, duration, total_memory_used, pinned_objects,
+                    nursery_size):
         """
-        Called after a minor collection
+        Called after a minor collection.  ``nursery_size`` is the size of
+        the nursery from now on, which can change if the GC resizes it.
         """
 
     def on_gc_collect_step(self, duration, oldstate, newstate):
@@ -45,13 +50,23 @@ class GcHooks(object):
         Called after a major collection is fully done
         """
 
+    def on_gc_alloc_sample(self, nbytes):
+        """
+        Called when an allocation sample is taken, see
+        rgc.set_alloc_sample_interval().  ``nbytes`` is the number of
+        bytes allocated since the previous sample.  Called from inside
+        the allocation itself: the hook must not allocate GC memory.
+        """
+
     # the fire_* methods are meant to be called from the GC are should NOT be
     # overridden
 
     @rgc.no_collect
-    def fire_gc_minor(self, duration, total_memory_used, pinned_objects):
+    def fire_gc_minor(self, duration, total_memory_used, pinned_objects,
+                      nursery_size):
         if self.is_gc_minor_enabled():
-            self.on_gc_minor(duration, total_memory_used, pinned_objects)
+            self.on_gc_minor(duration, total_memory_used, pinned_objects,
+                             nursery_size)
 
     @rgc.no_collect
     def fire_gc_collect_step(self, duration, oldstate, newstate):
@@ -68,3 +83,8 @@ class GcHooks(object):
                                arenas_count_before, arenas_count_after,
                                arenas_bytes, rawmalloc_bytes_before,
                                rawmalloc_bytes_after)
+
+    @rgc.no_collect
+    def fire_gc_alloc_sample(self, nbytes):
+        if self.is_gc_alloc_sample_enabled():
+            self.on_gc_alloc_sample(nbytes)
@@ -9,6 +9,17 @@ Environment variables can be used to fine-tune the following parameters:
  PYPY_GC_NURSERY_DEBUG   If set to non-zero, will fill nursery with garbage,
                          to help debugging.
 
+ PYPY_GC_NURSERY_MIN     Lower and upper bounds for the nursery size.  If
+ PYPY_GC_NURSERY_MAX     they allow it, the nursery is resized at runtime:
+                         it grows when few objects survive minor collections
+                         and shrinks when many of them do or when minor
+                         collections take too long.  Both default to
+                         PYPY_GC_NURSERY, i.e. the size is fixed.
+
+ PYPY_GC_NURSERY_PAUSE   Target duration of a minor collection, in
+                         milliseconds, for the resizing nursery.  Default
+                         is '5'.
+
  PYPY_GC_INCREMENT_STEP  The size of memory marked during the marking step.
                          Default is size of nursery * 2. If you mark it too high
                          your GC is not incremental at all. The minimum is set
@@ -189,6 +200,15 @@ STATE_FINALIZING = 3
 GC_STATES = ['SCANNING', 'MARKING', 'SWEEPING', 'FINALIZING']
 
 
+# Parameters of the resizing nursery (see PYPY_GC_NURSERY_MIN/MAX).  Every
+# NURSERY_ADAPT_WINDOW minor collections of a nursery that was at least
+# half full, we compare the fraction of the allocated bytes that survived
+# with these two ratios, and the average duration with the pause target.
+NURSERY_ADAPT_WINDOW = 8
+NURSERY_SURVIVAL_LOW = 0.05
+NURSERY_SURVIVAL_HIGH = 0.20
+
+
 FORWARDSTUB = lltype.GcStruct('forwarding_stub',
                               ('forw', llmemory.Address))
 FORWARDSTUBPTR = lltype.Ptr(FORWARDSTUB)
@@ -322,6 +342,27 @@ class IncrementalMiniMarkGC(MovingGCBase):
         self.nursery_top  = llmemory.NULL
         self.debug_tiny_nursery = -1
         self.debug_rotating_nurseries = lltype.nullptr(NURSARRAY)
+        #
+        # Bounds of the resizing nursery; it is fixed if they are equal.
+        # The other fields accumulate the measures of the current window
+        # of minor collections, see _adapt_nursery_size().
+        self.nursery_min_size = nursery_size
+        self.nursery_max_size = nursery_size
+        self.nursery_pause_target = 0.005
+        self.nursery_resizes = 0
+        self.nursery_adapt_count = 0
+        self.nursery_adapt_allocated = 0
+        self.nursery_adapt_surviving = 0
+        self.nursery_adapt_duration = 0.0
+        #
+        # Allocation sampling, see set_alloc_sample_interval().  While a
+        # sample point is pending inside the current nursery area,
+        # 'nursery_top' is lowered to it and the real value is saved in
+        # 'alloc_sample_saved_top'.
+        self.alloc_sample_interval = 0
+        self.alloc_sample_left = 0
+        self.alloc_sample_start = llmemory.NULL
+        self.alloc_sample_saved_top = llmemory.NULL
         self.extra_threshold = 0
         #
         # The ArenaCollection() handles the nonmovable objects allocation.
@@ -366,6 +407,12 @@ class IncrementalMiniMarkGC(MovingGCBase):
         # for more details.
         self.size_objects_made_old = r_uint(0)
         self.threshold_objects_made_old = r_uint(0)
+        #
+        # The number of major GC steps that were done in advance by
+        # assist_collect_step(), typically from a helper thread while the
+        # mutator threads were idle.  After a minor collection, the
+        # mutator uses them up instead of doing a major GC step itself.
+        self.assisted_steps_ahead = 0
 
 
     def setup(self):
@@ -444,6 +491,7 @@ class IncrementalMiniMarkGC(MovingGCBase):
             self.allocate_nursery()
             self.gc_increment_step = self.nursery_size * 4
             self.gc_nursery_debug = False
+            self.set_nursery_bounds(0, 0)
         else:
             #
             defaultsize = self.nursery_size
@@ -505,10 +553,22 @@ class IncrementalMiniMarkGC(MovingGCBase):
                 self.gc_nursery_debug = True
             else:
                 self.gc_nursery_debug = False
+            nursery_min = env.read_uint_from_env('PYPY_GC_NURSERY_MIN')
+            nursery_max = env.read_uint_from_env('PYPY_GC_NURSERY_MAX')
+            nursery_pause = env.read_float_from_env('PYPY_GC_NURSERY_PAUSE')
+            if nursery_pause > 0.0:
+                self.nursery_pause_target = nursery_pause / 1000.0
+            #
             self._minor_collection()    # to empty the nursery
             llarena.arena_free(self.nursery)
             self.nursery_size = newsize
             self.allocate_nursery()
+            try:
+                self.set_nursery_bounds(intmask(nursery_min),
+                                        intmask(nursery_max))
+            except ValueError:
+                # invalid bounds are ignored: keep the nursery size fixed
+                self.set_nursery_bounds(0, 0)
         #
         env_max_number_of_pinned_objects = os.environ.get('PYPY_GC_MAX_PINNED')
         if env_max_number_of_pinned_objects:
@@ -522,7 +582,32 @@ class IncrementalMiniMarkGC(MovingGCBase):
         else:
             # Estimate this number conservatively
             bigobj = self.nonlarge_max + 1
-            self.max_number_of_pinned_objects = self.nursery_size / (bigobj * 2)
+            self.max_number_of_pinned_objects = (self.nursery_min_size /
+                                                 (bigobj * 2))
+
+    def set_nursery_bounds(self, minsize, maxsize):
+        """Set the range within which the nursery can be resized by
+        _adapt_nursery_size().  A bound of 0 means the current size, and
+        the range always contains the current size.  Raises ValueError
+        if 'minsize' is below the smallest possible nursery, which must
+        be able to contain any non-large object."""
+        smallest = 2 * (self.nonlarge_max + 1)
+        if 0 < minsize < smallest:
+            raise ValueError
+        cursize = self.nursery_size
+        if minsize <= 0 or minsize > cursize:
+            minsize = cursize
+        if maxsize < cursize:
+            maxsize = cursize
+        minsize = max(minsize, smallest)
+        if self.debug_tiny_nursery >= 0:
+            minsize = maxsize = cursize
+        self.nursery_min_size = minsize & ~(WORD-1)
+        self.nursery_max_size = max(maxsize & ~(WORD-1), self.nursery_min_size)
+        self.nursery_adapt_count = 0
+        self.nursery_adapt_allocated = 0
+        self.nursery_adapt_surviving = 0
+        self.nursery_adapt_duration = 0.0
 
     def enable(self):
         self.enabled = True
@@ -806,6 +891,28 @@ class IncrementalMiniMarkGC(MovingGCBase):
         self.rrc_invoke_callback()
         return rgc._encode_states(old_state, self.gc_state)
 
+    def assist_collect_step(self):
+        """
+        If a major collection is in progress, do a single major collection
+        step in advance, on behalf of the mutator: the next minor collection
+        that would otherwise run one major step will skip it.  Never starts
+        a new major collection.
+
+        This is meant to be called from a helper thread while the mutator
+        threads are idle (e.g. waiting for I/O), so that the work of
+        marking and sweeping is moved out of their way.  Return True if
+        a step was done, even if it did not change the state (e.g. one of
+        the many steps of marking).
+        """
+        if self.gc_state == STATE_SCANNING or not self.enabled:
+            return False
+        self._minor_collection()
+        self.major_collection_step()
+        if self.gc_state != STATE_SCANNING:
+            self.assisted_steps_ahead += 1
+        self.rrc_invoke_callback()
+        return True
+
     def minor_collection_with_major_progress(self, extrasize=0,
                                              force_enabled=False):
         """Do a minor collection.  Then, if the GC is enabled and there
@@ -829,7 +936,11 @@ class IncrementalMiniMarkGC(MovingGCBase):
         # 'threshold_objects_made_old' by nursery_size/2.
 
         if self.gc_state != STATE_SCANNING or self.threshold_reached(extrasize):
-            self.major_collection_step(extrasize)
+            if self.gc_state != STATE_SCANNING and self.assisted_steps_ahead > 0:
+                # this step was already done by assist_collect_step()
+                self.assisted_steps_ahead -= 1
+            else:
+                self.major_collection_step(extrasize)
 
             # See documentation in major_collection_step() for target invariants
             while self.gc_state != STATE_SCANNING:    # target (A1)
@@ -854,6 +965,15 @@ class IncrementalMiniMarkGC(MovingGCBase):
         Otherwise do a minor collection, and possibly some steps of a
         major collection, and finally reserve totalsize bytes.
         """
+        if self.alloc_sample_interval > 0:
+            # 'nursery_free' already includes the new object
+            self._alloc_sample_disarm(self.nursery_free)
+            if self.alloc_sample_left <= 0:
+                self._alloc_sample_take()
+                if self.nursery_free <= self.nursery_top:
+                    # we only stopped at the sample point: the object fits
+                    self._alloc_sample_arm()
+                    return self.nursery_free - totalsize
 
         minor_collection_count = 0
         while True:
@@ -890,7 +1010,10 @@ class IncrementalMiniMarkGC(MovingGCBase):
                 pinned_obj_size = size_gc_header + self.get_size(
                         self.nursery_top + size_gc_header)
                 #
-                # update used nursery space to allocate objects
+                # update used nursery space to allocate objects.  The
+                # allocation sampling doesn't count the skipped bytes: it
+                # counted up to the new object above, and restarts from
+                # where the object ends in _alloc_sample_arm() below.
                 self.nursery_free = self.nursery_top + pinned_obj_size
                 self.nursery_top = self.nursery_barriers.popleft()
             else:
@@ -931,6 +1054,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
             if self.nursery_top - self.nursery_free > self.debug_tiny_nursery:
                 self.nursery_free = self.nursery_top - self.debug_tiny_nursery
         #
+        if self.alloc_sample_interval > 0:
+            self._alloc_sample_arm()
         return result
     collect_and_reserve._dont_inline_ = True
 
@@ -978,6 +1103,11 @@ class IncrementalMiniMarkGC(MovingGCBase):
             self.minor_collection_with_major_progress(
                 raw_malloc_usage(totalsize) + self.nursery_size // 2)
         #
+        if self.alloc_sample_interval > 0:
+            self.alloc_sample_left -= raw_malloc_usage(totalsize)
+            if self.alloc_sample_left <= 0:
+                self._alloc_sample_take()
+        #
         # Check if the object would fit in the ArenaCollection.
         # Also, an object allocated from ArenaCollection must be old.
         if (raw_malloc_usage(totalsize) <= self.small_request_threshold
@@ -1091,7 +1221,10 @@ class IncrementalMiniMarkGC(MovingGCBase):
         if self.next_major_collection_threshold < 0:
             # cannot trigger a full collection now, but we can ensure
             # that one will occur very soon
+            if self.alloc_sample_interval > 0:
+                self._alloc_sample_disarm(self.nursery_free)
             self.nursery_free = self.nursery_top
+            self.alloc_sample_start = self.nursery_free
 
     def can_optimize_clean_setarrayitems(self):
         if self.card_page_indices > 0:
@@ -1725,8 +1858,25 @@ class IncrementalMiniMarkGC(MovingGCBase):
         # '_trace_drag_out()'.
         any_pinned_object_from_earlier = self.any_pinned_object_kept
         self.pinned_objects_in_nursery = 0
+        #
+        # How much of the nursery was used since the last minor collection.
+        # 'nursery_free' is NULL if we come from collect_and_reserve(), i.e.
+        # if the nursery is full.  Unknown if there were pinned objects.
+        if any_pinned_object_from_earlier:
+            nursery_used = -1
+        elif self.nursery_free:
+            nursery_used = self.nursery_free - self.nursery
+        else:
+            nursery_used = self.nursery_size
         self.any_pinned_object_kept = False
         #
+        # For the same reason, if we come from collect_and_reserve() it
+        # already counted the sampled allocations and will arm the next
+        # sample point itself.
+        from_collect_and_reserve = not self.nursery_free
+        if self.alloc_sample_interval > 0 and not from_collect_and_reserve:
+            self._alloc_sample_disarm(self.nursery_free)
+        #
         # Before everything else, remove from 'old_objects_pointing_to_young'
         # the young arrays.
         if self.young_rawmalloced_objects:
@@ -1910,10 +2060,126 @@ class IncrementalMiniMarkGC(MovingGCBase):
         debug_stop("gc-minor")
         duration = time.time() - start
         self.total_gc_time += duration
+        if self.nursery_min_size < self.nursery_max_size:
+            self._adapt_nursery_size(nursery_used, duration)
+        if self.alloc_sample_interval > 0:
+            if from_collect_and_reserve:
+                self.alloc_sample_start = self.nursery_free
+            else:
+                self._alloc_sample_arm()
         self.hooks.fire_gc_minor(
             duration=duration,
             total_memory_used=total_memory_used,
-            pinned_objects=self.pinned_objects_in_nursery)
+            pinned_objects=self.pinned_objects_in_nursery,
+            nursery_size=self.nursery_size)
+
+    def _adapt_nursery_size(self, nursery_used, duration):
+        # Called at the end of a minor collection if the nursery is allowed
+        # to change size.  Only minor collections that found the nursery
+        # at least half full are measured.  At the end of every window of
+        # NURSERY_ADAPT_WINDOW of them:
+        #
+        #   * if many of the allocated bytes survived, or if the minor
+        #     collections took longer than 'nursery_pause_target', we
+        #     halve the nursery: the objects are long-lived anyway, so
+        #     a large nursery only costs cache misses and longer pauses;
+        #
+        #   * if very few of them survived and the minor collections are
+        #     much shorter than the target, we double it: fewer minor
+        #     collections, and more time for the objects to die young.
+        #
+        if nursery_used < self.nursery_size // 2:
+            return
+        self.nursery_adapt_count += 1
+        self.nursery_adapt_allocated += nursery_used
+        self.nursery_adapt_surviving += self.nursery_surviving_size
+        self.nursery_adapt_duration += duration
+        if self.nursery_adapt_count < NURSERY_ADAPT_WINDOW:
+            return
+        survival = (float(self.nursery_adapt_surviving) /
+                    float(self.nursery_adapt_allocated))
+        average_duration = (self.nursery_adapt_duration /
+                            self.nursery_adapt_count)
+        self.nursery_adapt_count = 0
+        self.nursery_adapt_allocated = 0
+        self.nursery_adapt_surviving = 0
+        self.nursery_adapt_duration = 0.0
+        #
+        newsize = self.nursery_size
+        if (survival > NURSERY_SURVIVAL_HIGH or
+                average_duration > self.nursery_pause_target):
+            newsize = max(newsize // 2, self.nursery_min_size)
+        elif (survival < NURSERY_SURVIVAL_LOW and
+                average_duration * 2 < self.nursery_pause_target):
+            newsize = min(newsize * 2, self.nursery_max_size)
+        newsize &= ~(WORD-1)
+        if newsize != self.nursery_size:
+            debug_start("gc-nursery-adapt")
+            debug_print("survival ratio:", survival)
+            debug_print("average minor collection:", average_duration)
+            self._resize_nursery(newsize)
+            debug_stop("gc-nursery-adapt")
+
+    def _resize_nursery(self, newsize):
+        # Replace the nursery with a new one of the given size.  Must only
+        # be called at the end of a minor collection, when the nursery is
+        # completely empty.  With PYPY_GC_DEBUG's rotating nurseries, or
+        # if pinned objects are still in the nursery, we don't resize.
+        if self.debug_rotating_nurseries:
+            return
+        if self.pinned_objects_in_nursery > 0:
+            return
+        ll_assert(not self.nursery_barriers.non_empty(),
+                  "resizing a nursery with barriers")
+        ll_assert(self.nursery_free == self.nursery,
+                  "resizing a non-empty nursery")
+        debug_print("resizing nursery from", self.nursery_size,
+                    "to", newsize)
+        llarena.arena_free(self.nursery)
+        self.nursery_size = newsize
+        self.nursery = self._alloc_nursery()
+        self.nursery_free = self.nursery
+        self.nursery_top = self.nursery + self.nursery_size
+        self.nursery_resizes += 1
+
+    def set_alloc_sample_interval(self, nbytes):
+        """Call the GC hook on_gc_alloc_sample() every time about 'nbytes'
+        more bytes have been allocated, or never if 'nbytes' is 0."""
+        if self.alloc_sample_interval > 0:
+            self._alloc_sample_disarm(self.nursery_free)
+        if nbytes < 0:
+            nbytes = 0
+        self.alloc_sample_interval = nbytes
+        self.alloc_sample_left = nbytes
+        if nbytes > 0:
+            self._alloc_sample_arm()
+
+    def _alloc_sample_arm(self):
+        # Start counting the bytes allocated from 'nursery_free'.  If the
+        # next sample is due before the end of the current nursery area,
+        # lower 'nursery_top' to that point: the next allocation that
+        # crosses it, including the ones inlined by the JIT, goes through
+        # collect_and_reserve().
+        self.alloc_sample_start = self.nursery_free
+        left = max(self.alloc_sample_left, 0)
+        if left < self.nursery_top - self.nursery_free:
+            self.alloc_sample_saved_top = self.nursery_top
+            self.nursery_top = self.nursery_free + left
+
+    def _alloc_sample_disarm(self, free):
+        # Account for the bytes allocated in the nursery between the last
+        # _alloc_sample_arm() and 'free', and restore the real 'nursery_top'.
+        if self.alloc_sample_saved_top:
+            self.nursery_top = self.alloc_sample_saved_top
+            self.alloc_sample_saved_top = llmemory.NULL
+        self.alloc_sample_left -= free - self.alloc_sample_start
+        self.alloc_sample_start = free
+
+    def _alloc_sample_take(self):
+        # The sample stands for all the bytes allocated since the last one.
+        allocated = self.alloc_sample_interval - self.alloc_sample_left
+        self.alloc_sample_left = self.alloc_sample_interval
+        self.hooks.fire_gc_alloc_sample(allocated)
 
     def _reset_flag_old_objects_pointing_to_pinned(self, obj, ignore):
         ll_assert(self.header(obj).tid & GCFLAG_PINNED_OBJECT_PARENT_KNOWN != 0,
@@ -2367,6 +2633,7 @@ class IncrementalMiniMarkGC(MovingGCBase):
             # starting a major GC cycle: reset these two counters
             self.size_objects_made_old = r_uint(0)
             self.threshold_objects_made_old = r_uint(self.nursery_size // 2)
+            self.assisted_steps_ahead = 0
 
             self.objects_to_trace = self.AddressStack()
             self.collect_roots()
@@ -3071,6 +3338,8 @@ class IncrementalMiniMarkGC(MovingGCBase):
             return intmask(self.nursery_size)
         elif stats_no == rgc.TOTAL_GC_TIME:
             return int(self.total_gc_time * 1000)
+        elif stats_no == rgc.NURSERY_RESIZES:
+            return self.nursery_resizes
         return 0
 
 
@@ -516,9 +516,18 @@ class ArenaCollection(object):
         #
         obj = llarena.getfakearenaaddress(llmemory.cast_ptr_to_adr(page))
         obj += self.hdrsize
+        firstblock = obj
         surviving = 0    # initially
         skip_free_blocks = page.nfree
         #
+        # As long as no object survives, we don't write anything into the
+        # dying objects: if the whole page dies, the caller frees it
+        # with free_page(), and the page is never dirtied.  This is the
+        # common case for pages full of short-lived objects.  When the
+        # first surviving object is found, all blocks before it are free,
+        # and we chain them with _relink_free_blocks().
+        dead_before_first_survivor = 0
+        #
         while True:
             #
             if obj == freeblock:
@@ -544,19 +553,27 @@ class ArenaCollection(object):
                 if ok_to_free_func(obj):
                     #
                     # The object should die.
-                    llarena.arena_reset(obj, _dummy_size(block_size), 0)
-                    llarena.arena_reserve(obj,
+                    if surviving == 0:
+                        # Delay: see above.
+                        dead_before_first_survivor += 1
+                    else:
+                        llarena.arena_reset(obj, _dummy_size(block_size), 0)
+                        llarena.arena_reserve(obj,
                                           llmemory.sizeof(llmemory.Address))
-                    # Insert 'obj' in the linked list of free blocks.
-                    prevfreeblockat.address[0] = obj
-                    prevfreeblockat = obj
-                    obj.address[0] = freeblock
-                    #
-                    # Update the number of free objects in the page.
-                    page.nfree += 1
+                        # Insert 'obj' in the linked list of free blocks.
+                        prevfreeblockat.address[0] = obj
+                        prevfreeblockat = obj
+                        obj.address[0] = freeblock
+                        #
+                        # Update the number of free objects in the page.
+                        page.nfree += 1
                     #
                 else:
                     # The object survives.
+                    if surviving == 0 and dead_before_first_survivor > 0:
+                        prevfreeblockat = self._relink_free_blocks(
+                            page, firstblock, obj, block_size, freeblock)
+                        page.nfree += dead_before_first_survivor
                     surviving += 1
             #
             obj += block_size
@@ -568,6 +585,24 @@ class ArenaCollection(object):
         return surviving
 
 
+    def _relink_free_blocks(self, page, start, stop, block_size, nextfree):
+        """All the blocks between 'start' and 'stop' are free (either
+        already free, or containing objects that die).  Chain them in
+        order at the start of the list of free blocks of 'page', followed
+        by 'nextfree'.  Returns the address of the last link."""
+        prevfreeblockat = lltype.direct_fieldptr(page, 'freeblock')
+        prevfreeblockat = llmemory.cast_ptr_to_adr(prevfreeblockat)
+        block = start
+        while block != stop:
+            llarena.arena_reset(block, _dummy_size(block_size), 0)
+            llarena.arena_reserve(block, llmemory.sizeof(llmemory.Address))
+            prevfreeblockat.address[0] = block
+            prevfreeblockat = block
+            block += block_size
+        prevfreeblockat.address[0] = nextfree
+        return prevfreeblockat
+
+
     def _nuninitialized(self, page, size_class):
         # Helper for debugging: count the number of uninitialized blocks
         freeblock = page.freeblock
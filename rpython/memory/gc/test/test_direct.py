@@ -844,3 +844,163 @@ class TestIncrementalMiniMarkGCFull(DirectGCTest):
             (incminimark.STATE_SWEEPING, incminimark.STATE_FINALIZING),
             (incminimark.STATE_FINALIZING, incminimark.STATE_SCANNING)
             ]
+
+    def test_assist_collect_step(self, debuglog):
+        # no major collection in progress: nothing to do
+        assert self.gc.assist_collect_step() is False
+        assert debuglog.summary() == {}
+        assert self.gc.gc_state == incminimark.STATE_SCANNING
+        #
+        self.gc.collect(1) # start a major collection
+        assert self.gc.gc_state == incminimark.STATE_MARKING
+        debuglog.reset()
+        assert self.gc.assist_collect_step() is True
+        assert self.gc.gc_state == incminimark.STATE_SWEEPING
+        assert debuglog.summary() == {'gc-minor': 1, 'gc-collect-step': 1}
+        assert self.gc.assisted_steps_ahead == 1
+        #
+        # the next minor collection uses up the step done in advance
+        debuglog.reset()
+        self.gc.minor_collection_with_major_progress()
+        assert debuglog.summary() == {'gc-minor': 1}
+        assert self.gc.assisted_steps_ahead == 0
+        assert self.gc.gc_state == incminimark.STATE_SWEEPING
+        #
+        debuglog.reset()
+        self.gc.minor_collection_with_major_progress()
+        assert debuglog.summary() == {'gc-minor': 1, 'gc-collect-step': 1}
+
+    def test_assist_collect_step_disabled(self, debuglog):
+        self.gc.collect(1) # start a major collection
+        self.gc.disable()
+        debuglog.reset()
+        assert self.gc.assist_collect_step() is False
+        assert debuglog.summary() == {}
+        self.gc.enable()
+
+    def test_assist_collect_step_many_marking_steps(self, debuglog):
+        # a chain of old objects, marked one per step
+        for i in range(5):
+            s = self.malloc(S)
+            if self.stackroots:
+                self.write(s, 'next', self.stackroots.pop())
+            self.stackroots.append(s)
+        self.gc.collect()
+        self.gc.TEST_VISIT_SINGLE_STEP = True
+        try:
+            self.gc.collect(1) # start a major collection
+            states = []
+            while self.gc.assist_collect_step():
+                states.append(self.gc.gc_state)
+                assert len(states) < 100, 'this looks like an endless loop'
+        finally:
+            del self.gc.TEST_VISIT_SINGLE_STEP
+        assert states.count(incminimark.STATE_MARKING) >= 3
+        assert states[-1] == incminimark.STATE_SCANNING
+        # nothing left to do
+        assert self.gc.assist_collect_step() is False
+
+    def fill_nursery_until_resized(self, keep):
+        resizes = self.gc.nursery_resizes
+        for i in range(100000):
+            p = self.malloc(S)
+            p.x = i
+            if keep:
+                self.stackroots.append(p)
+            if self.gc.nursery_resizes != resizes:
+                return
+        raise AssertionError("the nursery was not resized")
+
+    def test_nursery_fixed_size(self):
+        size = self.gc.nursery_size
+        assert self.gc.nursery_min_size == self.gc.nursery_max_size == size
+        for i in range(2000):
+            self.malloc(S)
+        assert self.gc.nursery_size == size
+        assert self.gc.nursery_resizes == 0
+
+    def test_nursery_grows_on_low_survival(self):
+        from rpython.rlib import rgc
+        size = self.gc.nursery_size
+        self.gc.set_nursery_bounds(0, size * 4)
+        self.gc.nursery_pause_target = 1000.0
+        self.fill_nursery_until_resized(keep=False)
+        assert self.gc.nursery_size == size * 2
+        assert self.gc.get_stats(rgc.NURSERY_SIZE) == size * 2
+        assert self.gc.get_stats(rgc.NURSERY_RESIZES) == 1
+        self.fill_nursery_until_resized(keep=False)
+        assert self.gc.nursery_size == size * 4
+        # the upper bound is reached
+        for i in range(5000):
+            self.malloc(S)
+        assert self.gc.nursery_size == size * 4
+        assert self.gc.nursery_resizes == 2
+
+    def test_nursery_shrinks_on_high_survival(self):
+        size = self.gc.nursery_size
+        self.gc.set_nursery_bounds(2 * (self.gc.nonlarge_max + 1), 0)
+        assert self.gc.nursery_min_size == 2 * (self.gc.nonlarge_max + 1)
+        self.gc.nursery_pause_target = 1000.0
+        self.fill_nursery_until_resized(keep=True)
+        assert self.gc.nursery_size == self.gc.nursery_min_size < size
+        for i in range(len(self.stackroots)):
+            assert self.stackroots[i].x == i
+        self.gc._minor_collection()
+        self.gc.debug_check_consistency()
+
+    def test_nursery_bounds_too_small(self):
+        size = self.gc.nursery_size
+        smallest = 2 * (self.gc.nonlarge_max + 1)
+        py.test.raises(ValueError, self.gc.set_nursery_bounds,
+                       smallest - 1, 0)
+        py.test.raises(ValueError, self.gc.set_nursery_bounds, 1, size * 2)
+        assert self.gc.nursery_min_size == self.gc.nursery_max_size == size
+        self.gc.set_nursery_bounds(smallest, size * 2)
+        assert self.gc.nursery_min_size == smallest
+        assert self.gc.nursery_max_size == size * 2
+
+    def test_nursery_shrinks_on_slow_minor_collections(self):
+        size = self.gc.nursery_size
+        self.gc.set_nursery_bounds(2 * (self.gc.nonlarge_max + 1), 0)
+        self.gc.nursery_pause_target = 0.0
+        self.fill_nursery_until_resized(keep=False)
+        assert self.gc.nursery_size < size
+
+    def test_alloc_sample(self):
+        from rpython.memory.gc.hook import GcHooks
+        class MyHooks(GcHooks):
+            def __init__(self):
+                self.samples = []
+            def is_gc_alloc_sample_enabled(self):
+                return True
+            def on_gc_alloc_sample(self, nbytes):
+                self.samples.append(nbytes)
+        hooks = self.gc.hooks = MyHooks()
+        before = self.gc.nursery_free
+        self.malloc(S)
+        objsize = self.gc.nursery_free - before
+        interval = objsize * 3     # less than the nursery size
+        assert interval < self.gc.nursery_size
+        self.gc.set_alloc_sample_interval(interval)
+        # enough allocations to go through several minor collections
+        count = self.gc.nursery_size // objsize * 3
+        for i in range(count):
+            self.malloc(S)
+        total = sum(hooks.samples) + (interval - self.gc.alloc_sample_left)
+        assert total == count * objsize
+        # a sample is taken by the first allocation that goes past the
+        # interval, and counts that allocation too
+        assert hooks.samples == [interval + objsize] * (count // 4)
+        #
+        # large objects are sampled too
+        del hooks.samples[:]
+        self.malloc(VAR, interval)
+        assert len(hooks.samples) == 1
+        assert hooks.samples[0] > interval
+        #
+        self.gc.set_alloc_sample_interval(0)
+        assert self.gc.nursery_top == self.gc.nursery + self.gc.nursery_size
+        del hooks.samples[:]
+        for i in range(count):
+            self.malloc(S)
+        assert hooks.samples == []
@@ -27,11 +27,13 @@ class MyGcHooks(GcHooks):
         self.collects = []
         self.durations = []
 
-    def on_gc_minor(self, duration, total_memory_used, pinned_objects):
+    def on_gc_minor(self, duration, total_memory_used, pinned_objects,
+                    nursery_size):
         self.durations.append(duration)
         self.minors.append({
             'total_memory_used': total_memory_used,
-            'pinned_objects': pinned_objects})
+            'pinned_objects': pinned_objects,
+            'nursery_size': nursery_size})
 
     def on_gc_collect_step(self, duration, oldstate, newstate):
         self.durations.append(duration)
@@ -67,8 +69,10 @@ class TestIncMiniMarkHooks(BaseDirectGCTest):
         self.gc.hooks._gc_minor_enabled = True
         self.malloc(S)
         self.gc._minor_collection()
+        nursery_size = self.gc.nursery_size
         assert self.gc.hooks.minors == [
-            {'total_memory_used': 0, 'pinned_objects': 0}
+            {'total_memory_used': 0, 'pinned_objects': 0,
+             'nursery_size': nursery_size}
             ]
         assert self.gc.hooks.durations[0] > 0.
         self.gc.hooks.reset()
@@ -78,7 +82,8 @@ class TestIncMiniMarkHooks(BaseDirectGCTest):
         self.stackroots.append(self.malloc(S))
         self.gc._minor_collection()
         assert self.gc.hooks.minors == [
-            {'total_memory_used': self.size_of_S*2, 'pinned_objects': 0}
+            {'total_memory_used': self.size_of_S*2, 'pinned_objects': 0,
+             'nursery_size': nursery_size}
             ]
 
     def test_on_gc_collect(self):
@@ -400,6 +400,55 @@ def test_mass_free_half_page_becomes_more_free():
     assert freepages(ac) == NULL
     assert ac.full_page_for_size[2] == PAGE_NULL
 
+def test_mass_free_full_page_first_objects_die():
+    pagesize = hdrsize + 9*WORD
+    ac = arena_collection_for_test(pagesize, "#", fill_with_objects=2)
+    ok_to_free = OkToFree(ac, lambda addr: (addr - ac._startpageaddr) in (
+        hdrsize + 0*WORD, hdrsize + 2*WORD, hdrsize + 6*WORD))
+    ac.mass_free(ok_to_free)
+    assert ok_to_free.seen == {hdrsize + 0*WORD: True,
+                               hdrsize + 2*WORD: True,
+                               hdrsize + 4*WORD: False,
+                               hdrsize + 6*WORD: True}
+    page = getpage(ac, 0)
+    pageaddr = pagenum(ac, 0)
+    assert page == ac.page_for_size[2]
+    assert ac._nuninitialized(page, 2) == 0
+    assert page.nfree == 3
+    fb = page.freeblock
+    assert fb == pageaddr + hdrsize + 0*WORD
+    assert fb.address[0] == pageaddr + hdrsize + 2*WORD
+    assert fb.address[0].address[0] == pageaddr + hdrsize + 6*WORD
+    assert fb.address[0].address[0].address[0] == pageaddr + hdrsize + 8*WORD
+    assert freepages(ac) == NULL
+    assert ac.full_page_for_size[2] == PAGE_NULL
+
+def test_mass_free_half_page_first_object_dies():
+    pagesize = hdrsize + 24*WORD
+    ac = arena_collection_for_test(pagesize, "/", fill_with_objects=2)
+    ok_to_free = OkToFree(ac, lambda addr: (addr - ac._startpageaddr) ==
+                                           hdrsize + 0*WORD)
+    ac.mass_free(ok_to_free)
+    assert ok_to_free.seen == {hdrsize +  0*WORD: True,
+                               hdrsize +  4*WORD: False,
+                               hdrsize +  8*WORD: False,
+                               hdrsize + 12*WORD: False}
+    page = getpage(ac, 0)
+    pageaddr = pagenum(ac, 0)
+    assert page == ac.page_for_size[2]
+    assert ac._nuninitialized(page, 2) == 4
+    assert page.nfree == 5
+    fb = page.freeblock
+    assert fb == pageaddr + hdrsize + 0*WORD
+    assert fb.address[0] == pageaddr + hdrsize + 2*WORD
+    assert fb.address[0].address[0] == pageaddr + hdrsize + 6*WORD
+    assert fb.address[0].address[0].address[0] == \
+                                       pageaddr + hdrsize + 10*WORD
+    assert fb.address[0].address[0].address[0].address[0] == \
+                                       pageaddr + hdrsize + 14*WORD
+    assert fb.address[0].address[0].address[0].address[0].address[0] == \
+                                       pageaddr + hdrsize + 16*WORD
+
 # ____________________________________________________________
 
 def test_random(incremental=False):
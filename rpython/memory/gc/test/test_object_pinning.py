@@ -1035,3 +1035,35 @@ class TestIncminimark(PinningGCTest):
 
         self.gc.DEBUG = 2
         self.gc.minor_collection()
+
+    def test_alloc_sample_skips_pinned(self):
+        from rpython.memory.gc.hook import GcHooks
+        class MyHooks(GcHooks):
+            def __init__(self):
+                self.samples = []
+            def is_gc_alloc_sample_enabled(self):
+                return True
+            def on_gc_alloc_sample(self, nbytes):
+                self.samples.append(nbytes)
+        hooks = self.gc.hooks = MyHooks()
+        # a pinned object in the middle of the nursery
+        for i in range(5):
+            self.malloc(T)
+        ptr = self.malloc(T)
+        self.stackroots.append(ptr)
+        assert self.gc.pin(llmemory.cast_ptr_to_adr(ptr))
+        self.gc.minor_collection()
+        assert self.gc.nursery_barriers.non_empty()
+        objsize = self.gc.nursery_top - self.gc.nursery_free
+        objsize //= 5
+        interval = objsize * 3
+        self.gc.set_alloc_sample_interval(interval)
+        # jumps over the pinned object in every nursery, but only the
+        # allocated bytes are counted
+        count = self.gc.nursery_size // objsize * 3
+        for i in range(count):
+            self.malloc(T)
+        self.gc._alloc_sample_disarm(self.gc.nursery_free)
+        total = sum(hooks.samples) + (interval - self.gc.alloc_sample_left)
+        assert total == count * objsize
+        assert max(hooks.samples) <= interval + objsize
@@ -311,6 +311,9 @@ class BaseFrameworkGCTransformer(GCTransformer):
             [s_gc, annmodel.SomeInteger()], annmodel.s_None)
         self.collect_step_ptr = getfn(GCClass.collect_step.im_func, [s_gc],
                                       annmodel.SomeInteger())
+        self.assist_collect_step_ptr = getfn(
+            GCClass.assist_collect_step.im_func, [s_gc],
+            annmodel.s_Bool)
         self.enable_ptr = getfn(GCClass.enable.im_func, [s_gc], annmodel.s_None)
         self.disable_ptr = getfn(GCClass.disable.im_func, [s_gc], annmodel.s_None)
         self.isenabled_ptr = getfn(GCClass.isenabled.im_func, [s_gc],
@@ -485,6 +488,10 @@ class BaseFrameworkGCTransformer(GCTransformer):
                                            [s_gc,
                                             annmodel.SomeInteger(nonneg=True)],
                                            annmodel.s_None)
+        self.set_alloc_sample_interval_ptr = getfn(
+            GCClass.set_alloc_sample_interval.im_func,
+            [s_gc, annmodel.SomeInteger()],
+            annmodel.s_None)
 
         if hasattr(GCClass, 'rawrefcount_init'):
             self.rawrefcount_init_ptr = getfn(
@@ -906,6 +913,14 @@ class BaseFrameworkGCTransformer(GCTransformer):
                   resultvar=op.result)
         self.pop_roots(hop, livevars)
 
+    def gct_gc__assist_collect_step(self, hop):
+        op = hop.spaceop
+        livevars = self.push_roots(hop)
+        hop.genop("direct_call", [self.assist_collect_step_ptr,
+                                  self.c_const_gc],
+                  resultvar=op.result)
+        self.pop_roots(hop, livevars)
+
     def gct_gc__enable(self, hop):
         op = hop.spaceop
         hop.genop("direct_call", [self.enable_ptr, self.c_const_gc],
@@ -1203,6 +1218,12 @@ class BaseFrameworkGCTransformer(GCTransformer):
                                   self.c_const_gc,
                                   v_size])
 
+    def gct_gc_set_alloc_sample_interval(self, hop):
+        [v_nbytes] = hop.spaceop.args
+        hop.genop("direct_call", [self.set_alloc_sample_interval_ptr,
+                                  self.c_const_gc,
+                                  v_nbytes])
+
     def gct_gc_pin(self, hop):
         if not hasattr(self, 'pin_ptr'):
             c_false = rmodel.inputconst(lltype.Bool, False)
@@ -550,7 +550,12 @@ PARAMETER_DOCS = {
     'function_threshold': 'number of times a function must run for it to become traced from start',
     'trace_eagerness': 'number of times a guard has to fail before we start compiling a bridge',
     'decay': 'amount to regularly decay counters by (0=none, 1000=max)',
+    'warm': 'part of the decay kept in slowly decaying counters, so that '
+            'code which runs often in total becomes hot (0=off, 1000=all)',
     'trace_limit': 'number of recorded operations before we abort tracing with ABORT_TOO_LONG',
+    'trace_limit_growth': 'how many times trace_limit can double for a loop '
+                          'that is too long by itself, without an inlined '
+                          'function to blame',
     'inlining': 'inline python functions or not (1/0)',
     'loop_longevity': 'a parameter controlling how long loops will be kept before being freed, an estimate',
     'retrace_limit': 'how many times we can try retracing before giving up',
@@ -571,7 +576,9 @@ PARAMETERS = {'threshold': 1039, # just above 1024, prime
               'function_threshold': 1619, # slightly more than one above, also prime
               'trace_eagerness': 200,
               'decay': 40,
+              'warm': 0,
               'trace_limit': 6000,
+              'trace_limit_growth': 2,
               'inlining': 1,
               'loop_longevity': 1000,
               'retrace_limit': 0,
@@ -120,6 +120,26 @@ LOOP_RUN_CONTAINER = lltype.GcArray(lltype.Struct('elem',
 def stats_get_loop_run_times(warmrunnerdesc):
     return warmrunnerdesc.metainterp_sd.cpu.get_all_loop_runs()
 
+LOOP_STATS_CONTAINER = lltype.GcArray(lltype.Struct('loopstats',
+                                                    ('number', lltype.Signed),
+                                                    ('entries', lltype.Signed),
+                                                    ('code_size', lltype.Signed),
+                                                    ('bridges', lltype.Signed)))
+
+@register_helper(lltype.Ptr(LOOP_STATS_CONTAINER))
+def stats_get_loop_stats(warmrunnerdesc):
+    cpu = warmrunnerdesc.metainterp_sd.cpu
+    looptokens = warmrunnerdesc.memory_manager.alive_loops.keys()
+    l = lltype.malloc(LOOP_STATS_CONTAINER, len(looptokens))
+    for i in range(len(looptokens)):
+        looptoken = looptokens[i]
+        entries, code_size, bridges = cpu.get_loop_stats(looptoken)
+        l[i].number = looptoken.number
+        l[i].entries = entries
+        l[i].code_size = code_size
+        l[i].bridges = bridges
+    return l
+
 @register_helper(annmodel.SomeInteger(unsigned=True))
 def stats_asmmemmgr_allocated(warmrunnerdesc):
     return warmrunnerdesc.metainterp_sd.cpu.asmmemmgr.get_stats()[0]
@@ -128,6 +148,18 @@ def stats_asmmemmgr_allocated(warmrunnerdesc):
 def stats_asmmemmgr_used(warmrunnerdesc):
     return warmrunnerdesc.metainterp_sd.cpu.asmmemmgr.get_stats()[1]
 
+@register_helper(annmodel.SomeInteger())
+def stats_asmmemmgr_free_blocks(warmrunnerdesc):
+    return warmrunnerdesc.metainterp_sd.cpu.asmmemmgr.get_free_stats()[0]
+
+@register_helper(annmodel.SomeInteger())
+def stats_asmmemmgr_largest_free(warmrunnerdesc):
+    return warmrunnerdesc.metainterp_sd.cpu.asmmemmgr.get_free_stats()[1]
+
+@register_helper(annmodel.SomeInteger(unsigned=True))
+def stats_asmmemmgr_released(warmrunnerdesc):
+    return warmrunnerdesc.metainterp_sd.cpu.asmmemmgr.get_free_stats()[2]
+
 @register_helper(None)
 def stats_memmgr_release_all(warmrunnerdesc):
     warmrunnerdesc.memory_manager.release_all_loops()
@@ -161,3 +193,16 @@ get_jitcell_at_key = _new_hook('get_jitcell_at_key', SomePtr(llmemory.GCREF))
 trace_next_iteration = _new_hook('trace_next_iteration', None)
 dont_trace_here = _new_hook('dont_trace_here', None)
 trace_next_iteration_hash = _new_hook('trace_next_iteration_hash', None)
+
+def _cast_to_jitcell(llcell):
+    from rpython.jit.metainterp.warmstate import BaseJitCell
+    return cast_gcref_to_instance(BaseJitCell, llcell)
+
+@register_helper(annmodel.SomeBool())
+def jitcell_dont_trace_here(llcell):
+    from rpython.jit.metainterp.warmstate import JC_DONT_TRACE_HERE
+    return bool(_cast_to_jitcell(llcell).flags & JC_DONT_TRACE_HERE)
+
+@register_helper(annmodel.SomeInteger())
+def jitcell_trace_limit_shift(llcell):
+    return _cast_to_jitcell(llcell).trace_limit_shift
@@ -30,6 +30,18 @@ def collect_step():
     gc.collect()
     return _encode_states(1, 0)
 
+def assist_collect_step():
+    """
+    If the GC is incremental and a major collection is in progress, run a
+    single gc-collect-step on behalf of the mutator.  The mutator then
+    skips one of the steps it would otherwise do after its next minor
+    collections.  Meant to be called from a helper thread while the other
+    threads are idle.  Never starts a new major collection.
+
+    Returns True if a step was done.
+    """
+    return False
+
 def _encode_states(oldstate, newstate):
     return oldstate << 8 | newstate
 
@@ -63,6 +75,13 @@ def set_max_heap_size(nbytes):
     """
     pass
 
+def set_alloc_sample_interval(nbytes):
+    """Ask the GC to call the on_gc_alloc_sample() hook every time about
+    'nbytes' more bytes have been allocated.  0 disables the sampling.
+    Only implemented by incminimark; ignored by the other GCs.
+    """
+    pass
+
 def must_split_gc_address_space():
     """Returns True if we have a "split GC address space", i.e. if
     we are translating with an option that doesn't support taking raw
@@ -213,6 +232,19 @@ class CollectStepEntry(ExtRegistryEntry):
         return hop.genop('gc__collect_step', hop.args_v, resulttype=hop.r_result)
 
 
+class AssistCollectStepEntry(ExtRegistryEntry):
+    _about_ = assist_collect_step
+
+    def compute_result_annotation(self):
+        from rpython.annotator import model as annmodel
+        return annmodel.s_Bool
+
+    def specialize_call(self, hop):
+        hop.exception_cannot_occur()
+        return hop.genop('gc__assist_collect_step', hop.args_v,
+                         resulttype=hop.r_result)
+
+
 class SetMaxHeapSizeEntry(ExtRegistryEntry):
     _about_ = set_max_heap_size
 
@@ -226,6 +258,20 @@ class SetMaxHeapSizeEntry(ExtRegistryEntry):
         return hop.genop('gc_set_max_heap_size', [v_nbytes],
                          resulttype=lltype.Void)
 
+
+class SetAllocSampleIntervalEntry(ExtRegistryEntry):
+    _about_ = set_alloc_sample_interval
+
+    def compute_result_annotation(self, s_nbytes):
+        from rpython.annotator import model as annmodel
+        return annmodel.s_None
+
+    def specialize_call(self, hop):
+        [v_nbytes] = hop.inputargs(lltype.Signed)
+        hop.exception_cannot_occur()
+        return hop.genop('gc_set_alloc_sample_interval', [v_nbytes],
+                         resulttype=lltype.Void)
+
 def can_move(p):
     """Check if the GC object 'p' is at an address that can move.
     Must not be called with None.  With non-moving GCs, it is always False.
@@ -845,7 +891,7 @@ def cast_gcref_to_int(gcref):
 (TOTAL_MEMORY, TOTAL_ALLOCATED_MEMORY, TOTAL_MEMORY_PRESSURE,
  PEAK_MEMORY, PEAK_ALLOCATED_MEMORY, TOTAL_ARENA_MEMORY,
  TOTAL_RAWMALLOCED_MEMORY, PEAK_ARENA_MEMORY, PEAK_RAWMALLOCED_MEMORY,
- NURSERY_SIZE, TOTAL_GC_TIME) = range(11)
+ NURSERY_SIZE, TOTAL_GC_TIME, NURSERY_RESIZES) = range(12)
 
 @not_rpython
 def get_stats(stat_no):
@@ -215,7 +215,12 @@ def returns(*args):
         return method
     return decor
 
-JITLOG_VERSION = 4
+# Readers must reject the versions that they don't know about.  Changes:
+#   5: the new mark RELEASE_LOOP, followed by the loop number (addr), the
+#      number of entries (le 64 bit, -1 if unknown), the size of the machine
+#      code (addr) and the number of bridges (addr).  Nothing else changed,
+#      so a reader of version 4 only needs to skip these records.
+JITLOG_VERSION = 5
 JITLOG_VERSION_16BIT_LE = struct.pack("<H", JITLOG_VERSION)
 
 marks = [
@@ -249,6 +254,8 @@ marks = [
     ('SOURCE_CODE',),
     ('REDIRECT_ASSEMBLER',),
     ('TMP_CALLBACK',),
+    # a loop was released by the memory manager
+    ('RELEASE_LOOP',),
 ]
 
 start = 0x11
@@ -315,6 +322,16 @@ def _log_jit_counter(struct):
     content = ''.join(list)
     jitlog_write_marked(content, len(content))
 
+def release_loop(number, entries, code_size, bridges):
+    if not jitlog_enabled():
+        return
+    # entries is -1 if the backend does not count them
+    list = [MARK_RELEASE_LOOP, encode_le_addr(number),
+            encode_le_64bit(entries), encode_le_addr(code_size),
+            encode_le_addr(bridges)]
+    content = ''.join(list)
+    jitlog_write_marked(content, len(content))
+
 def redirect_assembler(oldtoken, newtoken, asm_adr):
     if not jitlog_enabled():
         return
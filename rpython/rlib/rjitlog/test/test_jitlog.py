@@ -151,3 +151,17 @@ class TestLogger(object):
               jl.encode_le_addr(new_id_looptoken) + \
               jl.encode_le_addr(newlooptoken._ll_function_addr)
         assert binary.endswith(end)
+
+    def test_release_loop(self, tmpdir):
+        file = tmpdir.join('binary_file')
+        file.ensure()
+        rfile = create_file(str(file), 'wb')
+        with SuppressIPH():
+            jl.jitlog_init(rfile.fileno())
+            jl.release_loop(7, 12, 4096, 2)
+            rfile.close()
+        binary = file.read()
+        assert binary.endswith(jl.MARK_RELEASE_LOOP + jl.encode_le_addr(7) +
+                               jl.encode_le_64bit(12) +
+                               jl.encode_le_addr(4096) +
+                               jl.encode_le_addr(2))
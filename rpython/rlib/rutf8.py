@@ -505,44 +505,127 @@ def surrogate_in_utf8(utf8):
     return -1
 
 
-UTF8_INDEX_STORAGE = lltype.GcArray(lltype.Struct('utf8_loc_elem',
-        ('baseindex', lltype.Signed),
-        ('ofs', lltype.FixedSizeArray(lltype.Char, 16)),
-    ))
+UTF8_INDEX_STORAGE = lltype.GcForwardReference()
+UTF8_INDEX_STORAGE.become(lltype.GcStruct('utf8_index_storage',
+        ('base', lltype.Ptr(UTF8_INDEX_STORAGE)),
+        ('index_ofs', lltype.Signed),
+        ('bytes_ofs', lltype.Signed),
+        ('entries', lltype.Array(lltype.Struct('utf8_loc_elem',
+            ('baseindex', lltype.Signed),
+            ('ofs', lltype.FixedSizeArray(lltype.Char, 16)),
+        )))))
+# The storage is made of one entry per 64 characters.  It is filled lazily:
+# the entries that are already computed are always a prefix of the array,
+# and an entry that is not computed yet has ofs[0] == '\x00' (a computed
+# ofs[0] is the length of at least one codepoint).
+# A view has no entries: it is the storage of a slice, which uses the
+# storage 'base' of the bigger string, from the character 'index_ofs', i.e.
+# the byte 'bytes_ofs'.
 
 def null_storage():
     return lltype.nullptr(UTF8_INDEX_STORAGE)
 
+@jit.dont_look_inside
+def new_utf8_index_storage(utf8len):
+    """ Create an empty index storage for a utf8 encoded unicode string of
+    utf8len characters.  It is filled on demand by the functions below.
+    """
+    return lltype.malloc(UTF8_INDEX_STORAGE, utf8len // 64 + 1, zero=True)
+
+@jit.dont_look_inside
+def new_utf8_index_view(storage, index_ofs, bytes_ofs):
+    """ Create a view on 'storage' for the slice that starts at the
+    character 'index_ofs', i.e. at the byte 'bytes_ofs'.  The storage must
+    already be filled up to the end of the slice.
+    """
+    if storage.base:
+        index_ofs += storage.index_ofs
+        bytes_ofs += storage.bytes_ofs
+        storage = storage.base
+    view = lltype.malloc(UTF8_INDEX_STORAGE, 0)
+    view.base = storage
+    view.index_ofs = index_ofs
+    view.bytes_ofs = bytes_ofs
+    return view
+
+@jit.dont_look_inside
 def create_utf8_index_storage(utf8, utf8len):
     """ Create an index storage which stores index of each 4th character
     in utf8 encoded unicode string.
     """
-    arraysize = utf8len // 64 + 1
-    storage = lltype.malloc(UTF8_INDEX_STORAGE, arraysize)
-    baseindex = 0
+    storage = new_utf8_index_storage(utf8len)
+    _fill_utf8_index_storage(utf8, storage, len(storage.entries) - 1)
+    return storage
+
+def _index_storage_entry_filled(storage, current):
+    return storage.entries[current].ofs[0] != '\x00'
+
+def _next_pos_in_index_storage(utf8, pos):
+    if pos >= len(utf8):
+        return pos + 1       # assume there are extra '\x00' characters
+    return next_codepoint_pos(utf8, pos)
+
+def _fill_utf8_index_storage(utf8, storage, upto):
+    """ Fill all the entries of the storage up to 'upto' included. """
+    # binary search for the first entry that is not filled yet
     current = 0
+    index_max = upto + 1
+    while current < index_max:
+        index_middle = (current + index_max) // 2
+        if _index_storage_entry_filled(storage, index_middle):
+            current = index_middle + 1
+        else:
+            index_max = index_middle
+    if current > upto:
+        return
+    if current == 0:
+        baseindex = 0
+    else:
+        # the character just after the last one stored in the previous entry
+        baseindex = (storage.entries[current - 1].baseindex +
+                     ord(storage.entries[current - 1].ofs[15]))
+        for i in range(3):
+            baseindex = _next_pos_in_index_storage(utf8, baseindex)
     while True:
-        storage[current].baseindex = baseindex
+        # store the position of the characters 1, 5, 9, ..., 61 of the
+        # entry, relative to the position of its character 0
+        storage.entries[current].baseindex = baseindex
         next = baseindex
         for i in range(16):
-            if utf8len == 0:
-                next += 1      # assume there is an extra '\x00' character
-            else:
-                next = next_codepoint_pos(utf8, next)
-            storage[current].ofs[i] = chr(next - baseindex)
-            utf8len -= 4
-            if utf8len < 0:
-                assert current + 1 == len(storage)
+            next = _next_pos_in_index_storage(utf8, next)
+            storage.entries[current].ofs[i] = chr(next - baseindex)
+            if next > len(utf8):
                 break
-            next = next_codepoint_pos(utf8, next)
-            next = next_codepoint_pos(utf8, next)
-            next = next_codepoint_pos(utf8, next)
+            next = _next_pos_in_index_storage(utf8, next)
+            next = _next_pos_in_index_storage(utf8, next)
+            next = _next_pos_in_index_storage(utf8, next)
+        if current == upto:
+            break
+        current += 1
+        baseindex = next
+
+def _fill_utf8_index_storage_to_bytepos(utf8, storage, bytepos):
+    """ Fill the storage enough to find the entry containing the character
+    at 'bytepos'.  Returns the last filled entry. """
+    index_max = len(storage.entries) - 1
+    if _index_storage_entry_filled(storage, index_max):
+        return index_max
+    current = 0
+    while current < index_max:
+        index_middle = (current + index_max) // 2
+        if _index_storage_entry_filled(storage, index_middle):
+            current = index_middle + 1
         else:
-            current += 1
-            baseindex = next
-            continue
-        break
-    return storage
+            index_max = index_middle
+    # here, 'current' is the first entry not filled yet
+    if current > 0 and storage.entries[current - 1].baseindex > bytepos:
+        return current - 1
+    while True:
+        _fill_utf8_index_storage(utf8, storage, current)
+        if (current == len(storage.entries) - 1 or
+                storage.entries[current].baseindex > bytepos):
+            return current
+        current += 1
 
 @jit.elidable
 def codepoint_position_at_index(utf8, storage, index):
@@ -552,8 +635,40 @@ def codepoint_position_at_index(utf8, storage, index):
     this function.
     """
     current = index >> 6
-    ofs = ord(storage[current].ofs[(index >> 2) & 0x0F])
-    bytepos = storage[current].baseindex + ofs
+    if not _index_storage_entry_filled(storage, current):
+        _fill_utf8_index_storage(utf8, storage, current)
+    ofs = ord(storage.entries[current].ofs[(index >> 2) & 0x0F])
+    bytepos = storage.entries[current].baseindex + ofs
+    index &= 0x3
+    if index == 0:
+        return prev_codepoint_pos(utf8, bytepos)
+    elif index == 1:
+        assert bytepos >= 0
+        return bytepos
+    elif index == 2:
+        return next_codepoint_pos(utf8, bytepos)
+    else:
+        return next_codepoint_pos(utf8, next_codepoint_pos(utf8, bytepos))
+
+@jit.elidable
+def codepoint_position_at_index_in_slice(utf8, view, index):
+    """ Same as codepoint_position_at_index(), but 'utf8' is a slice of a
+    bigger string and 'view' is made by new_utf8_index_view() from the
+    storage of the bigger string.  The index must be smaller than the utf8
+    length.
+    """
+    if index < 4:
+        # the stored positions near the start of the slice may be before it
+        bytepos = 0
+        for i in range(index):
+            bytepos = next_codepoint_pos(utf8, bytepos)
+        return bytepos
+    storage = view.base
+    index += view.index_ofs
+    current = index >> 6
+    assert _index_storage_entry_filled(storage, current)
+    ofs = ord(storage.entries[current].ofs[(index >> 2) & 0x0F])
+    bytepos = storage.entries[current].baseindex + ofs - view.bytes_ofs
     index &= 0x3
     if index == 0:
         return prev_codepoint_pos(utf8, bytepos)
@@ -578,8 +693,10 @@ def codepoint_at_index(utf8, storage, index):
     storage of type UTF8_INDEX_STORAGE
     """
     current = index >> 6
-    ofs = ord(storage[current].ofs[(index >> 2) & 0x0F])
-    bytepos = storage[current].baseindex + ofs
+    if not _index_storage_entry_filled(storage, current):
+        _fill_utf8_index_storage(utf8, storage, current)
+    ofs = ord(storage.entries[current].ofs[(index >> 2) & 0x0F])
+    bytepos = storage.entries[current].baseindex + ofs
     index &= 0x3
     if index == 0:
         return codepoint_before_pos(utf8, bytepos)
@@ -602,30 +719,30 @@ def codepoint_index_at_byte_position(utf8, storage, bytepos, num_codepoints):
         return bytepos
     # binary search on elements of storage
     index_min = 0
-    index_max = len(storage) - 1
+    index_max = _fill_utf8_index_storage_to_bytepos(utf8, storage, bytepos)
     while index_min < index_max:
         # this addition can't overflow because storage has a length that is
         # 1/64 of the length of a string
         index_middle = (index_min + index_max + 1) // 2
-        base_bytepos = storage[index_middle].baseindex
+        base_bytepos = storage.entries[index_middle].baseindex
         if bytepos < base_bytepos:
             index_max = index_middle - 1
         else:
             index_min = index_middle
 
-    baseindex = storage[index_min].baseindex
+    baseindex = storage.entries[index_min].baseindex
     if baseindex == bytepos:
         return index_min << 6
 
     # use ofs to get closer to the correct character index
     result = index_min << 6
     bytepos1 = baseindex
-    if index_min == len(storage) - 1:
+    if index_min == len(storage.entries) - 1:
         maxindex = ((num_codepoints - 1) >> 2) & 0x0F
     else:
         maxindex = 16
     for i in range(maxindex):
-        x = baseindex + ord(storage[index_min].ofs[i])
+        x = baseindex + ord(storage.entries[index_min].ofs[i])
         if x >= bytepos:
             break
         bytepos1 = x
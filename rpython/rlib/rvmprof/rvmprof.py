@@ -21,6 +21,7 @@ VMPROF_BLACKHOLE_TAG = 2
 VMPROF_JITTED_TAG = 3
 VMPROF_JITTING_TAG = 4
 VMPROF_GC_TAG = 5
+VMPROF_ASSEMBLER_TAG = 6
 
 class VMProfError(Exception):
     msg = ''   # annotation hack
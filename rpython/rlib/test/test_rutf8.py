@@ -154,6 +154,56 @@ def test_codepoint_position_at_index_inverse(u):
         assert rutf8.codepoint_index_at_byte_position(
                        b, storage, bytepos, len(u)) == i
 
+@given(strategies.text(), strategies.integers(min_value=0))
+@example(u'\xe4' * 64 * 5, 64 * 2 + 3)
+@example(u'x\u1234' * 200, 399)
+def test_utf8_index_storage_lazy(u, i):
+    b = u.encode('utf8')
+    i = i % (len(u) + 1)
+    storage = rutf8.new_utf8_index_storage(len(u))
+    assert rutf8.codepoint_position_at_index(b, storage, i) == \
+        len(u[:i].encode('utf8'))
+    # only the entries up to the one of 'i' have been computed
+    for j in range(len(storage.entries)):
+        assert rutf8._index_storage_entry_filled(storage, j) == (j <= i >> 6)
+    full = rutf8.create_utf8_index_storage(b, len(u))
+    for j in range(len(u) + 1):
+        bytepos = rutf8.codepoint_position_at_index(b, storage, j)
+        assert bytepos == rutf8.codepoint_position_at_index(b, full, j)
+    for j in range(len(storage.entries)):
+        assert storage.entries[j].baseindex == full.entries[j].baseindex
+        assert list(storage.entries[j].ofs) == list(full.entries[j].ofs)
+
+@given(strategies.text(), strategies.integers(min_value=0))
+@example(u'\xe4' * 64 * 5 + u'x', 4)
+def test_utf8_index_storage_lazy_byte_position(u, i):
+    b = u.encode('utf8')
+    i = i % (len(u) + 1)
+    storage = rutf8.new_utf8_index_storage(len(u))
+    bytepos = len(u[:i].encode('utf8'))
+    assert rutf8.codepoint_index_at_byte_position(
+                   b, storage, bytepos, len(u)) == i
+
+@given(strategies.text(), strategies.integers(min_value=0),
+       strategies.integers(min_value=0))
+@example(u'\xe4x\u1234' * 100, 7, 250)
+@example(u'\xe4x\u1234' * 100, 66, 291)
+def test_codepoint_position_at_index_in_slice(u, start, stop):
+    start = start % (len(u) + 1)
+    stop = stop % (len(u) + 1)
+    if start > stop:
+        start, stop = stop, start
+    b = u.encode('utf8')
+    storage = rutf8.new_utf8_index_storage(len(u))
+    bytes_ofs = rutf8.codepoint_position_at_index(b, storage, start)
+    rutf8.codepoint_position_at_index(b, storage, stop)
+    view = rutf8.new_utf8_index_view(storage, start, bytes_ofs)
+    assert view.base == storage
+    s = u[start:stop]
+    for i in range(len(s)):
+        assert rutf8.codepoint_position_at_index_in_slice(
+            s.encode('utf8'), view, i) == len(s[:i].encode('utf8'))
+
 
 repr_func = rutf8.make_utf8_escape_function(prefix='u', pass_printable=False,
                                             quotes=True)
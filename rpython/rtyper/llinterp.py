@@ -834,6 +834,9 @@ class LLFrame(object):
     def op_gc__collect_step(self):
         return self.heap.collect_step()
 
+    def op_gc__assist_collect_step(self):
+        return self.heap.assist_collect_step()
+
     def op_gc__enable(self):
         self.heap.enable()
 
@@ -925,6 +928,9 @@ class LLFrame(object):
     def op_gc_set_max_heap_size(self, maxsize):
         raise NotImplementedError("gc_set_max_heap_size")
 
+    def op_gc_set_alloc_sample_interval(self, nbytes):
+        raise NotImplementedError("gc_set_alloc_sample_interval")
+
     def op_gc_stack_bottom(self):
         # Marker when we enter RPython code from C code.  It used to be
         # essential for trackgcroot.py.  Nowaways it is mostly unused,
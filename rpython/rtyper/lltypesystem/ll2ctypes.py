@@ -682,11 +682,11 @@ class _fixedsizedarray_mixin(_parentable_mixin):
             return getattr(self, 'item%d' % index)
 
     def setitem(self, index, value):
-        cobj = lltype2ctypes(value)
         if hasattr(self, '_items'):
             lltype._fixedsizearray.setitem.im_func(self, index, value)
         else:
-            setattr(self, 'item%d' % index, cobj)
+            # __setattr__ does the conversion with lltype2ctypes()
+            setattr(self, 'item%d' % index, value)
 
 class _array_mixin(_parentable_mixin):
     """Mixin added to _array containers when they become ctypes-based."""
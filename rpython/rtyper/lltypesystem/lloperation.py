@@ -477,6 +477,7 @@ LL_OPERATIONS = {
 
     'gc__collect':          LLOp(canmallocgc=True),
     'gc__collect_step':     LLOp(canmallocgc=True),
+    'gc__assist_collect_step': LLOp(canmallocgc=True),
     'gc__enable':           LLOp(),
     'gc__disable':          LLOp(),
     'gc__isenabled':        LLOp(),
@@ -491,6 +492,7 @@ LL_OPERATIONS = {
     'gc_id':                LLOp(sideeffects=False, canmallocgc=True),
     'gc_obtain_free_space': LLOp(revdb_protect=True),
     'gc_set_max_heap_size': LLOp(revdb_protect=True),
+    'gc_set_alloc_sample_interval': LLOp(revdb_protect=True),
     'gc_can_move'         : LLOp(sideeffects=False),
     'gc_thread_run'       : LLOp(),
     'gc_thread_start'     : LLOp(),
@@ -783,6 +783,21 @@ def ll_dict_grow(d):
 
 @jit.dont_look_inside
 def ll_dict_remove_deleted_items(d):
+    _ll_dict_compact_entries(d)
+    ll_dict_reindex(d, _ll_len_of_d_indexes(d))
+
+@jit.dont_look_inside
+def ll_dict_shrink(d, new_size):
+    # Like ll_dict_remove_deleted_items(), but also replace 'd.indexes'
+    # with a smaller array, which can use a smaller FUNC_xxx type.
+    # Without this, a dictionary that was once big keeps its big
+    # 'd.indexes' forever, even after most of its items are deleted.
+    _ll_dict_compact_entries(d)
+    while new_size - MIN_INDEXES_MINUS_ENTRIES < len(d.entries):
+        new_size *= 2
+    ll_dict_reindex(d, new_size)
+
+def _ll_dict_compact_entries(d):
     if d.num_live_items < len(d.entries) // 4:
         # At least 75% of the allocated entries are dead, so shrink the memory
         # allocated as well as doing a compaction.
@@ -830,8 +845,6 @@ def ll_dict_remove_deleted_items(d):
     else:
         d.entries = newitems
 
-    ll_dict_reindex(d, _ll_len_of_d_indexes(d))
-
 
 def ll_dict_delitem(d, key):
     ll_dict_delitem_with_hash(d, key, d.keyhash(key))
@@ -909,7 +922,7 @@ def _ll_dict_resize_to(d, num_extra):
         new_size *= 2
 
     if new_size < _ll_len_of_d_indexes(d):
-        ll_dict_remove_deleted_items(d)
+        ll_dict_shrink(d, new_size)
     else:
         ll_dict_reindex(d, new_size)
 
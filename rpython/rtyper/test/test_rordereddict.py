@@ -342,6 +342,40 @@ class TestRDictDirect(object):
             num_nonfrees += (got > 0)
         assert d.resize_counter <= idx.getlength() * 2 - num_nonfrees * 3
 
+    def test_shrink_indexes_after_mass_deletion(self):
+        DICT = self._get_int_dict()
+        ll_d = rordereddict.ll_newdict(DICT)
+        for i in range(5000):
+            rordereddict.ll_dict_setitem(ll_d, i, i)
+        assert (ll_d.lookup_function_no & rordereddict.FUNC_MASK ==
+                rordereddict.FUNC_SHORT)
+        big = len(get_indexes(ll_d))
+        for i in range(4990):
+            rordereddict.ll_dict_delitem(ll_d, i)
+        # both the entries and the indexes were shrunk
+        assert len(ll_d.entries) < 100
+        assert len(get_indexes(ll_d)) <= big // 32
+        for i in range(4990, 5000):
+            assert rordereddict.ll_dict_getitem(ll_d, i) == i
+        for i in range(200):
+            rordereddict.ll_dict_setitem(ll_d, -i, i)
+        assert rordereddict.ll_dict_len(ll_d) == 210
+        for i in range(200):
+            assert rordereddict.ll_dict_getitem(ll_d, -i) == i
+
+    def test_shrink_indexes_to_bytes(self):
+        DICT = self._get_int_dict()
+        ll_d = rordereddict.ll_newdict(DICT)
+        for i in range(300):
+            rordereddict.ll_dict_setitem(ll_d, i, i)
+        assert (ll_d.lookup_function_no & rordereddict.FUNC_MASK ==
+                rordereddict.FUNC_SHORT)
+        for i in range(299):
+            rordereddict.ll_dict_delitem(ll_d, i)
+        assert (ll_d.lookup_function_no & rordereddict.FUNC_MASK ==
+                rordereddict.FUNC_BYTE)
+        assert rordereddict.ll_dict_getitem(ll_d, 299) == 299
+
     @given(strategies.lists(strategies.integers(min_value=1, max_value=5)))
     def test_direct_move_to_end(self, lst):
         DICT = self._get_int_dict()
@@ -52,6 +52,9 @@ class BasicGcPolicy(object):
     def OP_GC_SET_MAX_HEAP_SIZE(self, funcgen, op):
         return ''
 
+    def OP_GC_SET_ALLOC_SAMPLE_INTERVAL(self, funcgen, op):
+        return ''
+
     def OP_GC_THREAD_PREPARE(self, funcgen, op):
         return ''
 
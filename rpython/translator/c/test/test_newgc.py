@@ -1898,6 +1898,35 @@ class TestIncrementalMiniMarkGC(TestMiniMarkGC):
         deleted = self.run("collect_step")
         assert deleted == 1
 
+    def define_assist_collect_step(self):
+        class A(object):
+            pass
+        def f():
+            if rgc.assist_collect_step():
+                return -1    # should not start a major collection
+            # enough old objects for several marking steps
+            l = []
+            for i in range(100000):
+                a = A()
+                a.next = None
+                l.append(a)
+            rgc.collect()
+            rgc.collect_step()    # this one starts a major collection
+            n = 0
+            while rgc.assist_collect_step():
+                n += 1
+                if n == 100000:
+                    return -2
+            if len(l) != 100000:
+                return -3
+            return n
+        return f
+
+    def test_assist_collect_step(self):
+        n = self.run("assist_collect_step")
+        # several steps of marking, then sweeping and finalizing
+        assert n >= 4
+
     def define_total_gc_time(cls):
         def f():
             l = []
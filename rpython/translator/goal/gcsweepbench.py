@@ -0,0 +1,146 @@
+# Measures how the time spent in the sweeping phase of a major collection
+# of incminimark scales with the size of the heap.
+#
+#       For each heap size, the benchmark builds a heap made of small
+#       objects (binary trees of instances, which all end up in the arenas
+#       of minimarkpage.py) plus a few large lists (raw-malloced), then
+#       drops a given fraction of the trees and runs a full major
+#       collection step by step with gc.collect_step(), attributing the
+#       time of every step to the state it started in.  It prints the time
+#       spent marking and sweeping, and the sweeping time per MB of heap.
+#
+#       Only meaningful on top of a translated PyPy using incminimark.
+#       The "dead" fraction controls how many pages die completely: fully
+#       dead pages are the cheapest ones to sweep, pages with a few
+#       survivors the most expensive ones.
+import time
+import gc
+
+USAGE = """gcsweepbench [--sizes=MB,MB,..] [--dead=FRACTION] [--repeat=N]"""
+
+DEFAULT_SIZES = [64, 128, 256, 512]
+NODE_SIZE = 48      # approximate size of a Node instance, in bytes
+TREE_DEPTH = 12
+
+
+class Node(object):
+
+    def __init__(self, l=None, r=None):
+        self.left = l
+        self.right = r
+
+def make_tree(depth):
+    "Build tree bottom-up"
+    if depth <= 0:
+        return Node()
+    else:
+        return Node(make_tree(depth-1), make_tree(depth-1))
+
+def tree_size(i):
+    "Nodes used by a tree of a given size"
+    return (1 << (i + 1)) - 1
+
+def build_heap(megabytes):
+    ntrees = megabytes * 1024 * 1024 // (tree_size(TREE_DEPTH) * NODE_SIZE)
+    trees = [make_tree(TREE_DEPTH) for i in range(ntrees)]
+    # a few large objects, which are not allocated in the arenas
+    large = [[i] * 100000 for i in range(megabytes // 8 + 1)]
+    return trees, large
+
+def drop_fraction(trees, dead):
+    # drop every tree whose index falls in the 'dead' fraction, spreading
+    # the holes evenly so that most pages keep some survivors if dead < 1
+    kept = 0.0
+    for i in range(len(trees)):
+        kept += 1.0 - dead
+        if kept >= 1.0:
+            kept -= 1.0
+        else:
+            trees[i] = None
+
+def full_collection_by_state():
+    """Run a full major collection with gc.collect_step() and return a
+    dict {state name: seconds}."""
+    times = {}
+    names = gc.GcCollectStepStats.GC_STATES
+    # finish any collection in progress
+    while not gc.collect_step().major_is_done:
+        pass
+    while True:
+        t_start = time.time()
+        stats = gc.collect_step()
+        t_finish = time.time()
+        name = names[stats.oldstate]
+        times[name] = times.get(name, 0.0) + (t_finish - t_start)
+        if stats.major_is_done:
+            break
+    return times
+
+def time_sweep(megabytes, dead):
+    trees, large = build_heap(megabytes)
+    drop_fraction(trees, dead)
+    times = full_collection_by_state()
+    marking = times.get('MARKING', 0.0) + times.get('SCANNING', 0.0)
+    sweeping = times.get('SWEEPING', 0.0)
+    print "%6d MB   marking %9.2f ms   sweeping %9.2f ms   (%.3f ms/MB)" % (
+        megabytes, marking * 1000., sweeping * 1000.,
+        sweeping * 1000. / megabytes)
+    if len(trees) == 0 or len(large) == 0:
+        raise Failed
+    return sweeping
+
+def main(sizes=DEFAULT_SIZES, dead=0.5):
+    print "GC sweep scaling test (dead fraction %.2f)" % (dead,)
+    gc.disable()
+    try:
+        for megabytes in sizes:
+            time_sweep(megabytes, dead)
+    finally:
+        gc.enable()
+
+class Failed(Exception):
+    pass
+
+
+def argerror():
+    print "Usage:"
+    print "   ", USAGE
+    return 2
+
+def entry_point(argv):
+    sizes = DEFAULT_SIZES
+    dead = 0.5
+    repeatcount = 1
+    for arg in argv[1:]:
+        if arg.startswith('--sizes='):
+            arg = arg[len('--sizes='):].split(',')
+            try:
+                sizes = [int(s) for s in arg]
+            except ValueError:
+                return argerror()
+        elif arg.startswith('--dead='):
+            try:
+                dead = float(arg[len('--dead='):])
+            except ValueError:
+                return argerror()
+            if not 0.0 <= dead <= 1.0:
+                return argerror()
+        elif arg.startswith('--repeat='):
+            try:
+                repeatcount = int(arg[len('--repeat='):])
+            except ValueError:
+                return argerror()
+        else:
+            return argerror()
+    #
+    if not hasattr(gc, 'collect_step'):
+        print "needs a PyPy translated with an incremental GC"
+        return 1
+    for i in range(repeatcount):
+        main(sizes, dead)
+    return 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(entry_point(sys.argv))